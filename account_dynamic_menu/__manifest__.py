@@ -1,6 +1,6 @@
 {
     "name": "Account Dynamic Menu",
-    "version": "1.1",
+    "version": "1.2",
     "category": "Accounting",
     "summary": "Create dynamic menu for each account.",
     "depends": ["account"],
@@ -4,11 +4,34 @@ from odoo.exceptions import UserError
 class AccountAccount(models.Model):
     _inherit = 'account.account'
 
+    def _get_move_lines_action_vals(self, name=None):
+        """Values of the window action listing the journal items of the account."""
+        self.ensure_one()
+        return {
+            'name': name or self.display_name,
+            'type': 'ir.actions.act_window',
+            'res_model': 'account.move.line',
+            'view_mode': 'list,form',
+            'domain': [('account_id', '=', self.id)],
+            'context': "{'default_account_id': %d}" % self.id,
+        }
+
+    def action_open_move_lines(self):
+        """Open the journal items of the account without materialising a menu.
+        Used by the account browser.
+        """
+        return self._get_move_lines_action_vals()
+
     def create_separate_menu(self):
         """Create a submenu under the root 'حركات الحسابات الشائعة' for each account.
         - Avoid creating duplicate menus with the same name under the same parent.
         - Create an action with domain limited to the account.
         - Pass default_account_id in context so create form is prefilled.
+
+        Works in bulk: the existing menus under the parent are loaded once,
+        the missing actions and menus are created with one create() each and
+        the existing actions are only written when they differ, so the menu
+        cache is only cleared once.
         """
         parent_xmlid = 'account_dynamic_menu.menu_common_account_moves_root'
         try:
@@ -16,44 +39,47 @@ class AccountAccount(models.Model):
         except ValueError:
             raise UserError(_('Parent menu ({} ) was not found. Make sure the XML that creates it is installed.').format(parent_xmlid))
 
+        Menu = self.env['ir.ui.menu']
+        existing_menus = {}
+        for menu in Menu.search([('parent_id', '=', parent_menu.id)]):
+            # Only the journal item menus, not e.g. the Account Browser
+            if menu.action and menu.action._name == 'ir.actions.act_window' \
+                    and menu.action.res_model == 'account.move.line':
+                existing_menus.setdefault(menu.name, menu)
+
+        new_accounts = {}
         for account in self:
             menu_name = account.name or ('Account %s' % account.id)
 
             # Prevent duplicate menus with same name and parent
-            existing = self.env['ir.ui.menu'].search([
-                ('name', '=', menu_name),
-                ('parent_id', '=', parent_menu.id)
-            ], limit=1)
+            existing = existing_menus.get(menu_name)
             if existing:
-                # Update its action domain if needed and continue
-                action = existing.action and getattr(existing.action, 'id', False)
-                if action:
-                    act = self.env['ir.actions.act_window'].browse(action)
-                    act.write({
-                        'res_model': 'account.move.line',
-                        'view_mode': 'list,form',
-                        'domain': [('account_id', '=', account.id)],
-                        'context': {'default_account_id': account.id}
-                    })
+                # Update its action domain if needed and continue (every
+                # action write clears the registry cache)
+                vals = account._get_move_lines_action_vals()
+                vals = {
+                    'view_mode': vals['view_mode'],
+                    'domain': str(vals['domain']),
+                    'context': vals['context'],
+                }
+                if any(existing.action[fname] != value for fname, value in vals.items()):
+                    existing.action.write(vals)
                 continue
+            new_accounts.setdefault(menu_name, account)
 
-            # Create action
-            action_vals = {
-                'name': menu_name,
-                'type': 'ir.actions.act_window',
-                'res_model': 'account.move.line',
-                'view_mode': 'list,form',
-                'domain': [('account_id', '=', account.id)],
-                'context': "{'default_account_id': %d}" % account.id,
-            }
-            action = self.env['ir.actions.act_window'].create(action_vals)
+        if not new_accounts:
+            return True
 
-            # Create the submenu pointing to the action
-            self.env['ir.ui.menu'].create({
-                'name': menu_name,
-                'parent_id': parent_menu.id,
-                'action': 'ir.actions.act_window,%d' % action.id,
-            })
+        # Create the actions, then the submenus pointing to them
+        actions = self.env['ir.actions.act_window'].create([
+            account._get_move_lines_action_vals(menu_name)
+            for menu_name, account in new_accounts.items()
+        ])
+        Menu.create([{
+            'name': menu_name,
+            'parent_id': parent_menu.id,
+            'action': 'ir.actions.act_window,%d' % action.id,
+        } for menu_name, action in zip(new_accounts, actions)])
         return True
 
 class AccountMoveLine(models.Model):
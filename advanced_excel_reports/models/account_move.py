@@ -19,156 +19,161 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-import io
-import json
-import xlsxwriter
+from collections import defaultdict
 from odoo import models
-from odoo.tools import json_default
 
 
 class AccountMove(models.Model):
     """ Added function for printing excel report
             which is coming from a server action """
-    _inherit = "account.move"
+    _name = "account.move"
+    _inherit = ["account.move", "advanced.excel.report.mixin"]
 
-    def print_excel_report(self):
+    def print_excel_report(self, tabular=False):
         """ Function is used to print the Excel report
             It will pass the invoice data through js file to
-            print Excel file"""
-        # Take the ids of the selected invoices
-        data = self._context['active_ids']
-        return {
-            'type': 'ir.actions.report',
-            'report_type': 'xlsx',
-            'data': {'model': 'account.move',
-                     'output_format': 'xlsx',
-                     'options': json.dumps(data,
-                                           default=json_default),
-                     'report_name': 'Invoice Excel Report', }, }
+            print Excel file
+            :param tabular: Print all the invoices on a single sheet"""
+        return self._get_excel_report_action('Invoice Excel Report',
+                                             tabular=tabular)
 
-    def get_xlsx_report(self, datas, response):
-        """ From this function we can create and design the Excel file template
-         and the map the values in the corresponding cells
-         :param datas: Selected record ids
-         :param response: Response after creating excel
-         """
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
-        # for printing multiple sheet per file, iterate the invoices
-        for account_move in self.env['account.move'].browse(datas):
-            # Set file title as invoice when it is invoice and set bill
-            # if the move_type is out_invoice
-            account_name = 'INVOICE - ' + account_move.name if \
-                account_move.move_type == 'out_invoice' else \
-                'VENDOR BILL - ' + account_move.name
-            company_name = 'Company Name : ' + account_move.company_id.name
-            # Copy the value to a variable set black if it is null
-            # instead of printing 'FALSE' in the report
-            ref = str(
-                account_move.payment_reference) if \
-                account_move.payment_reference is not False else ''
-            # Copy the value to a variable set black if it is null
-            # instead of printing 'FALSE' in the report
-            payment_term = str(
-                account_move.invoice_payment_term_id.name) if \
-                account_move.invoice_payment_term_id.name is not False else ''
-            # Copy the value to a variable set black if it is null instead
-            # of printing 'FALSE' in the report
-            fiscal_position = str(
-                account_move.fiscal_position_id.name) if \
-                account_move.fiscal_position_id.name is not False else ''
-            # Copy the value to a variable set black if it is null
-            # instead of printing 'FALSE' in the report
-            sale_person = account_move.user_id.name if \
-                account_move.user_id.name is not False else ''
-            # Copy the value to a variable set black if it is null
-            # instead of printing 'FALSE' in the report
-            incoterm = account_move.invoice_incoterm_id.name if \
-                account_move.invoice_incoterm_id.name is not False else ''
-            invoice_date = str(account_move.invoice_date)
-            currency_symbol = account_move.currency_id.symbol
-            sheet = workbook.add_worksheet(
-                account_move.name)  # Set sheet name as Invoice/Bill name
-            sheet.set_column(0, 8, 20)
-            head = workbook.add_format(
-                {'align': 'center', 'bold': True, 'font_size': '20px'})
-            txt = workbook.add_format(
-                {'align': 'center', 'bold': True})
-            txt_border = workbook.add_format(
-                {'align': 'center', 'bold': True, 'border': 1})
-            border = workbook.add_format({'border': 1})
-            sheet.merge_range('B2:E3', account_name, head)
-            sheet.merge_range('B4:E4', company_name, txt)
-            sheet.write('A6', 'Customer/Vendor Name', txt)
-            sheet.write('B6', account_move.partner_id.name)
-            sheet.write('B7', account_move.partner_id.street)
-            sheet.write('B8', account_move.partner_id.state_id.name)
-            sheet.write('B9', account_move.partner_id.zip)
-            sheet.write('B10', account_move.partner_id.country_id.name)
-            sheet.write('B11', account_move.partner_id.phone)
-            sheet.write('D6', 'Date', txt)
-            sheet.write('D7', 'Payment Term', txt)
-            sheet.write('D8', 'Journal', txt)
-            sheet.write('D9', 'Currency', txt)
-            sheet.write('D10', 'State', txt)
-            sheet.write('E6', invoice_date)
-            sheet.write('E7', payment_term)
-            sheet.write('E8', account_move.journal_id.name)
-            sheet.write('E9', account_move.currency_id.name)
-            sheet.write('E10', account_move.state)
-            sheet.write('A13', 'Sales Persons', txt)
-            sheet.write('A14', sale_person)
-            sheet.write('B13', 'Source Document', txt)
-            sheet.write('B14', ref)
-            sheet.write('C13', 'Fiscal Position', txt)
-            sheet.write('C14', fiscal_position)
-            sheet.write('D13', 'Incoterm', txt)
-            sheet.write('D14', incoterm)
-            sheet.write('A16', 'Product', txt_border)
-            sheet.write('B16', 'Description', txt_border)
-            sheet.write('C16', 'Quantity', txt_border)
-            sheet.write('D16', 'Account', txt_border)
-            sheet.write('E16', 'Discount %', txt_border)
-            sheet.write('F16', 'Unit Price', txt_border)
-            sheet.write('G16', 'Tax', txt_border)
-            sheet.write('H16', 'Subtotal', txt_border)
-            row = 17
-            self._add_invoice_line_to_excel(sheet, account_move, row, border, txt_border,
-                               currency_symbol)
-        workbook.close()
-        output.seek(0)
-        response.stream.write(output.read())
-        output.close()
+    def _prefetch_excel_data(self, moves):
+        """ Read the invoices, their lines, products, taxes, accounts and
+        partners with one query per model instead of once per invoice
+        :param moves: Batch of invoices to export
+        :return: dict mapping each invoice id to its invoice lines
+        """
+        moves.fetch(['name', 'move_type', 'company_id', 'payment_reference',
+                     'invoice_payment_term_id', 'fiscal_position_id',
+                     'user_id', 'invoice_incoterm_id', 'invoice_date',
+                     'currency_id', 'partner_id', 'journal_id', 'state',
+                     'amount_total', 'invoice_line_ids'])
+        lines = moves.invoice_line_ids
+        lines.fetch(['move_id', 'product_id', 'name', 'quantity',
+                     'account_id', 'discount', 'price_unit', 'tax_ids',
+                     'price_subtotal'])
+        lines.product_id.fetch(['name'])
+        lines.tax_ids.fetch(['name'])
+        lines.account_id.fetch(['code', 'name'])
+        moves.partner_id.fetch(['name', 'street', 'state_id', 'zip',
+                                'country_id', 'phone'])
+        line_ids = defaultdict(list)
+        for line in lines:
+            line_ids[line.move_id.id].append(line.id)
+        return {move.id: self.env['account.move.line'].browse(line_ids[move.id])
+                for move in moves}
+
+    def _write_excel_sheet(self, sheet, account_move, lines, formats):
+        """ From this function we can create and design the Excel sheet of
+        one invoice and map the values in the corresponding cells, row by
+        row
+        :param sheet: Current Excel sheet where data to be added
+        :param account_move: Object of invoice in which data adding
+        :param lines: Prefetched invoice lines of the invoice
+        :param formats: Excel styling of the workbook
+        """
+        # Set file title as invoice when it is invoice and set bill
+        # if the move_type is out_invoice
+        account_name = 'INVOICE - ' + account_move.name if \
+            account_move.move_type == 'out_invoice' else \
+            'VENDOR BILL - ' + account_move.name
+        company_name = 'Company Name : ' + account_move.company_id.name
+        partner = account_move.partner_id
+        txt = formats['txt']
+        sheet.set_column(0, 8, 20)
+        sheet.merge_range('B2:E3', account_name, formats['head'])
+        sheet.merge_range('B4:E4', company_name, txt)
+        sheet.write('A6', 'Customer/Vendor Name', txt)
+        sheet.write('B6', partner.name or '')
+        sheet.write('D6', 'Date', txt)
+        sheet.write('E6', str(account_move.invoice_date))
+        sheet.write('B7', partner.street or '')
+        sheet.write('D7', 'Payment Term', txt)
+        sheet.write('E7', account_move.invoice_payment_term_id.name or '')
+        sheet.write('B8', partner.state_id.name or '')
+        sheet.write('D8', 'Journal', txt)
+        sheet.write('E8', account_move.journal_id.name)
+        sheet.write('B9', partner.zip or '')
+        sheet.write('D9', 'Currency', txt)
+        sheet.write('E9', account_move.currency_id.name)
+        sheet.write('B10', partner.country_id.name or '')
+        sheet.write('D10', 'State', txt)
+        sheet.write('E10', account_move.state)
+        sheet.write('B11', partner.phone or '')
+        sheet.write('A13', 'Sales Persons', txt)
+        sheet.write('B13', 'Source Document', txt)
+        sheet.write('C13', 'Fiscal Position', txt)
+        sheet.write('D13', 'Incoterm', txt)
+        sheet.write('A14', account_move.user_id.name or '')
+        sheet.write('B14', account_move.payment_reference or '')
+        sheet.write('C14', account_move.fiscal_position_id.name or '')
+        sheet.write('D14', account_move.invoice_incoterm_id.name or '')
+        sheet.write_row('A16', ['Product', 'Description', 'Quantity',
+                                'Account', 'Discount %', 'Unit Price', 'Tax',
+                                'Subtotal'], formats['txt_border'])
+        row = 17
+        self._add_invoice_line_to_excel(sheet, account_move, lines, row,
+                                        formats['border'],
+                                        formats['txt_border'],
+                                        account_move.currency_id.symbol)
 
-    def _add_invoice_line_to_excel(self, sheet, account_move, row, border, txt_border,
-                      currency_symbol):
+    def _add_invoice_line_to_excel(self, sheet, account_move, lines, row,
+                                   border, txt_border, currency_symbol):
         """
         Function to add invoice line values to the Excel file
         :param sheet: Current Excel sheet where data to be added
         :param account_move : Object of invoice in which data adding
+        :param lines: Prefetched invoice lines of the invoice
         :param row:Excel row value of next data to be added
         :param border :Excel styling for adding border for each cell
         :param txt_border : Excel styling for adding data in each cell
         :param currency_symbol : Currency symbol of current record
         """
-        for line in account_move.invoice_line_ids:
+        for line in lines:
             # For adding value of the invoice lines
-            tax = str(
-                line.tax_ids.name) if line.tax_ids.name \
-                                      is not False else ''
-            sheet.write(row, 0, line.product_id.name, border)
-            sheet.write(row, 1, line.name, border)
-            sheet.write(row, 2, line.quantity, border)
-            sheet.write(row, 3, line.account_id.display_name, border)
-            sheet.write(row, 4, line.discount, border)
-            sheet.write(row, 5, line.price_unit, border)
-            sheet.write(row, 6, tax, border)
-            sheet.write(row, 7,
-                        str(currency_symbol) + str(line.price_subtotal),
-                        border)
+            sheet.write_row(row, 0, [
+                line.product_id.name or '',
+                line.name or '',
+                line.quantity,
+                line.account_id.display_name,
+                line.discount,
+                line.price_unit,
+                ', '.join(line.tax_ids.mapped('name')),
+                str(currency_symbol) + str(line.price_subtotal),
+            ], border)
             row += 1
         row += 1
         sheet.write(row, 6, 'Total Amount', txt_border)
         sheet.write(row, 7,
                     str(currency_symbol) + str(account_move.amount_total),
                     border)
+
+    def _get_excel_tabular_header(self):
+        """ Column titles of the single sheet layout """
+        return ['Number', 'Date', 'Customer/Vendor', 'Journal', 'Currency',
+                'State', 'Product', 'Description', 'Quantity', 'Account',
+                'Discount %', 'Unit Price', 'Tax', 'Subtotal', 'Total']
+
+    def _get_excel_tabular_rows(self, account_move, lines):
+        """ One row per invoice line, repeating the invoice values """
+        move_values = [
+            account_move.name,
+            str(account_move.invoice_date or ''),
+            account_move.partner_id.name or '',
+            account_move.journal_id.name,
+            account_move.currency_id.name,
+            account_move.state,
+        ]
+        if not lines:
+            return [move_values + [''] * 8 + [account_move.amount_total]]
+        return [move_values + [
+            line.product_id.name or '',
+            line.name or '',
+            line.quantity,
+            line.account_id.display_name,
+            line.discount,
+            line.price_unit,
+            ', '.join(line.tax_ids.mapped('name')),
+            line.price_subtotal,
+            account_move.amount_total,
+        ] for line in lines]
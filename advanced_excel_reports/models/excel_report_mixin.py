@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+import io
+import json
+import re
+import xlsxwriter
+from odoo import models
+from odoo.tools import json_default, split_every
+
+# Above this number of records the export switches to a single tabular
+# sheet instead of one sheet per record
+EXCEL_TABULAR_THRESHOLD = 200
+# Number of records whose lines are prefetched together
+EXCEL_BATCH_SIZE = 1000
+
+
+class ExcelReportMixin(models.AbstractModel):
+    """ Shared machinery of the Excel reports: options handling, streaming
+        workbook, formats and the two layouts (one sheet per record or a
+        single tabular sheet)
+
+        The reports inheriting the mixin implement:
+        - _prefetch_excel_data(records): read the lines of a batch of
+          records and their related records in bulk, return a dict mapping
+          each record id to its lines
+        - _write_excel_sheet(sheet, record, lines, formats): write the sheet
+          of one record
+        - _get_excel_tabular_header(): column titles of the tabular layout
+        - _get_excel_tabular_rows(record, lines): rows of one record in the
+          tabular layout, one per line """
+    _name = "advanced.excel.report.mixin"
+    _description = "Advanced Excel Report Mixin"
+
+    def _get_excel_report_action(self, report_name, tabular=False):
+        """ Report action passing the selected ids to the js handler
+        :param report_name: Name of the downloaded file
+        :param tabular: Force the single sheet tabular layout
+        """
+        data = {'ids': self._context['active_ids'], 'tabular': tabular}
+        return {
+            'type': 'ir.actions.report',
+            'report_type': 'xlsx',
+            'data': {'model': self._name,
+                     'output_format': 'xlsx',
+                     'options': json.dumps(data,
+                                           default=json_default),
+                     'report_name': report_name, }, }
+
+    def get_xlsx_report(self, datas, response):
+        """ Create the Excel file of the selected records and write it to
+        the response. The workbook is written in constant memory mode, so
+        every sheet is filled strictly row after row.
+        :param datas: Selected record ids, or a dict with the ids and the
+                      requested layout
+        :param response: Response after creating excel
+        """
+        if isinstance(datas, dict):
+            ids, tabular = datas.get('ids', []), datas.get('tabular')
+        else:
+            ids, tabular = datas, False
+        records = self.browse(ids)
+        tabular = tabular or len(records) > EXCEL_TABULAR_THRESHOLD
+        output = io.BytesIO()
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        formats = self._get_excel_formats(workbook)
+        if tabular:
+            sheet = workbook.add_worksheet(self._description[:31])
+            sheet.set_column(0, 20, 20)
+            sheet.write_row(0, 0, self._get_excel_tabular_header(),
+                            formats['txt_border'])
+            row = 1
+            for batch in split_every(EXCEL_BATCH_SIZE, records.ids,
+                                     self.browse):
+                lines_by_record = self._prefetch_excel_data(batch)
+                for record in batch:
+                    for values in self._get_excel_tabular_rows(
+                            record, lines_by_record[record.id]):
+                        sheet.write_row(row, 0, values, formats['border'])
+                        row += 1
+        else:
+            used_names = set()
+            for batch in split_every(EXCEL_BATCH_SIZE, records.ids,
+                                     self.browse):
+                lines_by_record = self._prefetch_excel_data(batch)
+                for record in batch:
+                    sheet = workbook.add_worksheet(
+                        self._get_excel_sheet_name(record.name, used_names))
+                    self._write_excel_sheet(sheet, record,
+                                            lines_by_record[record.id],
+                                            formats)
+        workbook.close()
+        output.seek(0)
+        response.stream.write(output.read())
+        output.close()
+
+    def _get_excel_formats(self, workbook):
+        """ Formats shared by all the sheets of the workbook """
+        return {
+            'head': workbook.add_format(
+                {'align': 'center', 'bold': True, 'font_size': '20px'}),
+            'txt': workbook.add_format({'align': 'center', 'bold': True}),
+            'txt_border': workbook.add_format(
+                {'align': 'center', 'bold': True, 'border': 1}),
+            'border': workbook.add_format({'border': 1}),
+        }
+
+    def _get_excel_sheet_name(self, name, used_names):
+        """ Unique worksheet name without the characters refused by Excel
+        :param name: Name of the record
+        :param used_names: Lower case names already used in the workbook
+        """
+        base_name = re.sub(r'[\[\]:*?/\\]', '-', name or '')[:31] or 'Sheet'
+        sheet_name = base_name
+        index = 1
+        while sheet_name.lower() in used_names:
+            suffix = f" ({index})"
+            sheet_name = base_name[:31 - len(suffix)] + suffix
+            index += 1
+        used_names.add(sheet_name.lower())
+        return sheet_name
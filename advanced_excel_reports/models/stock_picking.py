@@ -19,149 +19,140 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-import io
-import json
-import xlsxwriter
+from collections import defaultdict
 from odoo import models
-from odoo.tools import json_default
 
 
 class StockPicking(models.Model):
     """ Added a function that to print sale order Excel report
             which is added using  server action """
-    _inherit = "stock.picking"
+    _name = "stock.picking"
+    _inherit = ["stock.picking", "advanced.excel.report.mixin"]
 
-    def print_excel_report(self):
+    def print_excel_report(self, tabular=False):
         """ Function is used to print the Excel report
                 It will pass the picking data through js file to
-                 print Excel file"""
-        # Take the ids of the selected pickings
-        data = self._context['active_ids']
-        return {
-            'type': 'ir.actions.report',
-            'report_type': 'xlsx',
-            'data': {'model': 'stock.picking',
-                     'output_format': 'xlsx',
-                     'options': json.dumps(data,
-                                           default=json_default),
-                     'report_name': 'Picking Order Excel Report', }, }
+                 print Excel file
+            :param tabular: Print all the pickings on a single sheet"""
+        return self._get_excel_report_action('Picking Order Excel Report',
+                                             tabular=tabular)
 
-    def get_xlsx_report(self, datas, response):
-        """ From this function we can create and design the Excel file template
-            and the map the values in the corresponding cells
-            :param datas:Selected record ids
-            :param response: Response after creating excel
+    def _prefetch_excel_data(self, pickings):
+        """ Read the pickings, their moves, products, locations and partners
+        with one query per model instead of once per picking
+        :param pickings: Batch of pickings to export
+        :return: dict mapping each picking id to its stock moves
         """
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
-        # for printing multiple sheet per file, iterate the pickings
-        for picking in self.env['stock.picking'].browse(datas):
-            picking_name = 'Delivery - ' + picking.name
-            company_name = 'Company Name : ' + picking.company_id.name
-            # Copy the value to a variable set black if it is null
-            # instead of printing 'FALSE' in the report
-            ref = picking.origin if picking.origin is not False else ''
-            # Copy the value to a variable set black if it is null
-            # instead of printing 'FALSE' in the report
-            responsible_person = picking.user_id.name if \
-                picking.user_id.name is not False else ''
-            # Copy the value to a variable set black if it is null
-            # instead of printing 'FALSE' in the report
-            partner_name = picking.partner_id.name if \
-                picking.partner_id.name is not False else ''
-            # Copy the value to a variable set black if it is null instead
-            # of printing 'FALSE' in the report
-            partner_street = picking.partner_id.street if \
-                picking.partner_id.street is not False else ''
-            # Copy the value to a variable set black if it is null instead of
-            # printing 'FALSE' in the report
-            partner_state = picking.partner_id.state_id.name if \
-                picking.partner_id.state_id.name is not False else ''
-            # Copy the value to a variable set black if it is null instead
-            # of printing 'FALSE' in the report
-            partner_zip = picking.partner_id.zip if \
-                picking.partner_id.zip is not False else ''
-            # Copy the value to a variable set black if it is null instead
-            # of printing 'FALSE' in the report
-            partner_county = picking.partner_id.country_id.name if \
-                picking.partner_id.country_id.name is not False else ''
-            # Copy the value to a variable set black if it is null
-            # instead of printing 'FALSE' in the report
-            partner_phone = picking.partner_id.phone if \
-                picking.partner_id.phone is not False else ''
-            # Copy the value to a variable set black if it is null instead
-            # of printing 'FALSE' in the report
-            date_done = str(picking.date_done) if \
-                picking.date_done is not False else ''
-            scheduled_date = str(picking.scheduled_date)
-            sheet = workbook.add_worksheet(
-                picking.name)  # set the sheet name as picking name
-            sheet.set_column(0, 8, 25)
-            head = workbook.add_format(
-                {'align': 'center', 'bold': True, 'font_size': '20px'})
-            txt = workbook.add_format({'align': 'center', 'bold': True})
-            txt_border = workbook.add_format(
-                {'align': 'center', 'bold': True, 'border': 1})
-            border = workbook.add_format({'border': 1})
-            sheet.merge_range('B2:E3', picking_name, head)
-            sheet.merge_range('B4:E4', company_name, txt)
-            sheet.write('A6', 'Customer/Vendor Name', txt)
-            sheet.write('B6', partner_name)
-            sheet.write('B7', partner_street)
-            sheet.write('B8', partner_state)
-            sheet.write('B9', partner_zip)
-            sheet.write('B10', partner_county)
-            sheet.write('B11', partner_phone)
-            sheet.write('D6', 'Scheduled Date', txt)
-            sheet.write('D7', 'Effective Date', txt)
-            sheet.write('D8', 'Operation Type', txt)
-            sheet.write('D9', 'Source Location', txt)
-            sheet.write('D10', 'Destination Location', txt)
-            sheet.write('D11', 'State', txt)
-            sheet.write('E6', scheduled_date)
-            sheet.write('E7', date_done)
-            sheet.write('E8', picking.picking_type_id.display_name)
-            sheet.write('E9', picking.location_id.complete_name)
-            sheet.write('E10', picking.location_dest_id.complete_name)
-            sheet.write('E11', picking.state)
-            sheet.write('A13', 'Responsible Person', txt)
-            sheet.write('A14', responsible_person)
-            sheet.write('B13', 'Source Document', txt)
-            sheet.write('B14', ref)
-            sheet.write('A16', 'Product', txt_border)
-            sheet.write('B16', 'Description', txt_border)
-            sheet.write('C16', 'Scheduled Date', txt_border)
-            sheet.write('D16', 'Deadline', txt_border)
-            sheet.write('E16', 'Quantity', txt_border)
-            sheet.write('F16', 'Quantity Done', txt_border)
-            row = 17
-            # calling this function for adding picking line data to the
-            # Excel sheet
-            self._add_picking_line_to_excel(sheet, picking, row, border)
-        workbook.close()
-        output.seek(0)
-        response.stream.write(output.read())
-        output.close()
+        pickings.fetch(['name', 'company_id', 'origin', 'user_id',
+                        'partner_id', 'date_done', 'scheduled_date',
+                        'picking_type_id', 'location_id', 'location_dest_id',
+                        'state', 'move_ids'])
+        moves = pickings.move_ids
+        moves.fetch(['picking_id', 'product_id', 'description_picking',
+                     'date', 'date_deadline', 'product_uom_qty', 'quantity'])
+        moves.product_id.fetch(['name'])
+        (pickings.location_id | pickings.location_dest_id).fetch(
+            ['complete_name'])
+        pickings.partner_id.fetch(['name', 'street', 'state_id', 'zip',
+                                   'country_id', 'phone'])
+        move_ids = defaultdict(list)
+        for move in moves:
+            move_ids[move.picking_id.id].append(move.id)
+        return {picking.id: self.env['stock.move'].browse(move_ids[picking.id])
+                for picking in pickings}
 
-    def _add_picking_line_to_excel(self, sheet, picking, row, border):
+    def _write_excel_sheet(self, sheet, picking, moves, formats):
+        """ From this function we can create and design the Excel sheet of
+        one picking and map the values in the corresponding cells, row by
+        row
+        :param sheet: Current Excel sheet where data to be added
+        :param picking: Object of transfer in which data adding
+        :param moves: Prefetched stock moves of the picking
+        :param formats: Excel styling of the workbook
+        """
+        picking_name = 'Delivery - ' + picking.name
+        company_name = 'Company Name : ' + picking.company_id.name
+        partner = picking.partner_id
+        txt = formats['txt']
+        sheet.set_column(0, 8, 25)
+        sheet.merge_range('B2:E3', picking_name, formats['head'])
+        sheet.merge_range('B4:E4', company_name, txt)
+        sheet.write('A6', 'Customer/Vendor Name', txt)
+        sheet.write('B6', partner.name or '')
+        sheet.write('D6', 'Scheduled Date', txt)
+        sheet.write('E6', str(picking.scheduled_date))
+        sheet.write('B7', partner.street or '')
+        sheet.write('D7', 'Effective Date', txt)
+        sheet.write('E7', str(picking.date_done or ''))
+        sheet.write('B8', partner.state_id.name or '')
+        sheet.write('D8', 'Operation Type', txt)
+        sheet.write('E8', picking.picking_type_id.display_name)
+        sheet.write('B9', partner.zip or '')
+        sheet.write('D9', 'Source Location', txt)
+        sheet.write('E9', picking.location_id.complete_name)
+        sheet.write('B10', partner.country_id.name or '')
+        sheet.write('D10', 'Destination Location', txt)
+        sheet.write('E10', picking.location_dest_id.complete_name)
+        sheet.write('B11', partner.phone or '')
+        sheet.write('D11', 'State', txt)
+        sheet.write('E11', picking.state)
+        sheet.write('A13', 'Responsible Person', txt)
+        sheet.write('B13', 'Source Document', txt)
+        sheet.write('A14', picking.user_id.name or '')
+        sheet.write('B14', picking.origin or '')
+        sheet.write_row('A16', ['Product', 'Description', 'Scheduled Date',
+                                'Deadline', 'Quantity', 'Quantity Done'],
+                        formats['txt_border'])
+        row = 17
+        # calling this function for adding picking line data to the
+        # Excel sheet
+        self._add_picking_line_to_excel(sheet, moves, row, formats['border'])
+
+    def _add_picking_line_to_excel(self, sheet, moves, row, border):
         """
             Function to add stock picking line values to the Excel file
             :param sheet: Current Excel sheet where data to be added
-            :param picking : Object of transfer in which data adding
+            :param moves: Prefetched stock moves of the transfer
             :param row:Excel row value of next data to be added
             :param border :Excel styling for adding border for each cell
         """
-        # For adding value of the sale order line
-        for line in picking.move_ids:
-            # Copy the value to a variable set black if it is null
-            # instead of printing 'FALSE' in the report
-            date_deadline = str(line.date_deadline) if \
-                line.date_deadline is not False else ''
-            date = str(line.date)
-            sheet.write(row, 0, line.product_id.name, border)
-            sheet.write(row, 1, line.description_picking, border)
-            sheet.write(row, 2, date, border)
-            sheet.write(row, 3, date_deadline, border)
-            sheet.write(row, 4, line.product_uom_qty, border)
-            sheet.write(row, 5, line.quantity, border)
+        for line in moves:
+            sheet.write_row(row, 0, [
+                line.product_id.name or '',
+                line.description_picking or '',
+                str(line.date),
+                str(line.date_deadline or ''),
+                line.product_uom_qty,
+                line.quantity,
+            ], border)
             row += 1
+
+    def _get_excel_tabular_header(self):
+        """ Column titles of the single sheet layout """
+        return ['Reference', 'Scheduled Date', 'Effective Date', 'Partner',
+                'Operation Type', 'Source Location', 'Destination Location',
+                'State', 'Product', 'Description', 'Date', 'Deadline',
+                'Quantity', 'Quantity Done']
+
+    def _get_excel_tabular_rows(self, picking, moves):
+        """ One row per stock move, repeating the picking values """
+        picking_values = [
+            picking.name,
+            str(picking.scheduled_date),
+            str(picking.date_done or ''),
+            picking.partner_id.name or '',
+            picking.picking_type_id.display_name,
+            picking.location_id.complete_name,
+            picking.location_dest_id.complete_name,
+            picking.state,
+        ]
+        if not moves:
+            return [picking_values]
+        return [picking_values + [
+            line.product_id.name or '',
+            line.description_picking or '',
+            str(line.date),
+            str(line.date_deadline or ''),
+            line.product_uom_qty,
+            line.quantity,
+        ] for line in moves]
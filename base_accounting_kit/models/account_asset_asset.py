@@ -165,27 +165,26 @@ class AccountAssetAsset(models.Model):
 
     @api.model
     def compute_generated_entries(self, date, asset_type=None):
-        """Compute generated entries for assets based on the provided date and asset type."""
+        """Compute generated entries for assets based on the provided date and asset type.
+        The due lines of all running assets are loaded with one search and
+        their entries are created and posted together."""
         # Entries generated : one by grouped category and one by asset from ungrouped category
-        created_move_ids = []
         type_domain = []
         if asset_type:
             type_domain = [("type", "=", asset_type)]
 
-        ungrouped_assets = self.env["account.asset.asset"].search(
-            type_domain
-            + [("state", "=", "open"), ("category_id.group_entries", "=", False)]
+        assets = self.env["account.asset.asset"].search(
+            type_domain + [("state", "=", "open")]
         )
-        created_move_ids += ungrouped_assets._compute_entries(date, group_entries=False)
-
-        for grouped_category in self.env["account.asset.category"].search(
-            type_domain + [("group_entries", "=", True)]
-        ):
-            assets = self.env["account.asset.asset"].search(
-                [("state", "=", "open"), ("category_id", "=", grouped_category.id)]
-            )
-            created_move_ids += assets._compute_entries(date, group_entries=True)
-        return created_move_ids
+        depreciation_lines = self.env["account.asset.depreciation.line"].search(
+            [
+                ("asset_id", "in", assets.ids),
+                ("depreciation_date", "<=", date),
+                ("move_check", "=", False),
+            ],
+            order="asset_id, sequence",
+        )
+        return depreciation_lines._create_depreciation_moves()
 
     def _compute_board_amount(
         self,
@@ -274,23 +273,18 @@ class AccountAssetAsset(models.Model):
             undone_dotation_number += 1
         return undone_dotation_number
 
-    def compute_depreciation_board(self):
-        """
-        Compute the depreciation schedule for the asset based on its current state and parameters.
-        This method calculates the depreciation amount for each period and generates depreciation entries accordingly.
+    def _prepare_depreciation_board_vals(self, last_depreciation_dates=None):
+        """Values of the unposted depreciation lines of the asset.
+
+        :param last_depreciation_dates: result of _get_last_depreciation_date()
+            for many assets, fetched once by compute_depreciation_board()
         """
         self.ensure_one()
         posted_depreciation_line_ids = self.depreciation_line_ids.filtered(
             lambda x: x.move_check
         ).sorted(key=lambda l: l.depreciation_date)
-        unposted_depreciation_line_ids = self.depreciation_line_ids.filtered(
-            lambda x: not x.move_check
-        )
 
-        # Remove old unposted depreciation lines. We cannot use unlink() with One2many field
-        commands = [
-            (2, line_id.id, False) for line_id in unposted_depreciation_line_ids
-        ]
+        vals_list = []
 
         if self.value_residual != 0.0:
             amount_to_depr = residual_amount = self.value_residual
@@ -301,14 +295,16 @@ class AccountAssetAsset(models.Model):
                     and posted_depreciation_line_ids[-1].depreciation_date
                 ):
                     last_depreciation_date = datetime.strptime(
-                        posted_depreciation_line_ids[-1].depreciation_date, DF
+                        str(posted_depreciation_line_ids[-1].depreciation_date), DF
                     ).date()
                     depreciation_date = last_depreciation_date + relativedelta(
                         months=+self.method_period
                     )
                 else:
+                    if last_depreciation_dates is None:
+                        last_depreciation_dates = self._get_last_depreciation_date()
                     depreciation_date = datetime.strptime(
-                        str(self._get_last_depreciation_date()[self.id]), DF
+                        str(last_depreciation_dates[self.id]), DF
                     ).date()
             else:
                 # depreciation_date = 1st of January of purchase year if annual valuation, 1st of
@@ -380,7 +376,7 @@ class AccountAssetAsset(models.Model):
                     - (self.salvage_value + residual_amount),
                     "depreciation_date": depreciation_date.strftime(DF),
                 }
-                commands.append((0, False, vals))
+                vals_list.append(vals)
                 # Considering Depr. Period as months
                 depreciation_date = date(year, month, day) + relativedelta(
                     months=+self.method_period
@@ -389,12 +385,30 @@ class AccountAssetAsset(models.Model):
                 month = depreciation_date.month
                 year = depreciation_date.year
 
-        self.write({"depreciation_line_ids": commands})
-        last_depr_date = None
-        if self.depreciation_line_ids:
-            last_depr_date = max(self.depreciation_line_ids.mapped("depreciation_date"))
-        if last_depr_date:
-            self._compute_entries(date=last_depr_date)
+        return vals_list
+
+    def compute_depreciation_board(self):
+        """
+        Compute the depreciation schedule for the assets based on their current state and parameters.
+        This method calculates the depreciation amount for each period and generates depreciation entries accordingly.
+        The boards of all assets in self are replaced with one unlink and one create.
+        """
+        if not self:
+            return True
+        prorata_assets = self.filtered("prorata")
+        last_depreciation_dates = (
+            prorata_assets._get_last_depreciation_date() if prorata_assets else {}
+        )
+        vals_list = []
+        for asset in self:
+            vals_list += asset._prepare_depreciation_board_vals(last_depreciation_dates)
+
+        # Remove old unposted depreciation lines and create the new ones
+        self.depreciation_line_ids.filtered(lambda x: not x.move_check).unlink()
+        new_lines = self.env["account.asset.depreciation.line"].create(vals_list)
+        if new_lines:
+            # entries up to the last line of each asset, i.e. all unposted lines
+            self._compute_entries(date=max(new_lines.mapped("depreciation_date")))
         return True
 
     def validate(self):
@@ -640,8 +654,7 @@ class AccountAssetAsset(models.Model):
         """Updates the records with the provided values and computes the depreciation board if necessary."""
         res = super(AccountAssetAsset, self).write(vals)
         if "depreciation_line_ids" not in vals and "state" not in vals:
-            for rec in self:
-                rec.compute_depreciation_board()
+            self.compute_depreciation_board()
         return res
 
     def open_entries(self):
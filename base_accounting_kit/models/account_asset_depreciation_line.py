@@ -19,7 +19,7 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-from odoo import api, fields, models, _
+from odoo import Command, api, fields, models, _
 from odoo.exceptions import UserError
 from odoo.tools import float_compare
 
@@ -62,159 +62,107 @@ class AccountAssetDepreciationLine(models.Model):
                 True if line.move_id and line.move_id.state == "posted" else False
             )
 
-    def create_move(self, post_move=True):
-        """Create accounting moves for asset depreciation lines."""
-        created_moves = self.env["account.move"]
-        prec = self.env["decimal.precision"].precision_get("Account")
-        if self.mapped("move_id"):
-            raise UserError(
-                _(
-                    "This depreciation is already linked to a journal entry! Please post or delete it."
+    def _get_company_amounts(self, depreciation_date=None):
+        """Amount of each line in its company currency, keyed by line id.
+        Conversion rates are fetched once per (currency, company, date)
+        instead of once per line."""
+        rates = {}
+        amounts = {}
+        for line in self:
+            asset = line.asset_id
+            company_currency = asset.company_id.currency_id
+            current_currency = asset.currency_id
+            line_date = (
+                depreciation_date
+                or line.depreciation_date
+                or fields.Date.context_today(self)
+            )
+            if current_currency == company_currency:
+                amounts[line.id] = line.amount
+                continue
+            key = (current_currency, asset.company_id, line_date)
+            if key not in rates:
+                rates[key] = self.env["res.currency"]._get_conversion_rate(
+                    current_currency, company_currency, asset.company_id, line_date
                 )
+            amounts[line.id] = company_currency.round(line.amount * rates[key])
+        return amounts
+
+    def _prepare_move_vals(self, amounts):
+        """Values of the depreciation entry of each line, in the order of self.
+        Line counts per asset and accounting partners are resolved once."""
+        prec = self.env["decimal.precision"].precision_get("Account")
+        line_counts = {
+            asset.id: count
+            for asset, count in self._read_group(
+                [("asset_id", "in", self.asset_id.ids)], ["asset_id"], ["__count"]
             )
+        }
+        partners = {}
+        vals_list = []
         for line in self:
-            category_id = line.asset_id.category_id
+            asset = line.asset_id
+            category_id = asset.category_id
             depreciation_date = (
                 self.env.context.get("depreciation_date")
                 or line.depreciation_date
                 or fields.Date.context_today(self)
             )
-            company_currency = line.asset_id.company_id.currency_id
-            current_currency = line.asset_id.currency_id
-            amount = current_currency._convert(
-                line.amount,
-                company_currency,
-                line.asset_id.company_id,
-                depreciation_date,
-            )
-            asset_name = line.asset_id.name + " (%s/%s)" % (
+            amount = amounts[line.id]
+            if asset.partner_id not in partners:
+                partners[asset.partner_id] = self.env[
+                    "res.partner"
+                ]._find_accounting_partner(asset.partner_id)
+            partner = partners[asset.partner_id]
+            asset_name = asset.name + " (%s/%s)" % (
                 line.sequence,
-                len(line.asset_id.depreciation_line_ids),
+                line_counts.get(asset.id, 0),
             )
-            partner = self.env["res.partner"]._find_accounting_partner(
-                line.asset_id.partner_id
-            )
-            move_line_1 = {
-                "name": asset_name,
-                "account_id": category_id.account_depreciation_id.id,
-                "debit": (
-                    0.0
-                    if float_compare(amount, 0.0, precision_digits=prec) > 0
-                    else -amount
-                ),
-                "credit": (
-                    amount
-                    if float_compare(amount, 0.0, precision_digits=prec) > 0
-                    else 0.0
-                ),
-                "journal_id": category_id.journal_id.id,
-                "partner_id": partner.id,
-                "currency_id": company_currency != current_currency
-                and current_currency.id
-                or company_currency.id,
-                "amount_currency": company_currency != current_currency
-                and -1.0 * line.amount
-                or 0.0,
-            }
-            move_line_2 = {
-                "name": asset_name,
-                "account_id": category_id.account_depreciation_expense_id.id,
-                "credit": (
-                    0.0
-                    if float_compare(amount, 0.0, precision_digits=prec) > 0
-                    else -amount
-                ),
-                "debit": (
-                    amount
-                    if float_compare(amount, 0.0, precision_digits=prec) > 0
-                    else 0.0
-                ),
-                "journal_id": category_id.journal_id.id,
-                "partner_id": partner.id,
-                "currency_id": company_currency != current_currency
-                and current_currency.id
-                or company_currency.id,
-                "amount_currency": company_currency != current_currency
-                and line.amount
-                or 0.0,
-            }
-            line_ids = [
-                (
-                    0,
-                    0,
-                    {
-                        "account_id": category_id.account_depreciation_id.id,
-                        "partner_id": partner.id,
-                        "credit": (
-                            amount
-                            if float_compare(amount, 0.0, precision_digits=prec) > 0
-                            else 0.0
-                        ),
-                    },
-                ),
-                (
-                    0,
-                    0,
-                    {
-                        "account_id": category_id.account_depreciation_expense_id.id,
-                        "partner_id": partner.id,
-                        "debit": (
-                            amount
-                            if float_compare(amount, 0.0, precision_digits=prec) > 0
-                            else 0.0
-                        ),
-                    },
-                ),
-            ]
-            move = self.env["account.move"].create(
+            positive = float_compare(amount, 0.0, precision_digits=prec) > 0
+            vals_list.append(
                 {
-                    "ref": line.asset_id.code,
+                    "ref": asset.code,
                     "date": depreciation_date or False,
                     "journal_id": category_id.journal_id.id,
-                    "line_ids": line_ids,
+                    "line_ids": [
+                        Command.create(
+                            {
+                                "name": asset_name,
+                                "account_id": category_id.account_depreciation_id.id,
+                                "partner_id": partner.id,
+                                "debit": 0.0 if positive else -amount,
+                                "credit": amount if positive else 0.0,
+                            }
+                        ),
+                        Command.create(
+                            {
+                                "name": asset_name,
+                                "account_id": category_id.account_depreciation_expense_id.id,
+                                "partner_id": partner.id,
+                                "debit": amount if positive else 0.0,
+                                "credit": 0.0 if positive else -amount,
+                            }
+                        ),
+                    ],
+                    "asset_depreciation_ids": [Command.link(line.id)],
                 }
             )
-            for move_line in move.line_ids:
-                if move_line.account_id.id == move_line_1["account_id"]:
-                    move_line.write(
-                        {"credit": move_line_1["credit"], "debit": move_line_1["debit"]}
-                    )
-                elif move_line.account_id.id == move_line_2["account_id"]:
-                    move_line.write(
-                        {"debit": move_line_2["debit"], "credit": move_line_2["credit"]}
-                    )
-            if move.line_ids.filtered(lambda x: x.name == "Automatic Balancing Line"):
-                move.line_ids.filtered(
-                    lambda x: x.name == "Automatic Balancing Line"
-                ).unlink()
-            line.write({"move_id": move.id, "move_check": True})
-            created_moves |= move
+        return vals_list
 
-        if post_move and created_moves:
-            created_moves.filtered(
-                lambda m: any(
-                    m.asset_depreciation_ids.mapped("asset_id.category_id.open_asset")
-                )
-            ).post()
-        return [x.id for x in created_moves]
-
-    def create_grouped_move(self, post_move=True):
-        """Create a grouped accounting move for asset depreciation lines."""
-        if not self.exists():
-            return []
-        created_moves = self.env["account.move"]
+    def _prepare_grouped_move_vals(self, amounts):
+        """Values of the grouped depreciation entry of lines sharing one category."""
         category_id = self[
             0
         ].asset_id.category_id  # we can suppose that all lines have the same category
         depreciation_date = self.env.context.get(
             "depreciation_date"
         ) or fields.Date.context_today(self)
-        amount = 0.0
-        for line in self:
-            # Sum amount of all depreciation lines
-            company_currency = line.asset_id.company_id.currency_id
-            current_currency = line.asset_id.currency_id
-            amount += current_currency.compute(line.amount, company_currency)
+        amount = sum(amounts[line.id] for line in self)
+        analytic_distribution = (
+            {str(category_id.account_analytic_id.id): 100}
+            if category_id.account_analytic_id
+            else False
+        )
 
         name = category_id.name + _(" (grouped)")
         move_line_1 = {
@@ -222,11 +170,8 @@ class AccountAssetDepreciationLine(models.Model):
             "account_id": category_id.account_depreciation_id.id,
             "debit": 0.0,
             "credit": amount,
-            "journal_id": category_id.journal_id.id,
-            "analytic_account_id": (
-                category_id.account_analytic_id.id
-                if category_id.type == "sale"
-                else False
+            "analytic_distribution": (
+                analytic_distribution if category_id.type == "sale" else False
             ),
         }
         move_line_2 = {
@@ -234,28 +179,105 @@ class AccountAssetDepreciationLine(models.Model):
             "account_id": category_id.account_depreciation_expense_id.id,
             "credit": 0.0,
             "debit": amount,
-            "journal_id": category_id.journal_id.id,
-            "analytic_account_id": (
-                category_id.account_analytic_id.id
-                if category_id.type == "purchase"
-                else False
+            "analytic_distribution": (
+                analytic_distribution if category_id.type == "purchase" else False
             ),
         }
-        move_vals = {
+        return {
             "ref": category_id.name,
             "date": depreciation_date or False,
             "journal_id": category_id.journal_id.id,
-            "line_ids": [(0, 0, move_line_1), (0, 0, move_line_2)],
+            "line_ids": [Command.create(move_line_1), Command.create(move_line_2)],
+            "asset_depreciation_ids": [Command.link(line.id) for line in self],
         }
-        move = self.env["account.move"].create(move_vals)
-        self.write({"move_id": move.id, "move_check": True})
-        created_moves |= move
+
+    def create_move(self, post_move=True):
+        """Create accounting moves for asset depreciation lines."""
+        if self.mapped("move_id"):
+            raise UserError(
+                _(
+                    "This depreciation is already linked to a journal entry! Please post or delete it."
+                )
+            )
+        if not self:
+            return []
+        depreciation_date = self.env.context.get("depreciation_date")
+        created_moves = self.env["account.move"].create(
+            self._prepare_move_vals(self._get_company_amounts(depreciation_date))
+        )
+
+        if post_move and created_moves:
+            created_moves.filtered(
+                lambda m: any(
+                    m.asset_depreciation_ids.mapped("asset_id.category_id.open_asset")
+                )
+            ).post()
+        return [x.id for x in created_moves]
+
+    def create_grouped_move(self, post_move=True):
+        """Create a grouped accounting move for asset depreciation lines."""
+        if not self.exists():
+            return []
+        depreciation_date = self.env.context.get(
+            "depreciation_date"
+        ) or fields.Date.context_today(self)
+        created_moves = self.env["account.move"].create(
+            self._prepare_grouped_move_vals(self._get_company_amounts(depreciation_date))
+        )
 
         if post_move and created_moves:
-            self.post_lines_and_close_asset()
             created_moves.post()
         return [x.id for x in created_moves]
 
+    def _create_depreciation_moves(self, post_move=True):
+        """Create the entries of many depreciation lines at once: one entry
+        per line of ungrouped categories and one per grouped category, with
+        a single create, then post them together.
+
+        :return: ids of the created moves
+        """
+        if self.mapped("move_id"):
+            raise UserError(
+                _(
+                    "This depreciation is already linked to a journal entry! Please post or delete it."
+                )
+            )
+        if not self:
+            return []
+        grouped_lines = self.filtered(lambda l: l.asset_id.category_id.group_entries)
+        ungrouped_lines = self - grouped_lines
+
+        # Ungrouped lines convert at their own date, grouped lines at the run date
+        amounts = ungrouped_lines._get_company_amounts(
+            self.env.context.get("depreciation_date")
+        )
+        amounts.update(
+            grouped_lines._get_company_amounts(
+                self.env.context.get("depreciation_date")
+                or fields.Date.context_today(self)
+            )
+        )
+
+        vals_list = ungrouped_lines._prepare_move_vals(amounts)
+        for category in grouped_lines.asset_id.category_id:
+            vals_list.append(
+                grouped_lines.filtered(
+                    lambda l: l.asset_id.category_id == category
+                )._prepare_grouped_move_vals(amounts)
+            )
+        created_moves = self.env["account.move"].create(vals_list)
+
+        if post_move and created_moves:
+            # grouped entries are always posted, single ones when the category says so
+            created_moves.filtered(
+                lambda m: any(
+                    m.asset_depreciation_ids.asset_id.category_id.mapped(
+                        lambda c: c.group_entries or c.open_asset
+                    )
+                )
+            ).post()
+        return created_moves.ids
+
     def post_lines_and_close_asset(self):
         # we re-evaluate the assets to determine whether we can close them
         # `message_post` invalidates the (whole) cache
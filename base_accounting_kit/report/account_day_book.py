@@ -20,7 +20,7 @@
 #
 #############################################################################
 import time
-from datetime import timedelta, datetime
+from datetime import datetime
 from odoo import api, models, _
 from odoo.exceptions import UserError
 
@@ -29,13 +29,17 @@ class DayBookPdfReport(models.AbstractModel):
     _name = "report.base_accounting_kit.day_book_report_template"
     _description = "Day Book Report"
 
-    def _get_account_move_entry(self, accounts, form_data, pass_date):
+    def _get_account_move_entries(self, accounts, form_data, date_from, date_to):
+        """Fetch the move lines of the whole period with a single query.
+
+        The lines are ordered by date and every row carries the subtotals of
+        its day (window functions), so the day book is built without one
+        round-trip per day. Days without postings simply do not appear.
+
+        :return: dict mapping each posted date to its debit, credit, balance
+                 and lines, in ascending date order
+        """
         cr = self.env.cr
-        move_line = self.env["account.move.line"]
-        tables, where_clause, where_params = move_line._query_get()
-        wheres = [""]
-        if where_clause.strip():
-            wheres.append(where_clause.strip())
         if form_data["target_move"] == "posted":
             target_move = "AND m.state = 'posted'"
         else:
@@ -45,9 +49,10 @@ class DayBookPdfReport(models.AbstractModel):
                 SELECT l.id AS lid, acc.name as accname, l.account_id AS 
                 account_id, l.date AS ldate, j.code AS lcode, l.currency_id, 
                 l.amount_currency, l.ref AS lref, l.name AS lname,
-                 COALESCE(l.debit,0) AS debit, COALESCE(l.credit,0) AS credit, 
-                COALESCE(SUM(l.debit),0) - COALESCE(SUM(l.credit), 0) AS 
-                balance,
+                COALESCE(l.debit,0) AS debit, COALESCE(l.credit,0) AS credit, 
+                COALESCE(l.debit,0) - COALESCE(l.credit,0) AS balance,
+                SUM(COALESCE(l.debit,0)) OVER day AS day_debit,
+                SUM(COALESCE(l.credit,0)) OVER day AS day_credit,
                 m.name AS move_name, c.symbol AS currency_code, p.name 
                 AS partner_name
                 FROM account_move_line l
@@ -58,28 +63,42 @@ class DayBookPdfReport(models.AbstractModel):
                 JOIN account_account acc ON (l.account_id = acc.id) 
                 WHERE l.account_id IN %s AND l.journal_id IN %s """
             + target_move
-            + """ AND l.date = %s
-                GROUP BY l.id, l.account_id, l.date,
-                     j.code, l.currency_id, l.amount_currency, l.ref, 
-                     l.name, m.name, c.symbol, p.name , acc.name
-                     ORDER BY l.date DESC
+            + """ AND l.date BETWEEN %s AND %s
+                WINDOW day AS (PARTITION BY l.date)
+                ORDER BY l.date, l.id
         """
         )
-        params = (tuple(accounts.ids), tuple(form_data["journal_ids"]), pass_date)
+        params = (
+            tuple(accounts.ids),
+            tuple(form_data["journal_ids"]),
+            date_from,
+            date_to,
+        )
         cr.execute(sql, params)
-        data = cr.dictfetchall()
         res = {}
-        debit = credit = balance = 0.00
-        for line in data:
-            debit += line["debit"]
-            credit += line["credit"]
-            balance += line["balance"]
-        res["debit"] = debit
-        res["credit"] = credit
-        res["balance"] = balance
-        res["lines"] = data
+        for line in cr.dictfetchall():
+            day_debit = line.pop("day_debit")
+            day_credit = line.pop("day_credit")
+            day = res.get(line["ldate"])
+            if day is None:
+                day = res[line["ldate"]] = {
+                    "debit": day_debit,
+                    "credit": day_credit,
+                    "balance": day_debit - day_credit,
+                    "lines": [],
+                }
+            day["lines"].append(line)
         return res
 
+    def _get_account_move_entry(self, accounts, form_data, pass_date):
+        res = self._get_account_move_entries(
+            accounts, form_data, pass_date, pass_date
+        )
+        return next(
+            iter(res.values()),
+            {"debit": 0.0, "credit": 0.0, "balance": 0.0, "lines": []},
+        )
+
     @api.model
     def _get_report_values(self, docids, data=None):
         if not data.get("form") or not self.env.context.get("active_model"):
@@ -107,26 +126,19 @@ class DayBookPdfReport(models.AbstractModel):
 
         date_start = datetime.strptime(form_data["date_from"], "%Y-%m-%d").date()
         date_end = datetime.strptime(form_data["date_to"], "%Y-%m-%d").date()
-        days = date_end - date_start
-        dates = []
-        record = []
-        for i in range(days.days + 1):
-            dates.append(date_start + timedelta(days=i))
-        for head in dates:
-            pass_date = str(head)
-            accounts_res = self.with_context(
-                data["form"].get("used_context", {})
-            )._get_account_move_entry(accounts, form_data, pass_date)
-            if accounts_res["lines"]:
-                record.append(
-                    {
-                        "date": head,
-                        "debit": accounts_res["debit"],
-                        "credit": accounts_res["credit"],
-                        "balance": accounts_res["balance"],
-                        "child_lines": accounts_res["lines"],
-                    }
-                )
+        entries = self.with_context(
+            data["form"].get("used_context", {})
+        )._get_account_move_entries(accounts, form_data, date_start, date_end)
+        record = [
+            {
+                "date": head,
+                "debit": accounts_res["debit"],
+                "credit": accounts_res["credit"],
+                "balance": accounts_res["balance"],
+                "child_lines": accounts_res["lines"],
+            }
+            for head, accounts_res in entries.items()
+        ]
         return {
             "doc_ids": docids,
             "doc_model": model,
@@ -28,6 +28,8 @@ class ReportJournal(models.AbstractModel):
     _name = "report.base_accounting_kit.report_journal_audit"
     _description = "Journal Report"
 
+    _STREAM_BATCH_SIZE = 2000
+
     def lines(self, target_move, journal_ids, sort_selection, data):
         if isinstance(journal_ids, int):
             journal_ids = [journal_ids]
@@ -58,89 +60,167 @@ class ReportJournal(models.AbstractModel):
         ids = (x[0] for x in self.env.cr.fetchall())
         return self.env["account.move.line"].browse(ids)
 
-    def _sum_debit(self, data, journal_id):
+    def _iter_lines(self, target_move, journal_id, sort_selection, data):
+        """Stream the lines of a journal in ``sort_selection`` order.
+
+        The lines are read through a server-side cursor by batches of
+        ``_STREAM_BATCH_SIZE`` rows as plain dicts, so a large journal is
+        never loaded in memory (nor browsed through the ORM) before being
+        rendered.
+        """
         move_state = ["draft", "posted"]
-        if data["form"].get("target_move", "all") == "posted":
+        if target_move == "posted":
             move_state = ["posted"]
 
         query_get_clause = self._get_query_get_clause(data)
-        params = [tuple(move_state), tuple(journal_id.ids)] + query_get_clause[2]
-        self.env.cr.execute(
-            "SELECT SUM(debit) FROM " + query_get_clause[0] + ", account_move am "
-            'WHERE "account_move_line".move_id=am.id AND am.state IN %s'
-            ' AND "account_move_line".journal_id IN %s AND '
+        params = [tuple(move_state), journal_id] + query_get_clause[2]
+        cursor_name = "journal_audit_lines_%s" % journal_id
+        query = (
+            "DECLARE " + cursor_name + " NO SCROLL CURSOR FOR "
+            "SELECT COALESCE(NULLIF(am.name, '/'), '*' || am.id) AS move_name, "
+            '"account_move_line".date, "account_move_line".account_id, '
+            "p.name AS partner_name, "
+            '"account_move_line".name, "account_move_line".debit, '
+            '"account_move_line".credit, "account_move_line".amount_currency, '
+            '"account_move_line".currency_id FROM '
+            + query_get_clause[0]
+            + (
+                " JOIN account_move am "
+                'ON "account_move_line".move_id = am.id '
+                "LEFT JOIN res_partner p "
+                'ON "account_move_line".partner_id = p.id '
+                "WHERE am.state IN %s AND "
+                '"account_move_line".journal_id = %s AND '
+            )
             + query_get_clause[1]
-            + " ",
-            tuple(params),
+            + " ORDER BY "
         )
-        return self.env.cr.fetchone()[0] or 0.0
+        if sort_selection == "date":
+            query += '"account_move_line".date'
+        else:
+            query += "am.name"
+        query += ', "account_move_line".move_id, "account_move_line".id'
 
-    def _sum_credit(self, data, journal_id):
+        cr = self.env.cr
+        cr.execute(query, tuple(params))
+        accounts = self.env["account.account"]
+        currencies = self.env["res.currency"]
+        account_codes = {}
+        try:
+            while True:
+                cr.execute(
+                    "FETCH %s FROM %s" % (self._STREAM_BATCH_SIZE, cursor_name)
+                )
+                rows = cr.dictfetchall()
+                if not rows:
+                    break
+                missing = {r["account_id"] for r in rows} - account_codes.keys()
+                for account in accounts.browse(missing):
+                    account_codes[account.id] = account.code
+                for row in rows:
+                    row["account_code"] = account_codes[row["account_id"]]
+                    row["currency_id"] = currencies.browse(row["currency_id"])
+                    yield row
+        finally:
+            cr.execute("CLOSE %s" % cursor_name)
+
+    def _get_journal_totals(self, data, journal_ids):
+        """Return ``{journal_id: (debit, credit)}`` with one grouped query."""
         move_state = ["draft", "posted"]
         if data["form"].get("target_move", "all") == "posted":
             move_state = ["posted"]
 
         query_get_clause = self._get_query_get_clause(data)
-        params = [tuple(move_state), tuple(journal_id.ids)] + query_get_clause[2]
+        params = [tuple(move_state), tuple(journal_ids)] + query_get_clause[2]
         self.env.cr.execute(
-            "SELECT SUM(credit) FROM " + query_get_clause[0] + ", account_move am "
-            'WHERE "account_move_line".move_id=am.id AND am.state IN %s AND "account_move_line".journal_id IN %s AND '
+            'SELECT "account_move_line".journal_id, '
+            "COALESCE(SUM(debit), 0), COALESCE(SUM(credit), 0) FROM "
+            + query_get_clause[0]
+            + ", account_move am "
+            'WHERE "account_move_line".move_id=am.id AND am.state IN %s'
+            ' AND "account_move_line".journal_id IN %s AND '
             + query_get_clause[1]
-            + " ",
+            + ' GROUP BY "account_move_line".journal_id',
             tuple(params),
         )
-        return self.env.cr.fetchone()[0] or 0.0
+        res = dict.fromkeys(journal_ids, (0.0, 0.0))
+        for journal_id, debit, credit in self.env.cr.fetchall():
+            res[journal_id] = (debit, credit)
+        return res
 
-    def _get_taxes(self, data, journal_id):
+    def _get_journal_taxes(self, data, journals):
+        """Return the tax declaration of every journal with one grouped query.
+
+        The base amounts (lines carrying the tax) and the tax amounts (tax
+        lines) are aggregated per journal and per tax in the same pass. As
+        before, only the taxes having a base in the journal are declared.
+
+        :return: ``{journal_id: {tax: {"base_amount", "tax_amount"}}}``
+        """
         move_state = ["draft", "posted"]
         if data["form"].get("target_move", "all") == "posted":
             move_state = ["posted"]
 
         query_get_clause = self._get_query_get_clause(data)
-        params = [tuple(move_state), tuple(journal_id.ids)] + query_get_clause[2]
+        params = [tuple(move_state), tuple(journals.ids)] + query_get_clause[2]
         query = (
             """
-            SELECT rel.account_tax_id, SUM("account_move_line".balance) AS base_amount
-            FROM account_move_line_account_tax_rel rel, """
+            WITH lines AS (
+                SELECT "account_move_line".id, "account_move_line".journal_id,
+                    "account_move_line".balance,
+                    "account_move_line".debit - "account_move_line".credit
+                        AS amount,
+                    "account_move_line".tax_line_id
+                FROM """
             + query_get_clause[0]
-            + """ 
-            LEFT JOIN account_move am ON "account_move_line".move_id = am.id
-            WHERE "account_move_line".id = rel.account_move_line_id
-                AND am.state IN %s
-                AND "account_move_line".journal_id IN %s
-                AND """
+            + """
+                JOIN account_move am ON "account_move_line".move_id = am.id
+                WHERE am.state IN %s
+                    AND "account_move_line".journal_id IN %s
+                    AND """
             + query_get_clause[1]
             + """
-           GROUP BY rel.account_tax_id"""
+            )
+            SELECT journal_id, tax_id, SUM(base_amount), SUM(tax_amount),
+                BOOL_OR(is_base)
+            FROM (
+                SELECT l.journal_id, rel.account_tax_id AS tax_id,
+                    l.balance AS base_amount, 0 AS tax_amount, TRUE AS is_base
+                FROM lines l
+                JOIN account_move_line_account_tax_rel rel
+                    ON rel.account_move_line_id = l.id
+                UNION ALL
+                SELECT l.journal_id, l.tax_line_id, 0, l.amount, FALSE
+                FROM lines l
+                WHERE l.tax_line_id IS NOT NULL
+            ) amounts
+            GROUP BY journal_id, tax_id"""
         )
         self.env.cr.execute(query, tuple(params))
-        ids = []
-        base_amounts = {}
-        for row in self.env.cr.fetchall():
-            ids.append(row[0])
-            base_amounts[row[0]] = row[1]
-
-        res = {}
-        for tax in self.env["account.tax"].browse(ids):
-            self.env.cr.execute(
-                "SELECT sum(debit - credit) FROM "
-                + query_get_clause[0]
-                + ", account_move am "
-                'WHERE "account_move_line".move_id=am.id AND am.state IN %s AND "account_move_line".journal_id IN %s AND '
-                + query_get_clause[1]
-                + " AND tax_line_id = %s",
-                tuple(params + [tax.id]),
-            )
-            res[tax] = {
-                "base_amount": base_amounts[tax.id],
-                "tax_amount": self.env.cr.fetchone()[0] or 0.0,
-            }
-            if journal_id.type == "sale":
+        rows = self.env.cr.fetchall()
+        taxes = self.env["account.tax"].browse({row[1] for row in rows})
+        res = {journal.id: {} for journal in journals}
+        for journal_id, tax_id, base_amount, tax_amount, has_base in rows:
+            if not has_base:
+                continue
+            if journals.browse(journal_id).type == "sale":
                 # sales operation are credits
-                res[tax]["base_amount"] = res[tax]["base_amount"] * -1
-                res[tax]["tax_amount"] = res[tax]["tax_amount"] * -1
+                base_amount, tax_amount = -base_amount, -tax_amount
+            res[journal_id][taxes.browse(tax_id)] = {
+                "base_amount": base_amount,
+                "tax_amount": tax_amount,
+            }
         return res
 
+    def _sum_debit(self, data, journal_id):
+        return self._get_journal_totals(data, journal_id.ids)[journal_id.id][0]
+
+    def _sum_credit(self, data, journal_id):
+        return self._get_journal_totals(data, journal_id.ids)[journal_id.id][1]
+
+    def _get_taxes(self, data, journal_id):
+        return self._get_journal_taxes(data, journal_id)[journal_id.id]
+
     def _get_query_get_clause(self, data):
         return (
             self.env["account.move.line"]
@@ -158,19 +238,21 @@ class ReportJournal(models.AbstractModel):
         target_move = data["form"].get("target_move", "all")
         sort_selection = data["form"].get("sort_selection", "date")
 
-        res = {}
-        for journal in data["form"]["journal_ids"]:
-            res[journal] = self.with_context(
-                data["form"].get("used_context", {})
-            ).lines(target_move, journal, sort_selection, data)
+        journals = self.env["account.journal"].browse(data["form"]["journal_ids"])
+        report = self.with_context(data["form"].get("used_context", {}))
+        res = {
+            journal.id: report._iter_lines(
+                target_move, journal.id, sort_selection, data
+            )
+            for journal in journals
+        }
         return {
             "doc_ids": data["form"]["journal_ids"],
             "doc_model": self.env["account.journal"],
             "data": data,
-            "docs": self.env["account.journal"].browse(data["form"]["journal_ids"]),
+            "docs": journals,
             "time": time,
             "lines": res,
-            "sum_credit": self._sum_credit,
-            "sum_debit": self._sum_debit,
-            "get_taxes": self._get_taxes,
+            "totals": self._get_journal_totals(data, journals.ids),
+            "taxes": self._get_journal_taxes(data, journals),
         }
@@ -28,9 +28,8 @@ class ReportPartnerLedger(models.AbstractModel):
     _name = "report.base_accounting_kit.report_partnerledger"
     _description = "Partner Ledger Report"
 
-    def _lines(self, data, partner):
-        full_account = []
-        currency = self.env["res.currency"]
+    def _get_ledger_query_parts(self, data):
+        """Return the FROM/WHERE fragments and params shared by the queries."""
         query_get_data = (
             self.env["account.move.line"]
             .with_context(data["form"].get("used_context", {}))
@@ -41,106 +40,116 @@ class ReportPartnerLedger(models.AbstractModel):
             if data["form"]["reconciled"]
             else ' AND "account_move_line".full_reconcile_id IS NULL '
         )
+        where = (
+            """"account_move_line".partner_id IN %s
+                AND m.state IN %s
+                AND "account_move_line".account_id IN %s AND """
+            + query_get_data[1]
+            + reconcile_clause
+        )
+        return query_get_data[0], where, query_get_data[2]
+
+    def _get_partner_ledger_data(self, data, partner_ids):
+        """Compute the lines and totals of all partners at once.
+
+        One grouped query returns the debit/credit totals per partner and one
+        ordered query returns the detail lines with their running balance
+        (window function), instead of four queries per partner while QWeb
+        renders.
+
+        :return: dict mapping each partner id to a dict with ``debit``,
+                 ``credit``, ``balance`` and ``lines``
+        """
+        result = {
+            partner_id: {"debit": 0.0, "credit": 0.0, "balance": 0.0, "lines": []}
+            for partner_id in partner_ids
+        }
+        if not partner_ids or not data["computed"]["account_ids"]:
+            return result
+        tables, where, where_params = self._get_ledger_query_parts(data)
         params = [
-            partner.id,
+            tuple(partner_ids),
             tuple(data["computed"]["move_state"]),
             tuple(data["computed"]["account_ids"]),
-        ] + query_get_data[2]
-        query = (
+        ] + where_params
+
+        self.env.cr.execute(
+            """
+            SELECT "account_move_line".partner_id,
+                COALESCE(SUM("account_move_line".debit), 0) AS debit,
+                COALESCE(SUM("account_move_line".credit), 0) AS credit
+            FROM """
+            + tables
+            + """
+            JOIN account_move m ON (m.id="account_move_line".move_id)
+            WHERE """
+            + where
+            + """
+            GROUP BY "account_move_line".partner_id""",
+            tuple(params),
+        )
+        for partner_id, debit, credit in self.env.cr.fetchall():
+            result[partner_id].update(
+                debit=debit, credit=credit, balance=debit - credit
+            )
+
+        self.env.cr.execute(
             """
-            SELECT "account_move_line".id, "account_move_line".date, j.code,
+            SELECT "account_move_line".id, "account_move_line".partner_id,
+             "account_move_line".date, j.code,
              acc.name as a_name, "account_move_line".ref, 
              m.name as move_name, "account_move_line".name, 
              "account_move_line".debit, "account_move_line".credit, 
+             SUM("account_move_line".debit - "account_move_line".credit) OVER (
+                PARTITION BY "account_move_line".partner_id
+                ORDER BY "account_move_line".date, "account_move_line".id
+             ) AS progress,
              "account_move_line".amount_currency,
              "account_move_line".currency_id, c.symbol AS currency_code
             FROM """
-            + query_get_data[0]
+            + tables
             + """
             LEFT JOIN account_journal j ON ("account_move_line".journal_id = j.id)
             LEFT JOIN account_account acc ON ("account_move_line".account_id = acc.id)
             LEFT JOIN res_currency c ON ("account_move_line".currency_id=c.id)
-            LEFT JOIN account_move m ON (m.id="account_move_line".move_id)
-            WHERE "account_move_line".partner_id = %s
-                AND m.state IN %s
-                AND "account_move_line".account_id IN %s AND """
-            + query_get_data[1]
-            + reconcile_clause
+            JOIN account_move m ON (m.id="account_move_line".move_id)
+            WHERE """
+            + where
             + """
-                ORDER BY "account_move_line".date"""
+            ORDER BY "account_move_line".partner_id, "account_move_line".date,
+                "account_move_line".id""",
+            tuple(params),
         )
-        self.env.cr.execute(query, tuple(params))
-        res = self.env.cr.dictfetchall()
-        sum = 0.0
-        lang_code = self.env.context.get("lang") or "en_US"
-        lang = self.env["res.lang"]
-        lang_id = lang._lang_get(lang_code)
-        date_format = lang_id.date_format
-        for r in res:
-            r["date"] = r["date"]
+        currency = self.env["res.currency"]
+        for r in self.env.cr.dictfetchall():
             r["displayed_name"] = "-".join(
                 r[field_name]
                 for field_name in ("move_name", "ref", "name")
                 if r[field_name] not in (None, "", "/")
             )
-            sum += r["debit"] - r["credit"]
-            r["progress"] = sum
             r["currency_id"] = currency.browse(r.get("currency_id"))
-            full_account.append(r)
-        return full_account
+            result[r.pop("partner_id")]["lines"].append(r)
+        return result
+
+    def _lines(self, data, partner):
+        return self._get_partner_ledger_data(data, [partner.id])[partner.id][
+            "lines"
+        ]
 
     def _sum_partner(self, data, partner, field):
         if field not in ["debit", "credit", "debit - credit"]:
             return
-        result = 0.0
-        query_get_data = (
-            self.env["account.move.line"]
-            .with_context(data["form"].get("used_context", {}))
-            ._query_get()
-        )
-        reconcile_clause = (
-            ""
-            if data["form"]["reconciled"]
-            else ' AND "account_move_line".full_reconcile_id IS NULL '
-        )
+        totals = self._get_partner_ledger_data(data, [partner.id])[partner.id]
+        return totals["balance" if field == "debit - credit" else field]
 
-        params = [
-            partner.id,
-            tuple(data["computed"]["move_state"]),
-            tuple(data["computed"]["account_ids"]),
-        ] + query_get_data[2]
-        query = (
-            """SELECT sum("""
-            + field
-            + """)
-                FROM """
-            + query_get_data[0]
-            + """, account_move AS m
-                WHERE "account_move_line".partner_id = %s
-                    AND m.id = "account_move_line".move_id
-                    AND m.state IN %s
-                    AND account_id IN %s
-                    AND """
-            + query_get_data[1]
-            + reconcile_clause
-        )
-        self.env.cr.execute(query, tuple(params))
-
-        contemp = self.env.cr.fetchone()
-        if contemp is not None:
-            result = contemp[0] or 0.0
-        return result
-
-    @api.model
-    def _get_report_values(self, docids, data=None):
-        if not data.get("form"):
-            raise UserError(
-                _("Form content is missing, this report cannot be printed.")
-            )
+    def _get_partner_ids(self, data):
+        """Fill ``data["computed"]`` and return the partners of the ledger,
+        sorted by reference and name.
 
+        When ``data["form"]["partner_ids"]`` is set (chunked printing), the
+        result is restricted to those partners.
+        """
         data["computed"] = {}
-
-        obj_partner = self.env["res.partner"]
         query_get_data = (
             self.env["account.move.line"]
             .with_context(data["form"].get("used_context", {}))
@@ -175,6 +184,10 @@ class ReportPartnerLedger(models.AbstractModel):
             if data["form"]["reconciled"]
             else ' AND "account_move_line".full_reconcile_id IS NULL '
         )
+        partner_clause = ""
+        if data["form"].get("partner_ids"):
+            partner_clause = ' AND "account_move_line".partner_id IN %s '
+            params.append(tuple(data["form"]["partner_ids"]))
         query = (
             """
             SELECT DISTINCT "account_move_line".partner_id
@@ -190,17 +203,28 @@ class ReportPartnerLedger(models.AbstractModel):
                 AND """
             + query_get_data[1]
             + reconcile_clause
+            + partner_clause
         )
         self.env.cr.execute(query, tuple(params))
         partner_ids = [res["partner_id"] for res in self.env.cr.dictfetchall()]
-        partners = obj_partner.browse(partner_ids)
+        partners = self.env["res.partner"].browse(partner_ids)
         partners = sorted(partners, key=lambda x: (x.ref or "", x.name or ""))
+        return [partner.id for partner in partners]
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        if not data.get("form"):
+            raise UserError(
+                _("Form content is missing, this report cannot be printed.")
+            )
+
+        partner_ids = self._get_partner_ids(data)
+        partners = self.env["res.partner"].browse(partner_ids)
         return {
             "doc_ids": partner_ids,
             "doc_model": self.env["res.partner"],
             "data": data,
             "docs": partners,
             "time": time,
-            "lines": self._lines,
-            "sum_partner": self._sum_partner,
+            "partner_data": self._get_partner_ledger_data(data, partner_ids),
         }
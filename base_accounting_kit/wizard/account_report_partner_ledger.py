@@ -19,7 +19,11 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
+import io
+import zipfile
+
 from odoo import fields, models
+from odoo.tools import split_every
 
 
 class AccountPartnerLedger(models.TransientModel):
@@ -53,12 +57,53 @@ class AccountPartnerLedger(models.TransientModel):
         "currency differs from the company currency.",
     )
     reconciled = fields.Boolean("Reconciled Entries")
+    pdf_chunk_size = fields.Integer(
+        "Partners per PDF",
+        help="When set and the ledger contains more partners, the report is "
+        "rendered as several PDFs of this many partners each, downloaded as "
+        "a zip archive. Keeps the memory used by the PDF rendering bounded.",
+    )
 
     def _print_report(self, data):
         data = self.pre_print_report(data)
         data["form"].update(
             {"reconciled": self.reconciled, "amount_currency": self.amount_currency}
         )
+        if self.pdf_chunk_size > 0:
+            partner_ids = self.env[
+                "report.base_accounting_kit.report_partnerledger"
+            ]._get_partner_ids(dict(data, form=dict(data["form"])))
+            if len(partner_ids) > self.pdf_chunk_size:
+                return self._print_report_chunked(data, partner_ids)
         return self.env.ref(
             "base_accounting_kit.action_report_partnerledger"
         ).report_action(self, data=data)
+
+    def _print_report_chunked(self, data, partner_ids):
+        """Render the ledger by chunks of partners into a zip of PDFs."""
+        report = self.env.ref("base_accounting_kit.action_report_partnerledger")
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            chunks = split_every(self.pdf_chunk_size, partner_ids, list)
+            for index, chunk in enumerate(chunks, 1):
+                chunk_data = dict(data, form=dict(data["form"], partner_ids=chunk))
+                pdf_content = self.env["ir.actions.report"]._render_qweb_pdf(
+                    report, self.ids, data=chunk_data
+                )[0]
+                archive.writestr("partner_ledger_%03d.pdf" % index, pdf_content)
+                # drop the records of the rendered chunk from the cache
+                self.env.invalidate_all()
+        attachment = self.env["ir.attachment"].create(
+            {
+                "name": "%s.zip" % self.name,
+                "raw": buffer.getvalue(),
+                "mimetype": "application/zip",
+                "res_model": self._name,
+                "res_id": self.id,
+            }
+        )
+        return {
+            "type": "ir.actions.act_url",
+            "url": "/web/content/%s?download=true" % attachment.id,
+            "target": "self",
+        }
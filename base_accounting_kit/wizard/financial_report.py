@@ -20,8 +20,29 @@
 #
 #############################################################################
 import re
+from collections import defaultdict
 from odoo import api, models, fields
 
+# Report lines of type 'account_type' that cover several account types,
+# identified by their name
+NAMED_REPORT_ACCOUNT_TYPES = {
+    "Expenses": ["expense", "expense_depreciation", "expense_direct_cost"],
+    "Liability": [
+        "liability_payable",
+        "equity",
+        "liability_current",
+        "liability_non_current",
+    ],
+    "Assets": [
+        "asset_receivable",
+        "asset_cash",
+        "asset_current",
+        "asset_non_current",
+        "asset_prepayments",
+        "asset_fixed",
+    ],
+}
+
 
 class FinancialReport(models.TransientModel):
     _name = "financial.report"
@@ -177,6 +198,16 @@ class FinancialReport(models.TransientModel):
         """compute the balance, debit
         and credit for the provided accounts
         """
+        return self._compute_account_balances(accounts, [self])[0]
+
+    def _compute_account_balances(self, accounts, periods):
+        """compute the balance, debit and credit of the provided accounts
+        for several periods with one grouped query.
+
+        :param periods: list of financial.report recordsets, each with the
+            context (dates, journals, target moves) of one period
+        :return: one dict {account_id: {'debit', 'credit', 'balance'}} per period
+        """
         mapping = {
             "balance": "COALESCE(SUM(debit),0) - COALESCE(SUM(credit), 0)"
             " as balance",
@@ -184,32 +215,82 @@ class FinancialReport(models.TransientModel):
             "credit": "COALESCE(SUM(credit), 0) as credit",
         }
 
-        res = {}
-        for account in accounts:
-            res[account.id] = dict((fn, 0.0) for fn in mapping.keys())
+        results = [
+            {
+                account.id: dict((fn, 0.0) for fn in mapping.keys())
+                for account in accounts
+            }
+            for period in periods
+        ]
         if accounts:
-            tables, where_clause, where_params = self.env[
-                "account.move.line"
-            ]._query_get()
-            tables = tables.replace('"', "") if tables else "account_move_line"
-            wheres = [""]
-            if where_clause.strip():
-                wheres.append(where_clause.strip())
-            filters = " AND ".join(wheres)
-            request = (
-                "SELECT account_id as id, "
-                + ", ".join(mapping.values())
-                + " FROM "
-                + tables
-                + " WHERE account_id IN %s "
-                + filters
-                + " GROUP BY account_id"
-            )
-            params = (tuple(accounts._ids),) + tuple(where_params)
-            self.env.cr.execute(request, params)
+            requests = []
+            params = []
+            for index, period in enumerate(periods):
+                tables, where_clause, where_params = period.env[
+                    "account.move.line"
+                ]._query_get()
+                tables = tables.replace('"', "") if tables else "account_move_line"
+                wheres = [""]
+                if where_clause.strip():
+                    wheres.append(where_clause.strip())
+                filters = " AND ".join(wheres)
+                requests.append(
+                    "SELECT %s as period, account_id as id, "
+                    + ", ".join(mapping.values())
+                    + " FROM "
+                    + tables
+                    + " WHERE account_id IN %s "
+                    + filters
+                    + " GROUP BY account_id"
+                )
+                params += [index, tuple(accounts._ids)] + list(where_params)
+            self.env.cr.execute(" UNION ALL ".join(requests), tuple(params))
             for row in self.env.cr.dictfetchall():
-                res[row["id"]] = row
-        return res
+                results[row.pop("period")][row["id"]] = row
+        return results
+
+    def _get_report_accounts(self, reports):
+        """Accounts of every 'accounts' and 'account_type' line reachable
+        from the given reports (linked reports and children included),
+        with a single account search for all account types.
+
+        :return: dict {report_id: account.account recordset}
+        """
+        nodes = self.env["account.financial.report"]
+        todo = reports
+        while todo:
+            nodes |= todo
+            todo = (
+                todo.filtered(lambda r: r.type == "account_report").account_report_id
+                | todo.filtered(lambda r: r.type == "sum").children_ids
+            ) - nodes
+
+        types_by_report = {}
+        for report in nodes.filtered(lambda r: r.type == "account_type"):
+            types_by_report[report.id] = NAMED_REPORT_ACCOUNT_TYPES.get(
+                report.name
+            ) or ([report.account_type_ids] if report.account_type_ids else [])
+        account_types = {
+            account_type
+            for report_types in types_by_report.values()
+            for account_type in report_types
+        }
+        type_accounts = self.env["account.account"]
+        if account_types:
+            type_accounts = type_accounts.search(
+                [("account_type", "in", list(account_types))]
+            )
+
+        report_accounts = {}
+        for report in nodes:
+            if report.type == "accounts":
+                report_accounts[report.id] = report.account_ids
+            elif report.type == "account_type":
+                report_types = types_by_report[report.id]
+                report_accounts[report.id] = type_accounts.filtered(
+                    lambda a: a.account_type in report_types
+                )
+        return report_accounts
 
     def _compute_report_balance(self, reports):
         """returns a dictionary with key=the ID of a record and
@@ -221,91 +302,56 @@ class FinancialReport(models.TransientModel):
         'account_report' : it's the amount of the related report
         'sum' : it's the sum of the children of this record
          (aka a 'view' record)"""
-        res = {}
+        return self._compute_report_balances(reports, [self])[0]
+
+    def _compute_report_balances(self, reports, periods):
+        """Same as _compute_report_balance() for several periods at once.
+        The accounts of the whole tree are collected first, their balances
+        for all periods are computed with one query and the totals of the
+        report lines are rolled up in memory.
+
+        :param periods: list of financial.report recordsets, each with the
+            context of one period
+        :return: one _compute_report_balance() dict per period
+        """
         fields = ["credit", "debit", "balance"]
-        for report in reports:
-            if report.id in res:
-                continue
-            res[report.id] = dict((fn, 0.0) for fn in fields)
-            if report.type == "accounts":
-                # it's the sum of the linked accounts
-                res[report.id]["account"] = self._compute_account_balance(
-                    report.account_ids
-                )
-                for value in res[report.id]["account"].values():
-                    for field in fields:
-                        res[report.id][field] += value.get(field)
-            elif report.type == "account_type":
-                # it's the sum the leaf accounts
-                #  with such an account type
-                accounts = self.env["account.account"].search(
-                    [("account_type", "=", report.account_type_ids)]
-                )
-                if report.name == "Expenses":
-                    accounts = self.env["account.account"].search(
-                        [
-                            (
-                                "account_type",
-                                "in",
-                                [
-                                    "expense",
-                                    "expense_depreciation",
-                                    "expense_direct_cost",
-                                ],
-                            )
-                        ]
-                    )
-                if report.name == "Liability":
-                    accounts = self.env["account.account"].search(
-                        [
-                            (
-                                "account_type",
-                                "in",
-                                [
-                                    "liability_payable",
-                                    "equity",
-                                    "liability_current",
-                                    "liability_non_current",
-                                ],
-                            )
-                        ]
-                    )
-                if report.name == "Assets":
-                    accounts = self.env["account.account"].search(
-                        [
-                            (
-                                "account_type",
-                                "in",
-                                [
-                                    "asset_receivable",
-                                    "asset_cash",
-                                    "asset_current",
-                                    "asset_non_current",
-                                    "asset_prepayments",
-                                    "asset_fixed",
-                                ],
-                            )
-                        ]
-                    )
+        report_accounts = self._get_report_accounts(reports)
+        accounts = self.env["account.account"].union(*report_accounts.values())
+        account_balances = self._compute_account_balances(accounts, periods)
 
-                res[report.id]["account"] = self._compute_account_balance(accounts)
+        results = []
+        for balances in account_balances:
+            res = {}
 
-                for value in res[report.id]["account"].values():
-                    for field in fields:
-                        res[report.id][field] += value.get(field)
-            elif report.type == "account_report" and report.account_report_id:
-                # it's the amount of the linked report
-                res2 = self._compute_report_balance(report.account_report_id)
-                for key, value in res2.items():
-                    for field in fields:
-                        res[report.id][field] += value[field]
-            elif report.type == "sum":
-                # it's the sum of the children of this account.report
-                res2 = self._compute_report_balance(report.children_ids)
-                for key, value in res2.items():
+            def rollup(report):
+                if report.id in res:
+                    return res[report.id]
+                values = res[report.id] = dict((fn, 0.0) for fn in fields)
+                if report.type in ("accounts", "account_type"):
+                    values["account"] = {
+                        account.id: dict(balances[account.id])
+                        for account in report_accounts[report.id]
+                    }
+                    for value in values["account"].values():
+                        for field in fields:
+                            values[field] += value.get(field)
+                elif report.type == "account_report" and report.account_report_id:
+                    # it's the amount of the linked report
+                    linked = rollup(report.account_report_id)
                     for field in fields:
-                        res[report.id][field] += value[field]
-        return res
+                        values[field] += linked[field]
+                elif report.type == "sum":
+                    # it's the sum of the children of this account.report
+                    for child in report.children_ids:
+                        child_values = rollup(child)
+                        for field in fields:
+                            values[field] += child_values[field]
+                return values
+
+            for report in reports:
+                rollup(report)
+            results.append(res)
+        return results
 
     def get_account_lines(self, data):
         lines = []
@@ -313,11 +359,13 @@ class FinancialReport(models.TransientModel):
             [("id", "=", data["account_report_id"][0])]
         )
         child_reports = account_report._get_children_by_order()
-        res = self.with_context(data.get("used_context"))._compute_report_balance(
-            child_reports
-        )
+        periods = [self.with_context(data.get("used_context"))]
+        if data["enable_filter"]:
+            periods.append(self)
+        balances = self._compute_report_balances(child_reports, periods)
+        res = balances[0]
         if data["enable_filter"]:
-            comparison_res = self._compute_report_balance(child_reports)
+            comparison_res = balances[1]
             for report_id, value in comparison_res.items():
                 res[report_id]["comp_bal"] = value["balance"]
                 report_acc = res[report_id].get("account")
@@ -365,6 +413,7 @@ class FinancialReport(models.TransientModel):
 
             if res[report.id].get("account"):
                 sub_lines = []
+                report_account_ids = list(res[report.id]["account"])
                 for account_id, value in res[report.id]["account"].items():
                     # if there are accounts to display,
                     #  we add them to the lines with a level equals
@@ -373,7 +422,11 @@ class FinancialReport(models.TransientModel):
                     #  that would conflicts with the level of data
                     # financial reports for Assets, liabilities...)
                     flag = False
-                    account = self.env["account.account"].browse(account_id)
+                    account = (
+                        self.env["account.account"]
+                        .browse(account_id)
+                        .with_prefetch(report_account_ids)
+                    )
                     # new_r_name = str(report.name)
                     # new_r_name = new_r_name.replace(" ", "-") + "-"
                     vals = {
@@ -412,55 +465,46 @@ class FinancialReport(models.TransientModel):
         return lines
 
     def find_journal_items(self, report_lines, form):
+        """Journal items of the account lines of the report, fetched for
+        all accounts with one query"""
         cr = self.env.cr
         journal_items = []
-        for i in report_lines:
-            if i["type"] == "account":
-                account = i["account"]
-                if form["target_move"] == "posted":
-                    search_query = (
-                        "select aml.id, am.id as j_id, "
-                        "aml.account_id, aml.date, aml.name as "
-                        "label, am.name, (aml.debit-aml.credit) as "
-                        "balance, aml.debit, aml.credit, "
-                        "aml.partner_id  from "
-                        "account_move_line aml "
-                        "join account_move am on (aml.move_id=am.id"
-                        " and am.state=%s) where aml.account_id=%s"
-                    )
-                    vals = [form["target_move"]]
-                else:
-                    search_query = (
-                        "select aml.id, am.id as j_id, "
-                        "aml.account_id, aml.date, aml.name as "
-                        "label, am.name, (aml.debit-aml.credit) as "
-                        "balance, aml.debit, aml.credit, "
-                        "aml.partner_id from account_move_line aml"
-                        " join account_move am on "
-                        "(aml.move_id=am.id) where "
-                        "aml.account_id=%s"
-                    )
-                    vals = []
-                if form["date_from"] and form["date_to"]:
-                    search_query += " and aml.date>=%s and aml.date<=%s"
-                    vals += [account, form["date_from"], form["date_to"]]
-                elif form["date_from"]:
-                    search_query += " and aml.date>=%s"
-                    vals += [account, form["date_from"]]
-                elif form["date_to"]:
-                    search_query += " and aml.date<=%s"
-                    vals += [account, form["date_to"]]
-                else:
-                    vals += [account]
-                cr.execute(search_query, tuple(vals))
-                items = cr.dictfetchall()
-
-                for j in items:
-                    temp = j["id"]
-                    j["id"] = re.sub("[^0-9a-zA-Z]+", "", i["name"]) + str(temp)
-                    j["p_id"] = str(i["a_id"])
-                    j["type"] = "journal_item"
-                    journal_items.append(j)
+        account_lines = [i for i in report_lines if i["type"] == "account"]
+        if not account_lines:
+            return journal_items
+        search_query = (
+            "select aml.id, am.id as j_id, "
+            "aml.account_id, aml.date, aml.name as "
+            "label, am.name, (aml.debit-aml.credit) as "
+            "balance, aml.debit, aml.credit, "
+            "aml.partner_id from account_move_line aml"
+            " join account_move am on (aml.move_id=am.id"
+        )
+        vals = []
+        if form["target_move"] == "posted":
+            search_query += " and am.state=%s"
+            vals.append(form["target_move"])
+        search_query += ") where aml.account_id in %s"
+        vals.append(tuple({i["account"] for i in account_lines}))
+        if form["date_from"]:
+            search_query += " and aml.date>=%s"
+            vals.append(form["date_from"])
+        if form["date_to"]:
+            search_query += " and aml.date<=%s"
+            vals.append(form["date_to"])
+        search_query += " order by aml.account_id, aml.id"
+        cr.execute(search_query, tuple(vals))
+        items_by_account = defaultdict(list)
+        for item in cr.dictfetchall():
+            items_by_account[item["account_id"]].append(item)
+
+        for i in account_lines:
+            for item in items_by_account[i["account"]]:
+                j = dict(item)
+                j["id"] = re.sub("[^0-9a-zA-Z]+", "", i["name"]) + str(item["id"])
+                j["p_id"] = str(i["a_id"])
+                j["type"] = "journal_item"
+                journal_items.append(j)
         return journal_items
 
     @api.model
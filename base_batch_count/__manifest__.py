@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+{
+    'name': 'Batched Record Counts',
+    'version': '18.0.1.0.0',
+    'summary': 'Count related records of a whole recordset with one query',
+    'description': """
+        Technical helper shared by the modules that display record counters
+        (smart buttons, list and kanban columns).
+
+        Computing such counters with one search_count per record issues one
+        query per displayed record. The _batch_count helper computes them for
+        the whole recordset with a single _read_group.
+    """,
+    'category': 'Technical',
+    'depends': ['base'],
+    'data': [],
+    'installable': True,
+    'application': False,
+    'license': 'LGPL-3',
+    'auto_install': False,
+}
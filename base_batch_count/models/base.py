@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+from odoo.osv import expression
+
+
+class Base(models.AbstractModel):
+    _inherit = 'base'
+
+    def _batch_count(self, comodel_name, inverse_field, domain=None):
+        """
+        Count the records of ``comodel_name`` linked to each record of self.
+
+        Replaces one search_count per record by a single _read_group on the
+        whole recordset, e.g. in the compute method of a counter field::
+
+            counts = self._batch_count('hr.loan', 'employee_id')
+            for employee in self:
+                employee.loan_count = counts[employee]
+
+        Args:
+            comodel_name: Model of the records to count
+            inverse_field: Many2one field of ``comodel_name`` pointing to self
+            domain: Optional extra domain on ``comodel_name``
+
+        Returns:
+            dict: {record: count} for every record of self (0 when none,
+                  and for records not saved yet)
+        """
+        ids = [record_id for record_id in self._origin.ids if record_id]
+        counts = {}
+        if ids:
+            groups = self.env[comodel_name]._read_group(
+                expression.AND([[(inverse_field, 'in', ids)], domain or []]),
+                [inverse_field],
+                ['__count'],
+            )
+            counts = {record.id: count for record, count in groups}
+        return {record: counts.get(record._origin.id, 0) for record in self}
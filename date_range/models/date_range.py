@@ -1,8 +1,15 @@
 # Copyright 2016 ACSONE SA/NV (<http://acsone.eu>)
 # License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl).
 
+import logging
+
 from odoo import api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import constraint_definition
+
+_logger = logging.getLogger(__name__)
+
+OVERLAP_EXCLUSION_CONSTRAINT = "date_range_no_overlap_excl"
 
 
 class DateRange(models.Model):
@@ -39,6 +46,11 @@ class DateRange(models.Model):
         readonly=False,
         store=True,
     )
+    allow_overlap = fields.Boolean(
+        related="type_id.allow_overlap",
+        store=True,
+        help="Technical field used by the optional overlap exclusion constraint.",
+    )
 
     _sql_constraints = [
         (
@@ -48,6 +60,58 @@ class DateRange(models.Model):
         )
     ]
 
+    def init(self):
+        self._init_overlap_exclusion_constraint()
+
+    def _init_overlap_exclusion_constraint(self):
+        """Add a GiST exclusion constraint forbidding overlapping ranges
+
+        The constraint is optional: it is only created when the btree_gist
+        extension is available in the database, as it is needed to combine
+        equality on the type and company with the range overlap operator.
+        Ranges of types allowing overlap are left out of the constraint.
+
+        The constraint is deferred to the end of the transaction, so that
+        _validate_range() reports overlaps first with a readable message;
+        the constraint only catches what the python check cannot see, like
+        concurrent transactions.
+        """
+        cr = self.env.cr
+        definition = constraint_definition(
+            cr, self._table, OVERLAP_EXCLUSION_CONSTRAINT
+        )
+        if definition and "DEFERRABLE INITIALLY DEFERRED" in definition:
+            return
+        cr.execute("SELECT 1 FROM pg_extension WHERE extname = 'btree_gist'")
+        if not cr.fetchone():
+            return
+        try:
+            with cr.savepoint(flush=False):
+                if definition:
+                    # created immediate by a previous version
+                    cr.execute(
+                        f"ALTER TABLE {self._table} "
+                        f"DROP CONSTRAINT {OVERLAP_EXCLUSION_CONSTRAINT}"
+                    )
+                cr.execute(
+                    f"""
+                    ALTER TABLE {self._table}
+                    ADD CONSTRAINT {OVERLAP_EXCLUSION_CONSTRAINT}
+                    EXCLUDE USING gist (
+                        type_id WITH =,
+                        company_id WITH =,
+                        DATERANGE(date_start, date_end, '[]') WITH &&
+                    ) WHERE (active AND NOT COALESCE(allow_overlap, FALSE))
+                    DEFERRABLE INITIALLY DEFERRED"""
+                )
+        except Exception:
+            _logger.warning(
+                "Unable to add the overlap exclusion constraint on %s, "
+                "overlapping ranges are probably present.",
+                self._table,
+                exc_info=True,
+            )
+
     @api.depends("type_id.active")
     def _compute_active(self):
         for date in self:
@@ -71,41 +135,49 @@ class DateRange(models.Model):
                         "date_end": this.date_end,
                     }
                 )
-            if this.type_id.allow_overlap:
-                continue
-            # here we use a plain SQL query to benefit of the daterange
-            # function available in PostgresSQL
-            # (http://www.postgresql.org/docs/current/static/rangetypes.html)
-            SQL = """
-                SELECT
-                    id
-                FROM
-                    date_range dt
-                WHERE
-                    DATERANGE(dt.date_start, dt.date_end, '[]') &&
-                        DATERANGE(%s::date, %s::date, '[]')
-                    AND dt.id != %s
-                    AND dt.active
-                    AND dt.company_id = %s
-                    AND dt.type_id=%s;"""
-            self.env.cr.execute(
-                SQL,
-                (
-                    this.date_start,
-                    this.date_end,
-                    this.id,
-                    this.company_id.id or None,
-                    this.type_id.id,
-                ),
-            )
-            res = self.env.cr.fetchall()
-            if res:
-                dt = self.browse(res[0][0])
+        to_check = self.filtered(lambda r: not r.type_id.allow_overlap)
+        if not to_check:
+            return
+        overlaps = to_check._get_overlapping_ranges()
+        for this in to_check:
+            if this.id in overlaps:
+                dt = self.browse(overlaps[this.id])
                 raise ValidationError(
                     self.env._("%(thisname)s overlaps %(dtname)s")
                     % {"thisname": this.name, "dtname": dt.name}
                 )
 
+    def _get_overlapping_ranges(self):
+        """Return a mapping {range id: id of the first range it overlaps}
+
+        The whole recordset is checked at once with a self-join, using the
+        daterange function available in PostgreSQL
+        (http://www.postgresql.org/docs/current/static/rangetypes.html)
+        """
+        if not self.ids:
+            return {}
+        self.flush_model(["type_id", "date_start", "date_end", "company_id", "active"])
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT ON (this.id)
+                this.id, dt.id
+            FROM
+                date_range this
+            JOIN
+                date_range dt
+                    ON dt.type_id = this.type_id
+                    AND dt.company_id = this.company_id
+                    AND dt.id != this.id
+                    AND dt.active
+                    AND DATERANGE(dt.date_start, dt.date_end, '[]') &&
+                        DATERANGE(this.date_start, this.date_end, '[]')
+            WHERE
+                this.id IN %s
+            ORDER BY this.id, dt.date_start, dt.id;""",
+            (tuple(self.ids),),
+        )
+        return dict(self.env.cr.fetchall())
+
     def get_domain(self, field_name):
         self.ensure_one()
         return [(field_name, ">=", self.date_start), (field_name, "<=", self.date_end)]
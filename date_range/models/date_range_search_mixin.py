@@ -1,5 +1,7 @@
 # Copyright 2021 Opener B.V. <stefan@opener.amsterdam>
 # License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl).
+from datetime import timedelta
+
 from lxml import etree
 
 from odoo import api, fields, models
@@ -47,19 +49,37 @@ class DateRangeSearchMixin(models.AbstractModel):
             ranges = self.env["date.range"].search([("id", sub_op, value)])
         if not ranges:
             return FALSE_DOMAIN
-        domain = (len(ranges) - 1) * ["|"] + sum(
+        intervals = self._merge_date_range_intervals(ranges)
+        domain = (len(intervals) - 1) * ["|"] + sum(
             (
                 [
                     "&",
-                    (self._date_range_search_field, ">=", date_range.date_start),
-                    (self._date_range_search_field, "<=", date_range.date_end),
+                    (self._date_range_search_field, ">=", date_start),
+                    (self._date_range_search_field, "<=", date_end),
                 ]
-                for date_range in ranges
+                for date_start, date_end in intervals
             ),
             [],
         )
         return domain
 
+    @api.model
+    def _merge_date_range_intervals(self, ranges):
+        """Merge overlapping and adjacent date ranges
+
+        Return the minimal sorted list of (date_start, date_end) tuples
+        covering the same days as the given date ranges.
+        """
+        intervals = []
+        bounds = sorted((r.date_start, r.date_end) for r in ranges)
+        for date_start, date_end in bounds:
+            if intervals and date_start <= intervals[-1][1] + timedelta(days=1):
+                if date_end > intervals[-1][1]:
+                    intervals[-1] = (intervals[-1][0], date_end)
+                continue
+            intervals.append((date_start, date_end))
+        return intervals
+
     @api.model
     def get_view(self, view_id=None, view_type="form", **options):
         """Inject the dummy Many2one field in the search view"""
@@ -3,8 +3,14 @@
 
 import datetime
 
+from psycopg2 import IntegrityError
+
 from odoo.exceptions import UserError, ValidationError
 from odoo.tests.common import TransactionCase
+from odoo.tools import mute_logger
+from odoo.tools.sql import constraint_definition
+
+from ..models.date_range import OVERLAP_EXCLUSION_CONSTRAINT
 
 
 class DateRangeTest(TransactionCase):
@@ -108,6 +114,82 @@ class DateRangeTest(TransactionCase):
         )
         self.assertEqual(dr.name, "FS2016")
 
+    def test_overlap_batch(self):
+        with self.assertRaises(ValidationError) as cm, self.env.cr.savepoint():
+            self.date_range.create(
+                [
+                    {
+                        "name": "FS2015",
+                        "date_start": "2015-01-01",
+                        "date_end": "2015-12-31",
+                        "type_id": self.type.id,
+                    },
+                    {
+                        "name": "FS2016",
+                        "date_start": "2015-12-31",
+                        "date_end": "2016-12-31",
+                        "type_id": self.type.id,
+                    },
+                ]
+            )
+        message = str(cm.exception.args[0])
+        self.assertEqual(message, "FS2015 overlaps FS2016")
+        ranges = self.date_range.create(
+            [
+                {
+                    "name": "FS2015",
+                    "date_start": "2015-01-01",
+                    "date_end": "2015-12-31",
+                    "type_id": self.type.id,
+                },
+                {
+                    "name": "FS2016",
+                    "date_start": "2016-01-01",
+                    "date_end": "2016-12-31",
+                    "type_id": self.type.id,
+                },
+            ]
+        )
+        self.assertEqual(len(ranges), 2)
+        self.assertFalse(ranges._get_overlapping_ranges())
+
+    def test_overlap_exclusion_constraint(self):
+        definition = constraint_definition(
+            self.env.cr, "date_range", OVERLAP_EXCLUSION_CONSTRAINT
+        )
+        if not definition:
+            self.skipTest("btree_gist is not installed")
+        self.assertIn("DEFERRABLE INITIALLY DEFERRED", definition)
+        dr = self.date_range.create(
+            {
+                "name": "FS2015",
+                "date_start": "2015-01-01",
+                "date_end": "2015-12-31",
+                "type_id": self.type.id,
+            }
+        )
+        self.env.flush_all()
+        # bypass the python check, as a concurrent transaction would
+        with (
+            mute_logger("odoo.sql_db"),
+            self.assertRaises(IntegrityError),
+            self.env.cr.savepoint(),
+        ):
+            self.env.cr.execute(
+                """
+                INSERT INTO date_range
+                    (name, date_start, date_end, type_id, company_id, active,
+                     allow_overlap)
+                VALUES ('{"en_US": "FS2016"}', '2015-06-01', '2016-05-31',
+                        %s, %s, TRUE, FALSE)
+                """,
+                (self.type.id, dr.company_id.id),
+            )
+            self.env.cr.execute(
+                f"SET CONSTRAINTS {OVERLAP_EXCLUSION_CONSTRAINT} IMMEDIATE"
+            )
+        self.env.cr.execute(f"SET CONSTRAINTS {OVERLAP_EXCLUSION_CONSTRAINT} DEFERRED")
+
     def test_domain(self):
         dr = self.date_range.create(
             {
@@ -1,6 +1,8 @@
 # Copyright 2016 ACSONE SA/NV (<http://acsone.eu>)
 # Copyright 2021 Opener B.V. <stefan@opener.amsterdam>
 # License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl).
+import datetime
+
 from dateutil.rrule import MONTHLY
 from odoo_test_helper import FakeModelLoader
 
@@ -142,6 +144,31 @@ class TestDateRangeSearchMixin(TransactionCase):
             record, self.model.search([("date_range_search_id", "!=", True)])
         )
 
+    def test_02_search_domain_merged(self):
+        """Adjacent ranges are merged into a single clause"""
+        self.assertEqual(
+            self.model._search_date_range_search_id("in", self.ranges.ids),
+            [
+                "&",
+                ("test_date", ">=", datetime.date(1943, 1, 1)),
+                ("test_date", "<=", datetime.date(1943, 12, 31)),
+            ],
+        )
+        self.assertEqual(
+            self.model._search_date_range_search_id(
+                "in", (self.ranges[0] | self.ranges[2]).ids
+            ),
+            [
+                "|",
+                "&",
+                ("test_date", ">=", datetime.date(1943, 1, 1)),
+                ("test_date", "<=", datetime.date(1943, 3, 31)),
+                "&",
+                ("test_date", ">=", datetime.date(1943, 7, 1)),
+                ("test_date", "<=", datetime.date(1943, 9, 30)),
+            ],
+        )
+
     def test_03_read(self):
         """Read returns a falsy value"""
         record = self.model.create({"test_date": "1943-04-05"})
@@ -322,8 +322,7 @@ class DateRangeGenerator(models.TransientModel):
     def action_apply(self, batch=False):
         date_ranges = self._generate_date_ranges(batch=batch)
         if date_ranges:
-            for dr in date_ranges:
-                self.env["date.range"].create(dr)
+            self.env["date.range"].create(date_ranges)
         return self.env["ir.actions.actions"]._for_xml_id(
             "date_range.date_range_action"
         )
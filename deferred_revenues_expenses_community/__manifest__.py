@@ -5,9 +5,12 @@
     "category": "Accounting",
     "depends": ["account"],
     "data": [
+        "security/ir.model.access.csv",
+        "data/ir_cron_data.xml",
         "views/res_config_settings.xml",
         "views/res_company.xml",
         "views/account_move_views.xml",
+        "wizard/account_deferred_entries_wizard_views.xml",
     ],
     # 'images': ['static/description/banner.jpg'],
     "license": "AGPL-3",
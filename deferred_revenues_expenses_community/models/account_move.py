@@ -1,7 +1,9 @@
 import calendar
+from collections import defaultdict
 from contextlib import contextmanager
 from itertools import chain
 from dateutil.relativedelta import relativedelta
+import json
 import logging
 import re
 
@@ -400,6 +402,188 @@ class AccountMove(models.Model):
         to_unlink.unlink()
         (moves_fully_deferred + deferral_moves - to_unlink)._post(soft=True)
 
+    @api.model
+    def _get_grouped_deferral_lines(self, deferred_type, date_from, date_to):
+        """
+        :return: the deferred lines of the posted invoices of the current company that have a deferral starting
+            in [date_from, date_to] and no deferral entries yet.
+        """
+        move_types = (
+            self.get_purchase_types() if deferred_type == "expense" else self.get_sale_types()
+        )
+        moves = (
+            self.env["account.move.line"]
+            .search(
+                [
+                    ("company_id", "=", self.env.company.id),
+                    ("parent_state", "=", "posted"),
+                    ("move_id.move_type", "in", move_types),
+                    ("move_id.deferred_move_ids", "=", False),
+                    ("deferred_start_date", ">=", date_from),
+                    ("deferred_start_date", "<=", date_to),
+                    ("deferred_end_date", "!=", False),
+                ]
+            )
+            .move_id
+        )
+        return moves.line_ids.filtered(
+            lambda l: l.deferred_start_date and l.deferred_end_date
+        )
+
+    @api.model
+    def _generate_grouped_deferred_entries(self, deferred_type, date_from, date_to):
+        """
+        Generates the deferral entries of all the invoices of a period at once ("Manually & Grouped" method).
+
+        The amounts of every line for every month are computed with a single call to
+        `_get_deferred_amounts_by_line`. They are then netted into one deferral entry per month and account:
+        the balance moved to the deferred account in the month of the invoice, minus the amount recognized
+        in that month. Each entry is linked to the invoices it defers through `deferred_original_move_ids`.
+
+        :return: the created deferral entries
+        """
+        company = self.env.company
+        deferred_account = (
+            company.deferred_expense_account_id
+            if deferred_type == "expense"
+            else company.deferred_revenue_account_id
+        )
+        deferred_journal = (
+            company.deferred_expense_journal_id
+            if deferred_type == "expense"
+            else company.deferred_revenue_journal_id
+        )
+        if not deferred_journal:
+            raise UserError(
+                _("Please set the deferred journal in the accounting settings.")
+            )
+        if not deferred_account:
+            raise UserError(
+                _("Please set the deferred accounts in the accounting settings.")
+            )
+
+        lines_periods = []
+        for line in self._get_grouped_deferral_lines(deferred_type, date_from, date_to):
+            periods = line._get_deferred_periods()
+            if periods:
+                lines_periods.append((line, periods))
+        if not lines_periods:
+            return self.browse()
+
+        # One column per month spanned by the lines, computed for all lines in a single pass
+        ends_of_month = sorted(
+            {
+                period[1] + relativedelta(day=31)
+                for line, periods in lines_periods
+                for period in periods
+            }
+        )
+        month_periods = {
+            end_of_month: (end_of_month.replace(day=1), end_of_month, "current")
+            for end_of_month in ends_of_month
+        }
+        deferred_lines = self.env["account.move.line"].browse(
+            [line.id for line, periods in lines_periods]
+        )
+        amounts_by_line = self._get_deferred_amounts_by_line(
+            deferred_lines, list(month_periods.values()), deferred_type
+        )
+
+        # {(end of month, account id): {analytic distribution: balance}}
+        grouped_balances = defaultdict(lambda: defaultdict(float))
+        grouped_moves = defaultdict(set)
+        currency = company.currency_id
+        for (line, periods), line_amounts in zip(lines_periods, amounts_by_line):
+            analytic_key = json.dumps(line.analytic_distribution or {}, sort_keys=True)
+            invoice_key = (line.move_id.date + relativedelta(day=31), line.account_id.id)
+            grouped_balances[invoice_key][analytic_key] -= line.balance
+            grouped_moves[invoice_key].add(line.move_id.id)
+
+            remaining_balance = line.balance
+            for period_index, period in enumerate(periods):
+                end_of_month = period[1] + relativedelta(day=31)
+                # For the last period the balance is forced to the remaining balance to avoid rounding errors
+                if period_index == len(periods) - 1:
+                    balance = remaining_balance
+                else:
+                    balance = currency.round(line_amounts[month_periods[end_of_month]])
+                remaining_balance -= balance
+                period_key = (end_of_month, line.account_id.id)
+                grouped_balances[period_key][analytic_key] += balance
+                grouped_moves[period_key].add(line.move_id.id)
+
+        moves_vals = []
+        moves_lines_vals = []
+        no_product = {"product_id": False, "product_category_id": False}
+        for (end_of_month, account_id), balances in sorted(grouped_balances.items()):
+            balances = {
+                analytic_key: currency.round(balance)
+                for analytic_key, balance in balances.items()
+                if not currency.is_zero(balance)
+            }
+            if not balances:
+                # The deferral and the recognition of the month cancel each other
+                continue
+            ref = _("Grouped deferral of %s", end_of_month.strftime("%m/%Y"))
+            lines_vals = [
+                self.env["account.move.line"]._get_deferred_lines_values(
+                    account_id, balance, ref, json.loads(analytic_key) or False, no_product
+                )
+                for analytic_key, balance in balances.items()
+            ]
+            total = sum(balances.values())
+            if not currency.is_zero(total):
+                lines_vals.append(
+                    self.env["account.move.line"]._get_deferred_lines_values(
+                        deferred_account.id, -total, ref, False, no_product
+                    )
+                )
+            moves_vals.append(
+                {
+                    "move_type": "entry",
+                    "deferred_original_move_ids": [
+                        Command.set(list(grouped_moves[(end_of_month, account_id)]))
+                    ],
+                    "journal_id": deferred_journal.id,
+                    "company_id": company.id,
+                    "auto_post": "at_date",
+                    "ref": ref,
+                    "name": False,
+                    "date": end_of_month,
+                }
+            )
+            moves_lines_vals.append(lines_vals)
+
+        deferral_moves = self.create(moves_vals)
+        # As in _generate_deferred_entries, the lines are created once `deferred_original_move_ids` is set
+        for deferral_move, lines_vals in zip(deferral_moves, moves_lines_vals):
+            for line_vals in lines_vals:
+                line_vals["move_id"] = deferral_move.id
+        self.env["account.move.line"].create(list(chain(*moves_lines_vals)))
+        deferral_moves._post(soft=True)
+        _logger.info(
+            "Generated %s grouped %s deferral entries for %s invoice lines",
+            len(deferral_moves),
+            deferred_type,
+            len(lines_periods),
+        )
+        return deferral_moves
+
+    @api.model
+    def _cron_generate_grouped_deferred_entries(self):
+        """
+        Generates the grouped deferral entries up to the end of the previous month for the companies
+        using the "Manually & Grouped" method.
+        """
+        date_to = fields.Date.context_today(self).replace(day=1) - relativedelta(days=1)
+        for company in self.env["res.company"].search([]):
+            for deferred_type in ("expense", "revenue"):
+                if company[f"generate_deferred_{deferred_type}_entries_method"] != "manual":
+                    continue
+                self.with_company(company)._generate_grouped_deferred_entries(
+                    deferred_type, fields.Date.to_date(DEFERRED_DATE_MIN), date_to
+                )
+
     def open_deferred_entries(self):
         self.ensure_one()
         return {
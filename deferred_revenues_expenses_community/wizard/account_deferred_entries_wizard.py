@@ -0,0 +1,61 @@
+from dateutil.relativedelta import relativedelta
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError
+
+
+class AccountDeferredEntriesWizard(models.TransientModel):
+    _name = "account.deferred.entries.wizard"
+    _description = "Generate Grouped Deferral Entries"
+
+    company_id = fields.Many2one(
+        comodel_name="res.company",
+        required=True,
+        default=lambda self: self.env.company,
+    )
+    deferred_type = fields.Selection(
+        string="Deferral Type",
+        selection=[
+            ("revenue", "Deferred Revenues"),
+            ("expense", "Deferred Expenses"),
+        ],
+        required=True,
+        default="revenue",
+    )
+    date_from = fields.Date(
+        string="Start Date",
+        required=True,
+        default=lambda self: fields.Date.context_today(self).replace(day=1),
+        help="Invoices whose deferral starts in this period are deferred",
+    )
+    date_to = fields.Date(
+        string="End Date",
+        required=True,
+        default=lambda self: fields.Date.context_today(self)
+        + relativedelta(day=31),
+    )
+
+    @api.constrains("date_from", "date_to")
+    def _check_dates(self):
+        for wizard in self:
+            if wizard.date_from > wizard.date_to:
+                raise UserError(_("The start date must be before the end date."))
+
+    def action_generate(self):
+        self.ensure_one()
+        deferral_moves = (
+            self.env["account.move"]
+            .with_company(self.company_id)
+            ._generate_grouped_deferred_entries(
+                self.deferred_type, self.date_from, self.date_to
+            )
+        )
+        if not deferral_moves:
+            raise UserError(_("There is nothing to defer in this period."))
+        return {
+            "type": "ir.actions.act_window",
+            "name": _("Deferral Entries"),
+            "res_model": "account.move",
+            "domain": [("id", "in", deferral_moves.ids)],
+            "views": [(False, "list"), (False, "form")],
+        }
@@ -7,7 +7,7 @@ from dateutil.relativedelta import relativedelta
 import xlsxwriter
 from odoo import api, fields, models
 from datetime import datetime
-from odoo.tools import date_utils
+from odoo.tools import SQL, date_utils
 
 
 class DeferredReport(models.TransientModel):
@@ -91,6 +91,130 @@ class DeferredReport(models.TransientModel):
 
         return results
 
+    @api.model
+    def _get_recognized_amounts(self, move_ids, report_type):
+        """Return the amounts recognized by the deferral entries of the given
+        moves, as ``{(original move id, account id): amount}``, fetched with
+        one grouped query over the deferral moves."""
+        if not move_ids:
+            return {}
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT rel.original_move_id, line.account_id,
+                       SUM(line.debit) AS debit, SUM(line.credit) AS credit
+                  FROM account_move_deferred_rel rel
+                  JOIN account_move_line line
+                    ON line.move_id = rel.deferred_move_id
+                 WHERE rel.original_move_id IN %s
+              GROUP BY rel.original_move_id, line.account_id
+                """,
+                tuple(move_ids),
+            )
+        )
+        amount_field = "credit" if report_type == "revenue" else "debit"
+        return {
+            (row["original_move_id"], row["account_id"]): row[amount_field]
+            for row in self.env.cr.dictfetchall()
+        }
+
+    @api.model
+    def _get_deferred_report_lines(self, domain, periods, report_type):
+        """Compute the lines and per-account totals of the deferred report.
+
+        The lines matching ``domain`` are read with a single query, the
+        recognized amounts with one grouped query, and the period splits of
+        all lines in a single pass, so no ORM traversal is done per line.
+
+        :return: tuple (lines by account display name, totals by account
+                 display name)
+        """
+        query = self.env["account.move.line"]._search(domain)
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT line.id, line.account_id, line.partner_id,
+                       partner.name AS partner_name, line.product_id,
+                       template.categ_id AS product_category_id,
+                       line.balance, line.debit, line.credit, line.move_id,
+                       move.name AS move_name, line.name, line.date,
+                       line.journal_id, line.deferred_start_date,
+                       line.deferred_end_date
+                  FROM account_move_line line
+                  JOIN account_move move ON move.id = line.move_id
+             LEFT JOIN res_partner partner ON partner.id = line.partner_id
+             LEFT JOIN product_product product ON product.id = line.product_id
+             LEFT JOIN product_template template
+                    ON template.id = product.product_tmpl_id
+                 WHERE line.id IN (%s)
+              ORDER BY line.date DESC, move.name DESC, line.id
+                """,
+                query.subselect(),
+            )
+        )
+        lines = self.env.cr.dictfetchall()
+        recognized_amounts = self._get_recognized_amounts(
+            {line["move_id"] for line in lines}, report_type
+        )
+        period_amounts = self._get_deferred_amounts_by_line(
+            lines, periods, report_type
+        )
+
+        lines_by_account = {}
+        for line, amounts in zip(lines, period_amounts):
+            deferred_amount = abs(line["balance"])
+            recognized_amount = recognized_amounts.get(
+                (line["move_id"], line["account_id"]), 0.0
+            )
+            lines_by_account.setdefault(line["account_id"], []).append(
+                {
+                    "date": line["date"],
+                    "name": line["name"],
+                    "move_name": line["move_name"],
+                    "debit": line["debit"],
+                    "credit": line["credit"],
+                    "partner_id": line["partner_name"] or "",
+                    "account_id": line["account_id"],
+                    "journal_id": line["journal_id"],
+                    "move_id": line["move_id"],
+                    "deferred_start_date": line["deferred_start_date"],
+                    "deferred_end_date": line["deferred_end_date"],
+                    "deferred_amount": deferred_amount,
+                    "recognized_amount": recognized_amount,
+                    # Add period breakdowns
+                    "total": amounts.get(periods[0], 0),
+                    "not_started": amounts.get(periods[1], 0),
+                    "before": amounts.get(periods[2], 0),
+                    "current": amounts.get(periods[3], 0),
+                    "later": amounts.get(periods[4], 0),
+                    "remaining_amount": deferred_amount - recognized_amount,
+                }
+            )
+
+        account_lines = {}
+        account_totals = {}
+        currency_id = self.env.company.currency_id.symbol
+        accounts = self.env["account.account"].browse(list(lines_by_account))
+        for account in accounts:
+            move_line_list = lines_by_account[account.id]
+            account_lines[account.display_name] = move_line_list
+            totals = {
+                key: round(sum(line[field] for line in move_line_list), 2)
+                for key, field in (
+                    ("total_deferred", "deferred_amount"),
+                    ("total_recognized", "recognized_amount"),
+                    ("total_remaining", "remaining_amount"),
+                    ("total", "total"),
+                    ("not_started", "not_started"),
+                    ("before", "before"),
+                    ("current", "current"),
+                    ("later", "later"),
+                )
+            }
+            totals.update(currency_id=currency_id, account_id=account.id)
+            account_totals[account.display_name] = totals
+        return account_lines, account_totals
+
     @api.model
     def view_deferred_revenue_report(self, option, tag):
         """Retrieve deferred revenue report data based on options and tags."""
@@ -105,7 +229,6 @@ class DeferredReport(models.TransientModel):
     def _get_deferred_data(self, report_type):
         """Get deferred data for both revenue and expense reports"""
         account_dict = {}
-        account_totals = {}
 
         # Set domain based on report type
         if report_type == "revenue":
@@ -129,9 +252,6 @@ class DeferredReport(models.TransientModel):
                 ),
             ]
 
-        move_line_ids = self.env["account.move.line"].search(domain)
-        account_ids = move_line_ids.mapped("account_id")
-
         account_dict["journal_ids"] = self.env["account.journal"].search_read(
             [], ["name"]
         )
@@ -168,113 +288,10 @@ class DeferredReport(models.TransientModel):
             ),
         ]
 
-        for account in account_ids:
-            move_line_id = move_line_ids.filtered(lambda x: x.account_id == account)
-            move_line_list = []
-
-            for move_line in move_line_id:
-                # Get deferred moves for this line
-                deferred_moves = move_line.move_id.deferred_move_ids
-
-                # Calculate recognized amount based on report type
-                if report_type == "revenue":
-                    recognized_amount = sum(
-                        deferred_moves.line_ids.filtered(
-                            lambda l: l.account_id == move_line.account_id
-                        ).mapped("credit")
-                    )
-                else:  # expense
-                    recognized_amount = sum(
-                        deferred_moves.line_ids.filtered(
-                            lambda l: l.account_id == move_line.account_id
-                        ).mapped("debit")
-                    )
-
-                # Prepare line data for period calculation
-                line_data = {
-                    "account_id": move_line.account_id.id,
-                    "partner_id": (
-                        move_line.partner_id.id if move_line.partner_id else False
-                    ),
-                    "product_id": (
-                        move_line.product_id.id if move_line.product_id else False
-                    ),
-                    "product_category_id": (
-                        move_line.product_id.categ_id.id
-                        if move_line.product_id and move_line.product_id.categ_id
-                        else False
-                    ),
-                    "balance": move_line.balance,
-                    "move_id": move_line.move_id.id,
-                    "move_name": move_line.move_id.name,
-                    "name": move_line.name,
-                    "date": move_line.date,
-                    "deferred_start_date": move_line.deferred_start_date,
-                    "deferred_end_date": move_line.deferred_end_date,
-                }
-
-                # Calculate period amounts
-                period_amounts = self._get_deferred_amounts_by_line(
-                    [line_data], periods, report_type
-                )[0]
-
-                move_line_data = {
-                    "date": move_line.date,
-                    "name": move_line.name,
-                    "move_name": move_line.move_id.name,
-                    "debit": move_line.debit,
-                    "credit": move_line.credit,
-                    "partner_id": (
-                        move_line.partner_id.name if move_line.partner_id else ""
-                    ),
-                    "account_id": move_line.account_id.id,
-                    "journal_id": move_line.journal_id.id,
-                    "move_id": move_line.move_id.id,
-                    "deferred_start_date": move_line.deferred_start_date,
-                    "deferred_end_date": move_line.deferred_end_date,
-                    "deferred_amount": abs(move_line.balance),
-                    "recognized_amount": recognized_amount,
-                    # Add period breakdowns
-                    "total": period_amounts.get(periods[0], 0),
-                    "not_started": period_amounts.get(periods[1], 0),
-                    "before": period_amounts.get(periods[2], 0),
-                    "current": period_amounts.get(periods[3], 0),
-                    "later": period_amounts.get(periods[4], 0),
-                }
-                move_line_data["remaining_amount"] = (
-                    move_line_data["deferred_amount"]
-                    - move_line_data["recognized_amount"]
-                )
-                move_line_list.append(move_line_data)
-
-            if move_line_list:
-                account_dict[account.display_name] = move_line_list
-                currency_id = self.env.company.currency_id.symbol
-                account_totals[account.display_name] = {
-                    "total_deferred": round(
-                        sum([line["deferred_amount"] for line in move_line_list]), 2
-                    ),
-                    "total_recognized": round(
-                        sum([line["recognized_amount"] for line in move_line_list]), 2
-                    ),
-                    "total_remaining": round(
-                        sum([line["remaining_amount"] for line in move_line_list]), 2
-                    ),
-                    "total": round(sum([line["total"] for line in move_line_list]), 2),
-                    "not_started": round(
-                        sum([line["not_started"] for line in move_line_list]), 2
-                    ),
-                    "before": round(
-                        sum([line["before"] for line in move_line_list]), 2
-                    ),
-                    "current": round(
-                        sum([line["current"] for line in move_line_list]), 2
-                    ),
-                    "later": round(sum([line["later"] for line in move_line_list]), 2),
-                    "currency_id": currency_id,
-                    "account_id": account.id,
-                }
-
+        account_lines, account_totals = self._get_deferred_report_lines(
+            domain, periods, report_type
+        )
+        account_dict.update(account_lines)
         account_dict["account_totals"] = account_totals
         return account_dict
 
@@ -284,7 +301,6 @@ class DeferredReport(models.TransientModel):
     ):
         """Retrieve filtered values for the deferred reports."""
         account_dict = {}
-        account_totals = {}
         today = fields.Date.today()
         quarter_start, quarter_end = date_utils.get_quarter(today)
         previous_quarter_start = quarter_start - relativedelta(months=3)
@@ -391,9 +407,6 @@ class DeferredReport(models.TransientModel):
                     ).date()
                     domain += [("date", "<=", end_date)]
 
-        move_line_ids = self.env["account.move.line"].search(domain)
-        account_ids = move_line_ids.mapped("account_id")
-
         account_dict["journal_ids"] = self.env["account.journal"].search_read(
             [], ["name"]
         )
@@ -427,111 +440,10 @@ class DeferredReport(models.TransientModel):
             ),
         ]
 
-        for account in account_ids:
-            move_line_id = move_line_ids.filtered(lambda x: x.account_id == account)
-            move_line_list = []
-
-            for move_line in move_line_id:
-                deferred_moves = move_line.move_id.deferred_move_ids
-
-                if report_type == "revenue":
-                    recognized_amount = sum(
-                        deferred_moves.line_ids.filtered(
-                            lambda l: l.account_id == move_line.account_id
-                        ).mapped("credit")
-                    )
-                else:  # expense
-                    recognized_amount = sum(
-                        deferred_moves.line_ids.filtered(
-                            lambda l: l.account_id == move_line.account_id
-                        ).mapped("debit")
-                    )
-
-                # Prepare line data for period calculation
-                line_data = {
-                    "account_id": move_line.account_id.id,
-                    "partner_id": (
-                        move_line.partner_id.id if move_line.partner_id else False
-                    ),
-                    "product_id": (
-                        move_line.product_id.id if move_line.product_id else False
-                    ),
-                    "product_category_id": (
-                        move_line.product_id.categ_id.id
-                        if move_line.product_id and move_line.product_id.categ_id
-                        else False
-                    ),
-                    "balance": move_line.balance,
-                    "move_id": move_line.move_id.id,
-                    "move_name": move_line.move_id.name,
-                    "name": move_line.name,
-                    "date": move_line.date,
-                    "deferred_start_date": move_line.deferred_start_date,
-                    "deferred_end_date": move_line.deferred_end_date,
-                }
-
-                # Calculate period amounts
-                period_amounts = self._get_deferred_amounts_by_line(
-                    [line_data], periods, report_type
-                )[0]
-
-                move_line_data = {
-                    "date": move_line.date,
-                    "name": move_line.name,
-                    "move_name": move_line.move_id.name,
-                    "debit": move_line.debit,
-                    "credit": move_line.credit,
-                    "partner_id": (
-                        move_line.partner_id.name if move_line.partner_id else ""
-                    ),
-                    "account_id": move_line.account_id.id,
-                    "journal_id": move_line.journal_id.id,
-                    "move_id": move_line.move_id.id,
-                    "deferred_start_date": move_line.deferred_start_date,
-                    "deferred_end_date": move_line.deferred_end_date,
-                    "deferred_amount": abs(move_line.balance),
-                    "recognized_amount": recognized_amount,
-                    # Add period breakdowns
-                    "total": period_amounts.get(periods[0], 0),
-                    "not_started": period_amounts.get(periods[1], 0),
-                    "before": period_amounts.get(periods[2], 0),
-                    "current": period_amounts.get(periods[3], 0),
-                    "later": period_amounts.get(periods[4], 0),
-                }
-                move_line_data["remaining_amount"] = (
-                    move_line_data["deferred_amount"]
-                    - move_line_data["recognized_amount"]
-                )
-                move_line_list.append(move_line_data)
-
-            if move_line_list:
-                account_dict[account.display_name] = move_line_list
-                currency_id = self.env.company.currency_id.symbol
-                account_totals[account.display_name] = {
-                    "total_deferred": round(
-                        sum([line["deferred_amount"] for line in move_line_list]), 2
-                    ),
-                    "total_recognized": round(
-                        sum([line["recognized_amount"] for line in move_line_list]), 2
-                    ),
-                    "total_remaining": round(
-                        sum([line["remaining_amount"] for line in move_line_list]), 2
-                    ),
-                    "total": round(sum([line["total"] for line in move_line_list]), 2),
-                    "not_started": round(
-                        sum([line["not_started"] for line in move_line_list]), 2
-                    ),
-                    "before": round(
-                        sum([line["before"] for line in move_line_list]), 2
-                    ),
-                    "current": round(
-                        sum([line["current"] for line in move_line_list]), 2
-                    ),
-                    "later": round(sum([line["later"] for line in move_line_list]), 2),
-                    "currency_id": currency_id,
-                    "account_id": account.id,
-                }
-
+        account_lines, account_totals = self._get_deferred_report_lines(
+            domain, periods, report_type
+        )
+        account_dict.update(account_lines)
         account_dict["account_totals"] = account_totals
         return account_dict
 
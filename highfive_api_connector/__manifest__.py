@@ -47,7 +47,9 @@
     ],
     'data': [
         'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
         'views/highfive_api_request_log_views.xml',
+        'views/highfive_api_metric_views.xml',
         'views/menus.xml',
     ],
     'installable': True,
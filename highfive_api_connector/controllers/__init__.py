@@ -2,3 +2,4 @@
 from . import webhook
 from . import booking_webhook
 from . import commission_webhook
+from . import metrics
@@ -2,13 +2,24 @@
 from odoo import http
 from odoo.http import request
 from odoo.exceptions import ValidationError
+from werkzeug.http import http_date
+import hashlib
 import json
 import time
 import traceback
 import logging
+import uuid
 
 _logger = logging.getLogger(__name__)
 
+# Actions with side effects, deduplicated with idempotency keys
+IDEMPOTENT_ACTIONS = (
+    'create', 'update_payment', 'settle_payments', 'refund', 'cancel', 'bulk_cancel', 'bulk_refund',
+)
+
+# Actions covering many bookings (no per-booking lock)
+BULK_ACTIONS = ('settle_payments', 'bulk_cancel', 'bulk_refund')
+
 
 class HighFiveBookingWebhook(http.Controller):
     """
@@ -34,6 +45,12 @@ class HighFiveBookingWebhook(http.Controller):
         data['booking_id'] = booking_id
         return self._process_request('booking', data, 'update_payment')
 
+    @http.route('/api/odoo/payments/settlement', type='http', auth='none', methods=['POST'], csrf=False)
+    def settle_payments(self, **kwargs):
+        """Register a payment-gateway settlement (many bookings at once)"""
+        data = request.get_json_data()
+        return self._process_request('booking', data, 'settle_payments')
+
     @http.route('/api/odoo/bookings/<int:booking_id>/refund', type='http', auth='none', methods=['POST'], csrf=False)
     def refund_booking(self, booking_id, **kwargs):
         """Refund booking (credit notes & refund payments)"""
@@ -48,11 +65,37 @@ class HighFiveBookingWebhook(http.Controller):
         data['booking_id'] = booking_id
         return self._process_request('booking', data, 'cancel')
 
+    @http.route('/api/odoo/bookings/bulk/cancel', type='http', auth='none', methods=['POST'], csrf=False)
+    def bulk_cancel_bookings(self, **kwargs):
+        """Cancel many bookings at once ({"booking_ids": [...], "reason": ...})"""
+        data = request.get_json_data()
+        return self._process_request('booking', data, 'bulk_cancel')
+
+    @http.route('/api/odoo/bookings/bulk/refund', type='http', auth='none', methods=['POST'], csrf=False)
+    def bulk_refund_bookings(self, **kwargs):
+        """Refund many bookings at once ({"booking_ids": [...], "reason": ...})"""
+        data = request.get_json_data()
+        return self._process_request('booking', data, 'bulk_refund')
+
     @http.route('/api/odoo/bookings/<int:booking_id>', type='http', auth='none', methods=['GET'], csrf=False)
     def get_booking(self, booking_id, **kwargs):
         """Get booking status"""
         data = {'booking_id': booking_id}
-        return self._process_request('booking', data, 'get_status')
+        return self._process_read_request('booking', data, 'get_status')
+
+    @http.route('/api/odoo/bookings/status', type='http', auth='none', methods=['GET', 'POST'], csrf=False)
+    def get_bookings(self, **kwargs):
+        """
+        Get the status of many bookings at once
+
+        GET ?booking_ids=1,2,3 or POST {"booking_ids": [1, 2, 3]}
+        """
+        if request.httprequest.method == 'POST':
+            data = request.get_json_data()
+        else:
+            booking_ids = request.httprequest.args.get('booking_ids', '')
+            data = {'booking_ids': [ref.strip() for ref in booking_ids.split(',') if ref.strip()]}
+        return self._process_read_request('booking', data, 'bulk_status')
 
     # =========================================================================
     # MAIN PROCESSING
@@ -65,10 +108,26 @@ class HighFiveBookingWebhook(http.Controller):
         Args:
             entity_type: 'booking'
             data: Request data
-            action: 'create', 'update_payment', 'cancel', 'get_status'
+            action: 'create', 'update_payment', 'settle_payments', 'refund', 'cancel',
+                    'bulk_cancel', 'bulk_refund'
         """
         start_time = time.time()
         log = None
+        idempotency_key = booking_ref = None
+
+        # ================================================================
+        # 0. Idempotency: serialise per booking, replay stored responses
+        #    (authenticated callers only: an invalid key never takes the
+        #    booking lock, it falls to the normal flow which rejects it)
+        # ================================================================
+        if action in IDEMPOTENT_ACTIONS and self._has_valid_api_key():
+            booking_ref = self._get_booking_ref(data, action)
+            idempotency_key = self._get_idempotency_key(request, data, action, booking_ref)
+            if booking_ref:
+                request.env['highfive.api.idempotency.key'].sudo()._lock_booking(booking_ref)
+            replay = self._replay(idempotency_key)
+            if replay:
+                return replay
 
         try:
             # ================================================================
@@ -94,6 +153,8 @@ class HighFiveBookingWebhook(http.Controller):
                 result = service.process(data)
             elif action == 'update_payment':
                 result = service.update_payment(data['booking_id'], data)
+            elif action == 'settle_payments':
+                result = service.settle_payments(data)
             elif action == 'refund':
                 result = service.refund_booking(
                     data['booking_id'],
@@ -104,8 +165,16 @@ class HighFiveBookingWebhook(http.Controller):
                     data['booking_id'],
                     data.get('reason', '')
                 )
-            elif action == 'get_status':
-                result = service.get_booking_status(data['booking_id'])
+            elif action == 'bulk_cancel':
+                result = service.cancel_bookings(
+                    data.get('booking_ids'),
+                    data.get('reason', '')
+                )
+            elif action == 'bulk_refund':
+                result = service.refund_bookings(
+                    data.get('booking_ids'),
+                    data.get('reason', '')
+                )
             else:
                 raise ValidationError(f"Unknown action: {action}")
 
@@ -142,6 +211,12 @@ class HighFiveBookingWebhook(http.Controller):
             # Use 201 for create, 200 for everything else
             status_code = 201 if action == 'create' and result.get('action') == 'created' else 200
 
+            if idempotency_key:
+                request.env['highfive.api.idempotency.key'].sudo()._store(
+                    idempotency_key, action, booking_ref, status_code,
+                    json.dumps(response_data, ensure_ascii=False, default=str),
+                )
+
             return request.make_json_response(response_data, status=status_code)
 
         except ValidationError as e:
@@ -212,10 +287,209 @@ class HighFiveBookingWebhook(http.Controller):
                 status=500  # Internal Server Error
             )
 
+    def _process_read_request(self, entity_type, data, action):
+        """
+        Processing flow for read-only booking requests
+
+        Same responses as _process_request(), except that:
+        - no log row is written for a successful read (no write
+          transaction per read), failed reads are logged as usual
+        - responses carry an ETag and Last-Modified (write_date of the
+          bookings and invoices), If-None-Match / If-Modified-Since are
+          answered with 304 Not Modified
+
+        Args:
+            entity_type: 'booking'
+            data: Request data
+            action: 'get_status', 'bulk_status'
+        """
+        start_time = time.time()
+        request_id = f"REQ-{uuid.uuid4().hex[:12].upper()}"
+
+        try:
+            self._validate_api_key(request)
+
+            from ..services.booking_service import BookingService
+            service = BookingService(request.env)
+
+            if action == 'get_status':
+                lookup = service.get_booking_statuses([data['booking_id']])
+                if not lookup['bookings']:
+                    raise ValidationError(f"Booking {data['booking_id']} not found")
+                result = lookup['bookings'][0]
+            elif action == 'bulk_status':
+                lookup = service.get_booking_statuses(data.get('booking_ids'))
+                result = {
+                    'bookings': lookup['bookings'],
+                    'not_found': lookup['not_found'],
+                }
+            else:
+                raise ValidationError(f"Unknown action: {action}")
+
+            headers = self._get_cache_headers(lookup)
+            if self._is_not_modified(request, lookup):
+                return request.make_response(None, headers=headers, status=304)
+
+            processing_time = (time.time() - start_time) * 1000
+
+            _logger.debug(f"[{request_id}] {action} booking in {processing_time:.2f}ms")
+
+            return request.make_json_response(
+                {
+                    'success': True,
+                    'request_id': request_id,
+                    'data': result,
+                    'processing_time_ms': processing_time,
+                },
+                headers=headers,
+                status=200
+            )
+
+        except ValidationError as e:
+            processing_time = (time.time() - start_time) * 1000
+            request.env.cr.rollback()
+            self._log_failed_read(entity_type, data, action, request_id, {
+                'error_message': str(e),
+                'processing_time': processing_time,
+            })
+
+            _logger.warning(f"[{request_id}] Validation error: {str(e)}")
+
+            return request.make_json_response(
+                {
+                    'success': False,
+                    'request_id': request_id,
+                    'error': str(e),
+                    'error_type': 'validation_error',
+                    'processing_time_ms': processing_time,
+                },
+                status=400  # Bad Request
+            )
+
+        except Exception as e:
+            processing_time = (time.time() - start_time) * 1000
+            error_traceback = traceback.format_exc()
+            request.env.cr.rollback()
+            self._log_failed_read(entity_type, data, action, request_id, {
+                'error_message': str(e),
+                'error_details': error_traceback,
+                'processing_time': processing_time,
+            })
+
+            _logger.error(
+                f"[{request_id}] Internal server error: {str(e)}\n"
+                f"{error_traceback}"
+            )
+
+            return request.make_json_response(
+                {
+                    'success': False,
+                    'request_id': request_id,
+                    'error': 'Internal server error',
+                    'error_type': 'server_error',
+                    'message': str(e),
+                    'processing_time_ms': processing_time,
+                },
+                status=500  # Internal Server Error
+            )
+
     # =========================================================================
     # HELPER METHODS
     # =========================================================================
 
+    def _get_cache_headers(self, lookup):
+        """ETag / Last-Modified headers of a read response"""
+        headers = [
+            ('ETag', f'"{lookup["etag"]}"'),
+            ('Cache-Control', 'private, no-cache'),
+        ]
+        if lookup['last_modified']:
+            headers.append(('Last-Modified', http_date(lookup['last_modified'])))
+        return headers
+
+    def _is_not_modified(self, http_request, lookup):
+        """
+        Whether the client copy is still current
+
+        If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+        Last-Modified has a one second resolution, so If-Modified-Since is
+        only trusted when every requested record was found.
+        """
+        if_none_match = http_request.httprequest.if_none_match
+        if if_none_match:
+            return if_none_match.contains(lookup['etag'])
+
+        if_modified_since = http_request.httprequest.if_modified_since
+        if if_modified_since and lookup['last_modified'] and not lookup.get('not_found'):
+            return (
+                lookup['last_modified'].replace(microsecond=0)
+                <= if_modified_since.replace(tzinfo=None)
+            )
+        return False
+
+    def _log_failed_read(self, entity_type, data, action, request_id, vals):
+        """Log a failed read (successful reads are not logged)"""
+        try:
+            log = self._create_log(entity_type, data, request, action)
+            log.sudo().write({
+                'request_id': request_id,
+                'state': 'failed',
+                'action': action,
+                'entity_id': data.get('booking_id'),
+                **vals,
+            })
+            request.env.cr.commit()
+        except Exception as e:
+            request.env.cr.rollback()
+            _logger.error(f"[{request_id}] Could not log failed read: {str(e)}")
+
+    def _get_booking_ref(self, data, action):
+        """HighFive booking ID targeted by the request, if any"""
+        if action in BULK_ACTIONS:
+            return None
+        booking_ref = data.get('booking_id') if action != 'create' else data.get('id')
+        return str(booking_ref) if booking_ref else None
+
+    def _get_idempotency_key(self, http_request, data, action, booking_ref):
+        """
+        Idempotency-Key header, or a hash of the action, booking and payload
+        """
+        header_key = http_request.httprequest.headers.get('Idempotency-Key')
+        if header_key:
+            return f"{action}:{header_key.strip()}"
+        payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+        digest = hashlib.sha256(f"{action}:{booking_ref}:{payload}".encode('utf-8')).hexdigest()
+        return f"{action}:{digest}"
+
+    def _replay(self, idempotency_key):
+        """
+        Stored response of an already processed request, or None
+
+        Only called once the API key is validated.
+        """
+        replay = request.env['highfive.api.idempotency.key'].sudo()._get_replay(idempotency_key)
+        if not replay:
+            return None
+
+        status_code, response_body = replay
+        _logger.info(f"Replayed idempotent request {idempotency_key}")
+        return request.make_response(
+            response_body,
+            headers=[
+                ('Content-Type', 'application/json; charset=utf-8'),
+                ('Idempotent-Replayed', 'true'),
+            ],
+            status=status_code,
+        )
+
+    def _has_valid_api_key(self):
+        """Whether the request carries a valid API key (nothing is logged)"""
+        try:
+            self._validate_api_key(request)
+        except ValidationError:
+            return False
+        return True
+
     def _create_log(self, entity_type, data, http_request, action):
         """Create request log"""
         vals = {
@@ -2,10 +2,12 @@
 from odoo import http
 from odoo.http import request
 from odoo.exceptions import ValidationError
+from werkzeug.http import http_date
 import json
 import time
 import traceback
 import logging
+import uuid
 
 _logger = logging.getLogger(__name__)
 
@@ -46,8 +48,7 @@ class HighFiveCommissionWebhook(http.Controller):
             })
 
         data = {'unit_id': unit_id}
-        result = self._process_request('commission', data, 'get_all')
-        return request.make_json_response(result)
+        return self._process_read_request('commission', data, 'get_all')
 
     @http.route('/api/odoo/commissions/active', type='http', auth='none', methods=['GET'], csrf=False)
     def get_active_commission(self, **kwargs):
@@ -64,8 +65,25 @@ class HighFiveCommissionWebhook(http.Controller):
             })
 
         data = {'unit_id': unit_id, 'date': date}
-        result = self._process_request('commission', data, 'get_active')
-        return request.make_json_response(result)
+        return self._process_read_request('commission', data, 'get_active')
+
+    @http.route('/api/odoo/commissions/active/bulk', type='http', auth='none', methods=['GET', 'POST'], csrf=False)
+    def get_active_commissions(self, **kwargs):
+        """
+        Get active commissions for many (unit, date) pairs at once
+
+        GET ?items=5:2026-03-01,6:2026-03-02
+        or POST {"items": [{"unit_id": 5, "date": "2026-03-01"}, ...]}
+        """
+        if request.httprequest.method == 'POST':
+            data = request.get_json_data()
+        else:
+            items = request.httprequest.args.get('items', '')
+            data = {'items': [
+                dict(zip(('unit_id', 'date'), pair.strip().split(':', 1)))
+                for pair in items.split(',') if pair.strip()
+            ]}
+        return self._process_read_request('commission', data, 'get_active_bulk')
 
     # =========================================================================
     # MAIN PROCESSING
@@ -78,7 +96,7 @@ class HighFiveCommissionWebhook(http.Controller):
         Args:
             entity_type: 'commission'
             data: Request data
-            action: 'create', 'delete', 'get_all', 'get_active'
+            action: 'create', 'delete'
         """
         start_time = time.time()
         log = None
@@ -107,10 +125,6 @@ class HighFiveCommissionWebhook(http.Controller):
                 result = service.process(data)
             elif action == 'delete':
                 result = service.delete(data['id'])
-            elif action == 'get_all':
-                result = service.get_all(data['unit_id'])
-            elif action == 'get_active':
-                result = service.get_active(data['unit_id'], data['date'])
             else:
                 raise ValidationError(f"Unknown action: {action}")
 
@@ -205,10 +219,146 @@ class HighFiveCommissionWebhook(http.Controller):
                 'processing_time_ms': processing_time,
             }
 
+    def _process_read_request(self, entity_type, data, action):
+        """
+        Processing flow for read-only commission requests
+
+        Same response body as _process_request(), except that:
+        - no log row is written for a successful read (no write
+          transaction per read), failed reads are logged as usual
+        - bulk responses carry an ETag and Last-Modified (write_date of
+          the units and commissions), If-None-Match / If-Modified-Since
+          are answered with 304 Not Modified
+
+        Args:
+            entity_type: 'commission'
+            data: Request data
+            action: 'get_all', 'get_active', 'get_active_bulk'
+        """
+        start_time = time.time()
+        request_id = f"REQ-{uuid.uuid4().hex[:12].upper()}"
+        headers = []
+
+        try:
+            self._validate_api_key(request)
+
+            from ..services.commission_service import CommissionService
+            service = CommissionService(request.env)
+
+            if action == 'get_all':
+                result = service.get_all(data['unit_id'])
+            elif action == 'get_active':
+                result = service.get_active(data['unit_id'], data['date'])
+            elif action == 'get_active_bulk':
+                lookup = service.get_active_bulk(data.get('items'))
+                result = {'results': lookup['results']}
+                lookup['not_found'] = [item for item in lookup['results'] if item.get('error')]
+                headers = self._get_cache_headers(lookup)
+                if self._is_not_modified(request, lookup):
+                    return request.make_response(None, headers=headers, status=304)
+            else:
+                raise ValidationError(f"Unknown action: {action}")
+
+            processing_time = (time.time() - start_time) * 1000
+
+            _logger.debug(f"[{request_id}] {action} commission in {processing_time:.2f}ms")
+
+            return request.make_json_response({
+                'success': True,
+                'request_id': request_id,
+                'data': result,
+                'processing_time_ms': processing_time,
+            }, headers=headers)
+
+        except ValidationError as e:
+            processing_time = (time.time() - start_time) * 1000
+            request.env.cr.rollback()
+            self._log_failed_read(entity_type, data, action, request_id, {
+                'error_message': str(e),
+                'processing_time': processing_time,
+            })
+
+            _logger.warning(f"[{request_id}] Validation error: {str(e)}")
+
+            return request.make_json_response({
+                'success': False,
+                'request_id': request_id,
+                'error': str(e),
+                'error_type': 'validation_error',
+                'processing_time_ms': processing_time,
+            })
+
+        except Exception as e:
+            processing_time = (time.time() - start_time) * 1000
+            error_traceback = traceback.format_exc()
+            request.env.cr.rollback()
+            self._log_failed_read(entity_type, data, action, request_id, {
+                'error_message': str(e),
+                'error_details': error_traceback,
+                'processing_time': processing_time,
+            })
+
+            _logger.error(
+                f"[{request_id}] Unexpected error: {str(e)}\n"
+                f"{error_traceback}"
+            )
+
+            return request.make_json_response({
+                'success': False,
+                'request_id': request_id,
+                'error': 'Internal server error',
+                'error_type': 'server_error',
+                'processing_time_ms': processing_time,
+            })
+
     # =========================================================================
     # HELPER METHODS
     # =========================================================================
 
+    def _get_cache_headers(self, lookup):
+        """ETag / Last-Modified headers of a read response"""
+        headers = [
+            ('ETag', f'"{lookup["etag"]}"'),
+            ('Cache-Control', 'private, no-cache'),
+        ]
+        if lookup['last_modified']:
+            headers.append(('Last-Modified', http_date(lookup['last_modified'])))
+        return headers
+
+    def _is_not_modified(self, http_request, lookup):
+        """
+        Whether the client copy is still current
+
+        If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+        If-Modified-Since is only trusted when every pair was resolved.
+        """
+        if_none_match = http_request.httprequest.if_none_match
+        if if_none_match:
+            return if_none_match.contains(lookup['etag'])
+
+        if_modified_since = http_request.httprequest.if_modified_since
+        if if_modified_since and lookup['last_modified'] and not lookup.get('not_found'):
+            return (
+                lookup['last_modified'].replace(microsecond=0)
+                <= if_modified_since.replace(tzinfo=None)
+            )
+        return False
+
+    def _log_failed_read(self, entity_type, data, action, request_id, vals):
+        """Log a failed read (successful reads are not logged)"""
+        try:
+            log = self._create_log(entity_type, data, request, action)
+            log.sudo().write({
+                'request_id': request_id,
+                'state': 'failed',
+                'action': action,
+                **vals,
+            })
+            request.env.cr.commit()
+        except Exception as e:
+            request.env.cr.rollback()
+            _logger.error(f"[{request_id}] Could not log failed read: {str(e)}")
+
     def _create_log(self, entity_type, data, http_request, action):
         """Create request log"""
         vals = {
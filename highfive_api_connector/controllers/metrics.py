@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+from odoo import http
+from odoo.http import request
+from odoo.exceptions import ValidationError
+import logging
+
+from ..models.highfive_api_metric import LATENCY_BUCKETS
+
+_logger = logging.getLogger(__name__)
+
+
+class HighFiveMetricsController(http.Controller):
+    """
+    Metrics Controller
+
+    Exposes the aggregated webhook metrics in the Prometheus text format
+    """
+
+    @http.route('/api/odoo/metrics', type='http', auth='none', methods=['GET'], csrf=False)
+    def get_metrics(self, **kwargs):
+        """Prometheus scrape endpoint"""
+        try:
+            self._validate_api_key(request)
+        except ValidationError as e:
+            return request.make_response(str(e), status=401)
+
+        totals = request.env['highfive.api.metric'].sudo()._get_totals()
+        return request.make_response(
+            self._render_prometheus(totals),
+            headers=[('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')],
+        )
+
+    # =========================================================================
+    # Helper Methods
+    # =========================================================================
+    def _render_prometheus(self, totals):
+        """Render the metric totals in the Prometheus text exposition format"""
+        requests, errors, histogram = [], [], []
+        for total in totals:
+            labels = self._format_labels(total)
+            requests.append(f"highfive_api_requests_total{{{labels}}} {total['request_count']}")
+            errors.append(f"highfive_api_errors_total{{{labels}}} {total['error_count']}")
+            bounds = [str(bound) for bound in LATENCY_BUCKETS] + ['+Inf']
+            for bound, count in zip(bounds, total['buckets']):
+                histogram.append(
+                    f"highfive_api_request_duration_ms_bucket{{{labels},le=\"{bound}\"}} {count}"
+                )
+            histogram.append(f"highfive_api_request_duration_ms_sum{{{labels}}} {total['latency_sum']}")
+            histogram.append(f"highfive_api_request_duration_ms_count{{{labels}}} {total['request_count']}")
+
+        lines = [
+            '# HELP highfive_api_requests_total Webhook requests processed.',
+            '# TYPE highfive_api_requests_total counter',
+            *requests,
+            '# HELP highfive_api_errors_total Webhook requests that failed.',
+            '# TYPE highfive_api_errors_total counter',
+            *errors,
+            '# HELP highfive_api_request_duration_ms Webhook processing time in milliseconds.',
+            '# TYPE highfive_api_request_duration_ms histogram',
+            *histogram,
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def _format_labels(self, total):
+        """Label set of one metric series"""
+        def escape(value):
+            return str(value or '').replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        return ','.join(
+            f'{name}="{escape(total[name])}"'
+            for name in ('endpoint', 'entity_type', 'action', 'state')
+        )
+
+    def _validate_api_key(self, http_request):
+        """Validate API Key using Odoo's API key system"""
+        # Get Authorization header
+        api_key = http_request.httprequest.headers.get('Authorization')
+
+        if not api_key:
+            raise ValidationError("API Key not found or invalid")
+
+        # Remove 'Bearer ' prefix if exists
+        if api_key.startswith('Bearer '):
+            api_key = api_key.replace('Bearer ', '').strip()
+
+        # Check credentials using Odoo's API key system
+        try:
+            user_id = http_request.env['res.users.apikeys'].sudo()._check_credentials(
+                scope='rpc',
+                key=api_key
+            )
+        except Exception as e:
+            _logger.warning(f"API key validation error: {str(e)}")
+            user_id = None
+
+        if not user_id:
+            _logger.warning(
+                f"Invalid API key attempt from {http_request.httprequest.remote_addr}"
+            )
+            raise ValidationError("API Key not found or invalid")
+
+        # Update environment with authenticated user
+        http_request.update_env(user=user_id)
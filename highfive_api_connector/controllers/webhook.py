@@ -23,8 +23,8 @@ class HighFiveWebhookController(http.Controller):
 
     @http.route('/api/odoo/partners', type='json', auth='none', methods=['POST'], csrf=False)
     def create_partner(self, **kwargs):
-        """Receive partner webhook"""
-        data = request.get_json_data()
+        """Receive partner webhook (a partner, or {"items": [...]} for a list)"""
+        data = self._get_batch_data(request.get_json_data())
         return self._process_request('partner', data)
 
     @http.route('/api/odoo/customers', type='json', auth='none', methods=['POST'], csrf=False)
@@ -35,8 +35,8 @@ class HighFiveWebhookController(http.Controller):
 
     @http.route('/api/odoo/branches', type='json', auth='none', methods=['POST'], csrf=False)
     def create_branch(self, **kwargs):
-        """Receive branch webhook"""
-        data = request.get_json_data()
+        """Receive branch webhook (a branch, or {"items": [...]} for a list)"""
+        data = self._get_batch_data(request.get_json_data())
         return self._process_request('branch', data)
 
     @http.route('/api/odoo/units', type='json', auth='none', methods=['POST'], csrf=False)
@@ -51,6 +51,20 @@ class HighFiveWebhookController(http.Controller):
         data = request.get_json_data()
         return self._process_request('service', data)
 
+    def _get_batch_data(self, data):
+        """
+        Unwrap the list of a bulk body
+
+        JSON-RPC routes only accept an object as body, so lists are sent
+        as {"items": [...]}.
+
+        Returns:
+            The list of items for a bulk body, the body itself otherwise
+        """
+        if isinstance(data, dict) and set(data) == {'items'}:
+            return data['items'] if isinstance(data['items'], list) else []
+        return data
+
     # =========================================================================
     # Main Processing
     # =========================================================================
@@ -94,7 +108,7 @@ class HighFiveWebhookController(http.Controller):
                 'state': 'success',
                 'response_body': json.dumps(result, ensure_ascii=False),
                 'processing_time': processing_time,
-                'entity_id': data.get('id'),
+                'entity_id': data.get('id') if isinstance(data, dict) else None,
                 'odoo_record_id': (
                     result.get(f"{entity_type}_id") or
                     result.get('branch_id') or
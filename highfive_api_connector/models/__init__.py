@@ -1,2 +1,4 @@
 # -*- coding: utf-8 -*-
 from . import highfive_api_request_log
+from . import highfive_api_metric
+from . import highfive_api_idempotency_key
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+from datetime import timedelta
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Hours during which a replayed request returns the stored response
+DEFAULT_IDEMPOTENCY_WINDOW_HOURS = 24
+
+
+class HighFiveAPIIdempotencyKey(models.Model):
+    _name = 'highfive.api.idempotency.key'
+    _description = 'HighFive API Idempotency Key'
+    _order = 'create_date desc'
+    _rec_name = 'key'
+
+    key = fields.Char('Idempotency Key', required=True, readonly=True)
+    action = fields.Char('Action', readonly=True)
+    booking_ref = fields.Char('HighFive Booking ID', index=True, readonly=True)
+    status_code = fields.Integer('HTTP Status', readonly=True)
+    response_body = fields.Text('Response Body', readonly=True)
+    create_date = fields.Datetime('Created At', readonly=True, index=True)
+
+    _sql_constraints = [
+        ('unique_key', 'unique(key)', 'Idempotency keys must be unique!'),
+    ]
+
+    @api.model
+    def _get_window(self):
+        """Replay window of the stored responses"""
+        hours = int(self.env['ir.config_parameter'].sudo().get_param(
+            'highfive_api_connector.idempotency_window_hours',
+            DEFAULT_IDEMPOTENCY_WINDOW_HOURS,
+        ))
+        return timedelta(hours=hours)
+
+    @api.model
+    def _get_replay(self, key):
+        """
+        Stored response of a key still inside the replay window
+
+        Plain SQL on purpose: a replay must not load or compute anything.
+
+        Returns:
+            tuple: (status_code, response_body) or None
+        """
+        self.env.cr.execute("""
+            SELECT status_code, response_body
+              FROM highfive_api_idempotency_key
+             WHERE key = %s
+               AND create_date >= %s
+        """, (key, fields.Datetime.now() - self._get_window()))
+        return self.env.cr.fetchone()
+
+    @api.model
+    def _store(self, key, action, booking_ref, status_code, response_body):
+        """
+        Record the response of a processed request, in the same transaction
+        as its effects. An expired row with the same key is replaced.
+        """
+        self.env.cr.execute("""
+            INSERT INTO highfive_api_idempotency_key
+                   (key, action, booking_ref, status_code, response_body,
+                    create_uid, create_date, write_uid, write_date)
+            VALUES (%s, %s, %s, %s, %s, %s, NOW() AT TIME ZONE 'UTC', %s, NOW() AT TIME ZONE 'UTC')
+            ON CONFLICT (key) DO UPDATE
+               SET action = EXCLUDED.action,
+                   booking_ref = EXCLUDED.booking_ref,
+                   status_code = EXCLUDED.status_code,
+                   response_body = EXCLUDED.response_body,
+                   create_date = EXCLUDED.create_date,
+                   write_date = EXCLUDED.write_date
+        """, (key, action, booking_ref, status_code, response_body, self.env.uid, self.env.uid))
+
+    @api.model
+    def _lock_booking(self, booking_ref):
+        """
+        Serialise the requests on the same booking with a transaction-level
+        advisory lock
+
+        When another request holds the lock, wait for it to finish and
+        restart the transaction: the snapshot of the current one predates
+        the other request, so it would not see the booking it created.
+        Must be called before anything else is done in the transaction.
+        """
+        lock_key = f'highfive_booking:{booking_ref}'
+        while True:
+            self.env.cr.execute("SELECT pg_try_advisory_xact_lock(hashtext(%s))", (lock_key,))
+            if self.env.cr.fetchone()[0]:
+                return
+            _logger.info(f"Waiting for concurrent request on booking {booking_ref}")
+            self.env.cr.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (lock_key,))
+            self.env.cr.rollback()
+
+    @api.autovacuum
+    def _gc_expired_keys(self):
+        """Drop the keys older than the replay window"""
+        self.env.cr.execute("""
+            DELETE FROM highfive_api_idempotency_key
+             WHERE create_date < %s
+        """, (fields.Datetime.now() - self._get_window(),))
+        _logger.info(f"Idempotency keys: {self.env.cr.rowcount} expired keys removed")
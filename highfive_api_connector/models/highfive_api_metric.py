@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+from datetime import timedelta
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets, the last bucket
+# (bucket_inf) counting everything above
+LATENCY_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+BUCKET_FIELDS = [f'bucket_{bound}' for bound in LATENCY_BUCKETS] + ['bucket_inf']
+
+# Days to keep the per-minute rows (the hourly rows are kept)
+MINUTE_METRICS_RETENTION_DAYS = 2
+
+
+class HighFiveAPIMetric(models.Model):
+    _name = 'highfive.api.metric'
+    _description = 'HighFive API Metric'
+    _order = 'bucket_start desc, endpoint, action'
+
+    # =========================================================================
+    # FIELDS
+    # =========================================================================
+
+    granularity = fields.Selection([
+        ('minute', 'Minute'),
+        ('hour', 'Hour'),
+    ], string='Granularity', required=True, index=True)
+
+    bucket_start = fields.Datetime('Period Start', required=True, index=True)
+
+    # Dimensions ('' rather than NULL so they take part in the unique key)
+    endpoint = fields.Char('Endpoint', required=True, default='')
+    entity_type = fields.Char('Entity Type', required=True, default='')
+    action = fields.Char('Action', required=True, default='')
+    state = fields.Char('State', required=True, default='')
+
+    # Counters
+    request_count = fields.Integer('Requests', aggregator='sum')
+    error_count = fields.Integer('Errors', aggregator='sum')
+    latency_sum = fields.Float('Total Latency (ms)', aggregator='sum')
+    latency_max = fields.Float('Max Latency (ms)', aggregator='max')
+    # Grouped values are weighted by the requests, see read_group()
+    latency_avg = fields.Float('Avg Latency (ms)', aggregator='avg')
+
+    # Latency histogram (requests per bucket, not cumulative)
+    bucket_50 = fields.Integer('≤ 50 ms', aggregator='sum')
+    bucket_100 = fields.Integer('≤ 100 ms', aggregator='sum')
+    bucket_250 = fields.Integer('≤ 250 ms', aggregator='sum')
+    bucket_500 = fields.Integer('≤ 500 ms', aggregator='sum')
+    bucket_1000 = fields.Integer('≤ 1 s', aggregator='sum')
+    bucket_2500 = fields.Integer('≤ 2.5 s', aggregator='sum')
+    bucket_5000 = fields.Integer('≤ 5 s', aggregator='sum')
+    bucket_10000 = fields.Integer('≤ 10 s', aggregator='sum')
+    bucket_inf = fields.Integer('> 10 s', aggregator='sum')
+
+    # Estimates from the histogram
+    error_rate = fields.Float('Error Rate (%)', compute='_compute_estimates')
+    latency_p50 = fields.Float('p50 (ms)', compute='_compute_estimates')
+    latency_p95 = fields.Float('p95 (ms)', compute='_compute_estimates')
+    latency_p99 = fields.Float('p99 (ms)', compute='_compute_estimates')
+
+    _sql_constraints = [
+        ('unique_bucket',
+         'unique(granularity, bucket_start, endpoint, entity_type, action, state)',
+         'Only one metric row per period and dimensions!'),
+    ]
+
+    # =========================================================================
+    # COMPUTE METHODS
+    # =========================================================================
+
+    @api.depends('request_count', 'error_count', *BUCKET_FIELDS)
+    def _compute_estimates(self):
+        for metric in self:
+            counts = [metric[fname] for fname in BUCKET_FIELDS]
+            metric.error_rate = (
+                100.0 * metric.error_count / metric.request_count
+                if metric.request_count else 0.0
+            )
+            metric.latency_p50 = self._estimate_percentile(counts, 0.50, metric.latency_max)
+            metric.latency_p95 = self._estimate_percentile(counts, 0.95, metric.latency_max)
+            metric.latency_p99 = self._estimate_percentile(counts, 0.99, metric.latency_max)
+
+    @api.model
+    def _estimate_percentile(self, counts, quantile, latency_max):
+        """
+        Estimate a percentile from the histogram, interpolating linearly
+        inside the bucket holding it
+
+        Args:
+            counts: Requests per bucket, in the order of BUCKET_FIELDS
+            quantile: Percentile to estimate (0.95 for p95)
+            latency_max: Upper bound of the last bucket
+
+        Returns:
+            float: Estimated latency (ms)
+        """
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank = quantile * total
+        bounds = list(LATENCY_BUCKETS) + [max(latency_max, LATENCY_BUCKETS[-1])]
+        lower = seen = 0
+        for bound, count in zip(bounds, counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return float(bounds[-1])
+
+    @api.model
+    def read_group(self, domain, fields, groupby, offset=0, limit=None, orderby=False, lazy=True):
+        """Average latency of the groups as latency_sum / request_count
+        rather than an unweighted average of the row averages"""
+        names = [spec.split(':')[0].split('(')[0] for spec in fields]
+        if 'latency_avg' not in names:
+            return super().read_group(domain, fields, groupby, offset=offset, limit=limit,
+                                      orderby=orderby, lazy=lazy)
+        extra = [fname for fname in ('latency_sum', 'request_count') if fname not in names]
+        result = super().read_group(domain, list(fields) + extra, groupby, offset=offset,
+                                    limit=limit, orderby=orderby, lazy=lazy)
+        for group in result:
+            count = group.get('request_count')
+            group['latency_avg'] = group.get('latency_sum', 0.0) / count if count else 0.0
+            for fname in extra:
+                group.pop(fname, None)
+        return result
+
+    # =========================================================================
+    # RECORDING
+    # =========================================================================
+
+    @api.model
+    def _record(self, samples):
+        """
+        Add finished requests to the minute and hour rows with one upsert
+
+        Args:
+            samples: List of (create_date, endpoint, entity_type, action,
+                     state, processing_time) tuples
+        """
+        rows = []
+        for date, endpoint, entity_type, action, state, latency in samples:
+            latency = latency or 0.0
+            buckets = [0] * len(BUCKET_FIELDS)
+            buckets[next(
+                (index for index, bound in enumerate(LATENCY_BUCKETS) if latency <= bound),
+                len(LATENCY_BUCKETS),
+            )] = 1
+            for granularity, start in (
+                ('minute', date.replace(second=0, microsecond=0)),
+                ('hour', date.replace(minute=0, second=0, microsecond=0)),
+            ):
+                rows.append((
+                    granularity, start, endpoint or '', entity_type or '', action or '',
+                    state or '', 1, int(state == 'failed'), latency, latency, latency,
+                    *buckets,
+                ))
+        if not rows:
+            return
+
+        columns = [
+            'granularity', 'bucket_start', 'endpoint', 'entity_type', 'action', 'state',
+            'request_count', 'error_count', 'latency_sum', 'latency_max', 'latency_avg',
+            *BUCKET_FIELDS,
+        ]
+        counters = ['request_count', 'error_count', 'latency_sum', *BUCKET_FIELDS]
+        self.env.cr.execute(f"""
+            INSERT INTO highfive_api_metric AS m
+                   ({', '.join(columns)}, create_uid, create_date, write_uid, write_date)
+            SELECT v.*, %s, NOW() AT TIME ZONE 'UTC', %s, NOW() AT TIME ZONE 'UTC'
+              FROM (VALUES {', '.join(['%s'] * len(rows))}) AS v({', '.join(columns)})
+            ON CONFLICT (granularity, bucket_start, endpoint, entity_type, action, state)
+            DO UPDATE SET
+                {', '.join(f'{col} = m.{col} + EXCLUDED.{col}' for col in counters)},
+                latency_max = GREATEST(m.latency_max, EXCLUDED.latency_max),
+                latency_avg = (m.latency_sum + EXCLUDED.latency_sum)
+                              / (m.request_count + EXCLUDED.request_count),
+                write_date = EXCLUDED.write_date
+        """, [self.env.uid, self.env.uid, *rows])
+        self.invalidate_model()
+
+    # =========================================================================
+    # EXPORT
+    # =========================================================================
+
+    @api.model
+    def _get_totals(self):
+        """
+        Totals per (endpoint, entity_type, action, state) over the hourly rows
+
+        Returns:
+            list: Dicts with the dimensions, counters and cumulative buckets
+        """
+        self.flush_model()
+        self.env.cr.execute(f"""
+            SELECT endpoint, entity_type, action, state,
+                   SUM(request_count), SUM(error_count), SUM(latency_sum),
+                   {', '.join(f'SUM({fname})' for fname in BUCKET_FIELDS)}
+              FROM highfive_api_metric
+             WHERE granularity = 'hour'
+          GROUP BY endpoint, entity_type, action, state
+          ORDER BY endpoint, entity_type, action, state
+        """)
+        totals = []
+        for endpoint, entity_type, action, state, count, errors, latency_sum, *buckets in self.env.cr.fetchall():
+            cumulative, running = [], 0
+            for bucket in buckets:
+                running += bucket
+                cumulative.append(running)
+            totals.append({
+                'endpoint': endpoint,
+                'entity_type': entity_type,
+                'action': action,
+                'state': state,
+                'request_count': count,
+                'error_count': errors,
+                'latency_sum': latency_sum,
+                'buckets': cumulative,
+            })
+        return totals
+
+    # =========================================================================
+    # CLEANUP
+    # =========================================================================
+
+    @api.autovacuum
+    def _gc_minute_metrics(self):
+        """Drop the per-minute rows once they are older than the retention"""
+        limit = fields.Datetime.now() - timedelta(days=MINUTE_METRICS_RETENTION_DAYS)
+        self.env.cr.execute("""
+            DELETE FROM highfive_api_metric
+             WHERE granularity = 'minute'
+               AND bucket_start < %s
+        """, (limit,))
+        _logger.info(f"API metrics: {self.env.cr.rowcount} minute rows removed")
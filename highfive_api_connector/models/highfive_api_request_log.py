@@ -1,10 +1,44 @@
 # -*- coding: utf-8 -*-
 from odoo import api, fields, models
+from odoo.tools.sql import create_index, index_exists
+from datetime import timedelta
+from psycopg2.errors import SerializationFailure
+import base64
 import uuid
 import logging
+import zlib
 
 _logger = logging.getLogger(__name__)
 
+# System parameters of the retention subsystem (ir.config_parameter)
+PARAM_PREFIX = 'highfive_api_connector.'
+
+# Days to keep the logs of each state (0 = keep forever)
+DEFAULT_RETENTION_DAYS = {
+    'success': 30,
+    'failed': 180,
+    'pending': 180,
+}
+
+# Days after which the payloads are moved to the compressed columns
+DEFAULT_ARCHIVE_DAYS = 7
+
+# Payload storage: 'full', 'truncate' or 'compress' above the size threshold
+DEFAULT_PAYLOAD_MODE = 'full'
+DEFAULT_PAYLOAD_MAX_SIZE = 65536
+
+# Rows handled per chunk by the retention cron, and chunks per cron run
+RETENTION_CHUNK_SIZE = 5000
+RETENTION_MAX_CHUNKS = 20
+
+# Attempts of the metrics upsert on concurrent update conflicts
+METRICS_MAX_ATTEMPTS = 3
+
+PAYLOAD_FIELDS = {
+    'request_body': 'request_body_zip',
+    'response_body': 'response_body_zip',
+}
+
 
 class HighFiveAPIRequestLog(models.Model):
     _name = 'highfive.api.request.log'
@@ -39,6 +73,14 @@ class HighFiveAPIRequestLog(models.Model):
     request_body = fields.Text('Request Body')
     response_body = fields.Text('Response Body')
 
+    # Compressed payloads (archived or above the size threshold)
+    request_body_zip = fields.Binary('Compressed Request Body', attachment=False, readonly=True)
+    response_body_zip = fields.Binary('Compressed Response Body', attachment=False, readonly=True)
+    is_archived = fields.Boolean('Archived Payloads', readonly=True)
+
+    request_body_display = fields.Text('Request', compute='_compute_body_display')
+    response_body_display = fields.Text('Response', compute='_compute_body_display')
+
     # IP & User Info
     remote_addr = fields.Char('IP Address', index=True)
     user_agent = fields.Char('User Agent')
@@ -62,9 +104,15 @@ class HighFiveAPIRequestLog(models.Model):
     ('refunded', 'Refunded'),  # ← أضف
         ('payment_updated', 'Payment Updated'),
     ('payment_registered', 'Payment Registered'),  # ← أضف هذا السطر
+        ('payment_settled', 'Payment Settled'),
+        ('bulk_synced', 'Bulk Synced'),
+        ('bulk_cancelled', 'Bulk Cancelled'),
+        ('bulk_refunded', 'Bulk Refunded'),
         ('get_all', 'Get All'),
         ('get_active', 'Get Active'),
         ('get_status', 'Get Status'),
+        ('bulk_status', 'Bulk Status'),
+        ('get_active_bulk', 'Get Active (Bulk)'),
     ], string='Action')
 
     # Error
@@ -73,12 +121,278 @@ class HighFiveAPIRequestLog(models.Model):
 
     # Timing
     processing_time = fields.Float('Processing Time (ms)')
-    create_date = fields.Datetime('Created At', default=fields.Datetime.now, readonly=True)
+    create_date = fields.Datetime('Created At', default=fields.Datetime.now, readonly=True, index=True)
 
     # Company
     company_id = fields.Many2one('res.company', 'Company',
                                  default=lambda self: self.env.company)
 
+    def init(self):
+        """Indexes used by the retention cron to find expired logs per state
+        and the logs whose payloads are not archived yet"""
+        index_name = 'highfive_api_request_log_state_create_date_idx'
+        if not index_exists(self.env.cr, index_name):
+            create_index(
+                self.env.cr,
+                index_name,
+                self._table,
+                ['state', 'create_date'],
+            )
+        index_name = 'highfive_api_request_log_not_archived_create_date_idx'
+        if not index_exists(self.env.cr, index_name):
+            create_index(
+                self.env.cr,
+                index_name,
+                self._table,
+                ['create_date'],
+                where='is_archived IS NOT TRUE',
+            )
+
+    # =========================================================================
+    # PAYLOAD STORAGE
+    # =========================================================================
+
+    @api.depends('request_body', 'response_body', 'request_body_zip', 'response_body_zip')
+    def _compute_body_display(self):
+        for log in self:
+            log.request_body_display = log.request_body or self._decompress_payload(log.request_body_zip)
+            log.response_body_display = log.response_body or self._decompress_payload(log.response_body_zip)
+
+    @api.model
+    def _compress_payload(self, payload):
+        """Compress a payload to the base64 value of a Binary field"""
+        return base64.b64encode(zlib.compress(payload.encode('utf-8'), 9))
+
+    @api.model
+    def _decompress_payload(self, value):
+        """Inverse of _compress_payload()"""
+        if not value:
+            return False
+        return zlib.decompress(base64.b64decode(value)).decode('utf-8')
+
+    @api.model
+    def _get_payload_settings(self):
+        """
+        Payload storage settings
+
+        Returns:
+            tuple: (mode, max_size) where mode is 'full', 'truncate' or 'compress'
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        mode = ICP.get_param(f'{PARAM_PREFIX}log_payload_mode', DEFAULT_PAYLOAD_MODE)
+        max_size = int(ICP.get_param(f'{PARAM_PREFIX}log_payload_max_size', DEFAULT_PAYLOAD_MAX_SIZE))
+        return mode, max_size
+
+    @api.model
+    def _prepare_payload_vals(self, vals):
+        """
+        Truncate or compress the payloads above the size threshold
+
+        Args:
+            vals: Values of create() or write(), updated in place
+        """
+        if not any(vals.get(fname) for fname in PAYLOAD_FIELDS):
+            return vals
+
+        mode, max_size = self._get_payload_settings()
+        if mode == 'full' or max_size <= 0:
+            return vals
+
+        for fname, zip_fname in PAYLOAD_FIELDS.items():
+            payload = vals.get(fname)
+            if not payload or len(payload) <= max_size:
+                continue
+            if mode == 'truncate':
+                vals[fname] = f"{payload[:max_size]}\n... [truncated, {len(payload)} characters]"
+            elif mode == 'compress':
+                vals[zip_fname] = self._compress_payload(payload)
+                vals[fname] = False
+        return vals
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            self._prepare_payload_vals(vals)
+        return super().create(vals_list)
+
+    def write(self, vals):
+        res = super().write(self._prepare_payload_vals(vals))
+        # Finished requests feed the aggregated metrics
+        if vals.get('state') in ('success', 'failed') and 'processing_time' in vals:
+            self._record_metrics()
+        return res
+
+    def _record_metrics(self):
+        """
+        Add the finished requests to highfive.api.metric
+
+        The upsert runs after the request commits, on its own cursor: the
+        metric rows are shared by concurrent requests, and updating them in
+        the request transaction would fail it on serialization conflicts.
+        """
+        samples = [
+            (log.create_date, log.endpoint, log.entity_type, log.action,
+             log.state, log.processing_time)
+            for log in self
+        ]
+        if not samples:
+            return
+        registry = self.env.registry
+        uid = self.env.uid
+
+        @self.env.cr.postcommit.add
+        def record_metrics():
+            for attempt in range(1, METRICS_MAX_ATTEMPTS + 1):
+                try:
+                    with registry.cursor() as cr:
+                        env = api.Environment(cr, uid, {})
+                        env['highfive.api.metric'].sudo()._record(samples)
+                    return
+                except SerializationFailure:
+                    if attempt == METRICS_MAX_ATTEMPTS:
+                        _logger.warning(
+                            f"API metrics: {len(samples)} sample(s) dropped after "
+                            f"{attempt} concurrent update conflicts"
+                        )
+                except Exception as e:
+                    _logger.warning(f"API metrics: {len(samples)} sample(s) dropped: {e}")
+                    return
+
+    # =========================================================================
+    # RETENTION
+    # =========================================================================
+
+    @api.model
+    def _get_retention_days(self):
+        """
+        Retention per state, from the system parameters
+
+        Returns:
+            dict: {state: days}, 0 keeping the logs forever
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        return {
+            state: int(ICP.get_param(f'{PARAM_PREFIX}log_retention_{state}_days', days))
+            for state, days in DEFAULT_RETENTION_DAYS.items()
+        }
+
+    @api.model
+    def _archive_payloads(self, before, limit):
+        """
+        Move the payloads of one chunk of logs older than `before` to the
+        compressed columns
+
+        Returns:
+            int: Number of archived logs
+        """
+        self.env.cr.execute("""
+            SELECT id, request_body, response_body
+              FROM highfive_api_request_log
+             WHERE is_archived IS NOT TRUE
+               AND create_date < %s
+             ORDER BY create_date
+             LIMIT %s
+        """, (before, limit))
+        rows = [
+            (
+                log_id,
+                self._compress_payload(request_body) if request_body else None,
+                self._compress_payload(response_body) if response_body else None,
+            )
+            for log_id, request_body, response_body in self.env.cr.fetchall()
+        ]
+        if rows:
+            self.env.cr.execute(f"""
+                UPDATE highfive_api_request_log AS l
+                   SET request_body_zip = COALESCE(v.request_zip::bytea, l.request_body_zip),
+                       response_body_zip = COALESCE(v.response_zip::bytea, l.response_body_zip),
+                       request_body = NULL,
+                       response_body = NULL,
+                       is_archived = TRUE
+                  FROM (VALUES {', '.join(['%s'] * len(rows))})
+                       AS v(id, request_zip, response_zip)
+                 WHERE l.id = v.id
+            """, rows)
+        return len(rows)
+
+    @api.model
+    def _delete_expired(self, state, before, limit):
+        """
+        Delete one chunk of logs of `state` older than `before`
+
+        Returns:
+            int: Number of deleted logs
+        """
+        self.env.cr.execute("""
+            DELETE FROM highfive_api_request_log
+             WHERE id IN (
+                SELECT id
+                  FROM highfive_api_request_log
+                 WHERE state = %s
+                   AND create_date < %s
+                 ORDER BY create_date
+                 LIMIT %s
+             )
+        """, (state, before, limit))
+        return self.env.cr.rowcount
+
+    @api.model
+    def _commit_retention_chunk(self):
+        """Commit one retention chunk (kept in the test transaction)"""
+        if not self.env.registry.in_test_mode():
+            self.env.cr.commit()
+
+    @api.model
+    def _cron_apply_retention(self):
+        """
+        Apply the retention policy in bounded chunks
+
+        1. Delete the expired logs of each state
+        2. Compress the payloads of the logs older than the archive delay
+
+        Each chunk is committed on its own so locks and WAL stay bounded.
+        Each run handles at most RETENTION_MAX_CHUNKS chunks; when work is
+        left the cron reports it so the scheduler runs it again right away.
+        """
+        self.flush_model()
+        now = fields.Datetime.now()
+        chunks = 0
+        deleted = archived = 0
+
+        for state, days in self._get_retention_days().items():
+            if days <= 0:
+                continue
+            before = now - timedelta(days=days)
+            while chunks < RETENTION_MAX_CHUNKS:
+                count = self._delete_expired(state, before, RETENTION_CHUNK_SIZE)
+                self._commit_retention_chunk()
+                chunks += 1
+                deleted += count
+                if count < RETENTION_CHUNK_SIZE:
+                    break
+
+        archive_days = int(self.env['ir.config_parameter'].sudo().get_param(
+            f'{PARAM_PREFIX}log_archive_days', DEFAULT_ARCHIVE_DAYS))
+        if archive_days > 0:
+            before = now - timedelta(days=archive_days)
+            while chunks < RETENTION_MAX_CHUNKS:
+                count = self._archive_payloads(before, RETENTION_CHUNK_SIZE)
+                self._commit_retention_chunk()
+                chunks += 1
+                archived += count
+                if count < RETENTION_CHUNK_SIZE:
+                    break
+
+        self.invalidate_model()
+        has_more = chunks >= RETENTION_MAX_CHUNKS
+        self.env['ir.cron']._notify_progress(done=deleted + archived, remaining=int(has_more))
+
+        _logger.info(
+            f"Request log retention: {deleted} deleted, {archived} archived"
+            f"{' (more to do)' if has_more else ''}"
+        )
+        return {'deleted': deleted, 'archived': archived, 'has_more': has_more}
+
     # Actions
     def action_view_odoo_record(self):
         """Open the related Odoo record"""
@@ -1,10 +1,30 @@
 # -*- coding: utf-8 -*-
 from odoo.exceptions import ValidationError
+from collections import defaultdict
 from datetime import datetime
+import hashlib
+import json
 import logging
-from odoo import fields
+from odoo import Command, fields
 _logger = logging.getLogger(__name__)
 
+# Maximum number of bookings per bulk status lookup
+MAX_BULK_READ = 1000
+
+# Fields read by the status lookups (one search_read per model)
+BOOKING_STATUS_FIELDS = [
+    'name', 'highfive_booking_id', 'state', 'payment_state', 'booking_date',
+    'customer_id', 'customer_phone', 'customer_email', 'unit_id',
+    'session_base_price', 'services_total', 'discount', 'subtotal', 'tax_amount', 'total',
+    'payment_method', 'payment_card', 'payment_wallet', 'payment_coupon',
+    'payment_transaction_ref', 'commission_id', 'booking_type', 'commission_percent',
+    'commission_fixed', 'commission_amount_net', 'commission_amount_tax',
+    'commission_amount_total', 'sales_invoice_id', 'write_date',
+]
+INVOICE_STATUS_FIELDS = [
+    'name', 'state', 'payment_state', 'amount_total', 'partner_id', 'write_date',
+]
+
 
 class BookingService:
     """Booking Processing Service"""
@@ -41,15 +61,16 @@ class BookingService:
         unit = self._get_unit(data['unit_id'])
 
         # Transform data
-        vals = self._transform(data)
+        vals = self._transform(data, unit=unit)
 
-        # Create booking
+        # Create booking with its lines (unit + services) in one create
+        vals['booking_line_ids'] = self._prepare_booking_line_commands(data, unit)
         booking = self.env['highfive.booking'].create(vals)
 
-        _logger.info(f"Created booking {booking.id}: {booking.name}")
-
-        # Create booking lines (pass unit directly)
-        self._create_booking_lines(booking, data, unit)
+        _logger.info(
+            f"Created booking {booking.id}: {booking.name} "
+            f"({len(vals['booking_line_ids'])} lines)"
+        )
 
         # Auto-confirm if status is confirmed
         if data.get('status') == 'confirmed':
@@ -124,12 +145,15 @@ class BookingService:
         else:
             # ✅ إذا draft، يمكن تحديث كل شيء
             vals = self._transform(data, is_update=True)
-            booking.write(vals)
-            _logger.info(f"Updated booking {booking.id}")
 
-            # Update booking lines if services changed
+            # Update booking lines if services changed (same write)
             if 'services' in data:
-                self._update_booking_lines(booking, data)
+                commands = self._prepare_service_line_commands(booking, data['services'])
+                if commands:
+                    vals['booking_line_ids'] = commands
+
+            booking.write(vals)
+            _logger.info(f"Updated booking {booking.id}")
 
             # Confirm if needed
             if data.get('status') == 'confirmed' and booking.state == 'draft':
@@ -225,6 +249,97 @@ class BookingService:
 
         return result
 
+    def settle_payments(self, data):
+        """
+        Register a payment-gateway settlement covering many bookings
+
+        The payments of each journal/date are created, posted and reconciled
+        in one batch, one per booking for the exact amount of its line (see
+        highfive.payment.settlement).
+
+        Args:
+            data: Settlement data:
+            {
+                "reference": "STL-2026-10-18",
+                "date": "2026-10-18",          # optional, default today
+                "journal_id": 7,               # optional, default bank journal
+                "payments": [
+                    {
+                        "booking_id": 123,
+                        "amount": 200.0,
+                        "card": 150.0, "wallet": 50.0, "coupon": 0.0,
+                        "transaction_ref": "TX-1",
+                        "payment_date": "2026-10-17"   # optional
+                    },
+                    ...
+                ]
+            }
+
+        Returns:
+            Result dictionary with per-booking outcomes
+        """
+        payments = data.get('payments')
+        if not payments or not isinstance(payments, list):
+            raise ValidationError("Settlement must include a non-empty 'payments' list")
+
+        for payment in payments:
+            if payment.get('booking_id') is None or payment.get('amount') is None:
+                raise ValidationError("Each settlement payment requires booking_id and amount")
+
+        journal = self._get_settlement_journal(data.get('journal_id'))
+
+        settlement = self.env['highfive.payment.settlement'].create({
+            'reference': data.get('reference'),
+            'date': data.get('date') or fields.Date.today(),
+            'journal_id': journal.id,
+            'line_ids': [(0, 0, {
+                'highfive_booking_id': str(payment['booking_id']),
+                'amount': float(payment['amount']),
+                'payment_card': float(payment.get('card', 0)),
+                'payment_wallet': float(payment.get('wallet', 0)),
+                'payment_coupon': float(payment.get('coupon', 0)),
+                'transaction_ref': payment.get('transaction_ref'),
+                'date': payment.get('payment_date'),
+            }) for payment in payments],
+        })
+        settlement.action_process()
+
+        outcomes = settlement._get_outcomes()
+
+        _logger.info(
+            f"Settlement {settlement.name}: {settlement.reconciled_count} reconciled, "
+            f"{settlement.failed_count} failed/skipped"
+        )
+
+        return {
+            'action': 'payment_settled',
+            'settlement_id': settlement.id,
+            'settlement_ref': settlement.name,
+            'model': 'highfive.payment.settlement',
+            'payment_refs': settlement.payment_ids.mapped('name'),
+            'reconciled_count': settlement.reconciled_count,
+            'failed_count': settlement.failed_count,
+            'bookings': outcomes,
+        }
+
+    def _get_settlement_journal(self, journal_id=None):
+        """Get settlement journal (given ID or first bank journal)"""
+        if journal_id:
+            journal = self.env['account.journal'].browse(int(journal_id)).exists()
+            if not journal or journal.type not in ('bank', 'cash'):
+                raise ValidationError(f"Journal {journal_id} not found")
+            return journal
+
+        journal = self.env['account.journal'].search([
+            ('type', '=', 'bank'),
+            ('company_id', '=', self.env.company.id)
+        ], limit=1)
+
+        if not journal:
+            raise ValidationError("No bank journal found")
+
+        return journal
+
     def refund_booking(self, booking_id, reason=''):
         """
         Refund booking with proper accounting (credit notes & refund payments)
@@ -236,123 +351,128 @@ class BookingService:
         Returns:
             Result dictionary
         """
-        booking = self.env['highfive.booking'].search([
-            ('highfive_booking_id', '=', str(booking_id))
-        ], limit=1)
+        return self._get_single_result(self.refund_bookings([booking_id], reason))
 
-        if not booking:
-            raise ValidationError(f"Booking {booking_id} not found")
+    def refund_bookings(self, booking_ids, reason=''):
+        """
+        Refund many bookings at once
 
-        if booking.state == 'cancelled':
-            return {
-                'action': 'already_cancelled',
+        1. Resolve all bookings with one search
+        2. Reverse the posted sales invoices and the paid vendor bills with
+           one _reverse_moves() and post all credit notes together
+        3. Create the refund payments of the paid invoices together (a
+           failed refund is reported as 'refund_failed' on its booking)
+        4. Cancel the unpaid vendor bills together
+        5. Cancel all bookings with one write
+
+        Args:
+            booking_ids: List of HighFive booking IDs
+            reason: Refund reason
+
+        Returns:
+            Result dictionary with per-booking outcomes
+        """
+        bookings, results = self._get_bookings_for_cancellation(booking_ids)
+        if not bookings:
+            return self._get_bulk_result('bulk_refunded', booking_ids, results)
+
+        for booking in bookings:
+            results[booking.highfive_booking_id] = {
+                'action': 'refunded',
                 'booking_id': booking.id,
-                'state': 'cancelled'
+                'credit_notes': [],
+                'refund_payments': []
             }
 
-        result = {
-            'action': 'refunded',
-            'booking_id': booking.id,
-            'credit_notes': [],
-            'refund_payments': []
+        invoices = bookings.sales_invoice_id.filtered(lambda m: m.state == 'posted')
+        bills = bookings.vendor_bill_id
+        paid_bills = bills.filtered(lambda m: m.state == 'posted' and m.payment_state == 'paid')
+        unpaid_bills = bills.filtered(lambda m: m.state == 'posted' and m.payment_state != 'paid')
+        draft_bills = bills.filtered(lambda m: m.state == 'draft')
+        paid_invoices = invoices.filtered(lambda m: m.payment_state == 'paid')
+        booking_by_move = {
+            move: booking
+            for booking in bookings
+            for move in (booking.sales_invoice_id, booking.vendor_bill_id) if move
         }
 
         # ================================================================
-        # 1. Sales Invoice - Credit Note & Refund Payment
+        # 1. Credit Notes (sales invoices + paid vendor bills)
         # ================================================================
-        if booking.sales_invoice_id and booking.sales_invoice_id.state == 'posted':
-            invoice = booking.sales_invoice_id
-
-            # Create credit note
-            credit_note = invoice._reverse_moves(
+        moves_to_reverse = invoices | paid_bills
+        credit_notes = self.env['account.move']
+        if moves_to_reverse:
+            credit_notes = moves_to_reverse._reverse_moves(
                 default_values_list=[{
                     'ref': f'Refund: {reason}',
                     'invoice_date': fields.Date.today(),
-                }]
+                } for move in moves_to_reverse]
             )
-            credit_note.action_post()
-
-            result['credit_notes'].append({
-                'type': 'sales_invoice',
-                'original_invoice': invoice.name,
+            credit_notes.action_post()
+
+        credit_note_by_move = {}
+        for credit_note in credit_notes:
+            move = credit_note.reversed_entry_id
+            credit_note_by_move[move] = credit_note
+            is_invoice = move in invoices
+            results[booking_by_move[move].highfive_booking_id]['credit_notes'].append({
+                'type': 'sales_invoice' if is_invoice else 'vendor_bill',
+                'original_invoice' if is_invoice else 'original_bill': move.name,
                 'credit_note': credit_note.name,
                 'amount': credit_note.amount_total
             })
 
-            _logger.info(f"Created credit note {credit_note.name} for invoice {invoice.name}")
-
-            # Refund payment if paid
-            if invoice.payment_state == 'paid':
-                refund_payment = self._create_refund_payment(invoice, credit_note)
-                if refund_payment:
-                    result['refund_payments'].append({
-                        'type': 'customer_refund',
-                        'payment_ref': refund_payment.name,
-                        'amount': refund_payment.amount
-                    })
-                    _logger.info(f"Created refund payment {refund_payment.name}")
+        if credit_notes:
+            _logger.info(f"Created {len(credit_notes)} credit notes for {len(bookings)} bookings")
 
         # ================================================================
-        # 2. Vendor Bill - Cancel or Refund
+        # 2. Refund Payments (paid sales invoices)
         # ================================================================
-        if booking.vendor_bill_id:
-            bill = booking.vendor_bill_id
-
-            if bill.state == 'posted':
-                # إذا مدفوعة → credit note
-                if bill.payment_state == 'paid':
-                    bill_credit = bill._reverse_moves(
-                        default_values_list=[{
-                            'ref': f'Refund: {reason}',
-                            'invoice_date': fields.Date.today(),
-                        }]
-                    )
-                    bill_credit.action_post()
-
-                    result['credit_notes'].append({
-                        'type': 'vendor_bill',
-                        'original_bill': bill.name,
-                        'credit_note': bill_credit.name,
-                        'amount': bill_credit.amount_total
-                    })
-
-                    _logger.info(f"Created credit note {bill_credit.name} for bill {bill.name}")
-
-
-
-                # إذا غير مدفوعة → إلغاء مباشر
-                else:
-                    bill.button_draft()
-                    bill.button_cancel()
-                    result['credit_notes'].append({
-                        'type': 'vendor_bill',
-                        'original_bill': bill.name,
-                        'action': 'cancelled',
-                        'amount': bill.amount_total
-                    })
-                    _logger.info(f"Cancelled unpaid bill {bill.name}")
+        refunds, refund_failures = self._create_refund_payments([
+            (booking_by_move[invoice], invoice, credit_note_by_move[invoice])
+            for invoice in paid_invoices
+        ])
+        for invoice, refund_payment in refunds:
+            results[booking_by_move[invoice].highfive_booking_id]['refund_payments'].append({
+                'type': 'customer_refund',
+                'payment_ref': refund_payment.name,
+                'amount': refund_payment.amount
+            })
+        # The credit note is posted but the customer is not refunded yet
+        for invoice, error in refund_failures.items():
+            results[booking_by_move[invoice].highfive_booking_id].update({
+                'action': 'refund_failed',
+                'error': f"Refund payment failed: {error}",
+            })
 
-            elif bill.state == 'draft':
-                bill.button_cancel()
-                result['credit_notes'].append({
-                    'type': 'vendor_bill',
-                    'original_bill': bill.name,
-                    'action': 'cancelled',
-                    'amount': bill.amount_total
-                })
+        # ================================================================
+        # 3. Vendor Bills - Cancel (unpaid or draft)
+        # ================================================================
+        if unpaid_bills:
+            unpaid_bills.button_draft()
+        if unpaid_bills or draft_bills:
+            (unpaid_bills | draft_bills).button_cancel()
+        for bill in unpaid_bills | draft_bills:
+            results[booking_by_move[bill].highfive_booking_id]['credit_notes'].append({
+                'type': 'vendor_bill',
+                'original_bill': bill.name,
+                'action': 'cancelled',
+                'amount': bill.amount_total
+            })
 
         # ================================================================
-        # 3. Update Booking State
+        # 4. Update Booking State
         # ================================================================
-        booking.write({
+        bookings.write({
             'state': 'cancelled',
             'notes': f"Refunded: {reason}"
         })
 
-        _logger.info(f"Refunded booking {booking.id}")
+        _logger.info(f"Refunded {len(bookings)} bookings")
 
-        result['state'] = 'cancelled'
-        return result
+        for booking in bookings:
+            results[booking.highfive_booking_id]['state'] = 'cancelled'
+        return self._get_bulk_result('bulk_refunded', booking_ids, results)
 
     def cancel_booking(self, booking_id, reason=''):
         """
@@ -365,108 +485,157 @@ class BookingService:
         Returns:
             Result dictionary
         """
-        booking = self.env['highfive.booking'].search([
-            ('highfive_booking_id', '=', str(booking_id))
-        ], limit=1)
+        return self._get_single_result(self.cancel_bookings([booking_id], reason))
 
-        if not booking:
-            raise ValidationError(f"Booking {booking_id} not found")
+    def cancel_bookings(self, booking_ids, reason=''):
+        """
+        Cancel many bookings at once (no credit notes, just cancel)
 
-        if booking.state == 'cancelled':
-            return {
-                'action': 'already_cancelled',
+        Invoices, bills and draft payments are found through the booking
+        links (sales_invoice_id, vendor_bill_id, payment_ids) and cancelled
+        together.
+
+        Args:
+            booking_ids: List of HighFive booking IDs
+            reason: Cancellation reason
+
+        Returns:
+            Result dictionary with per-booking outcomes
+        """
+        bookings, results = self._get_bookings_for_cancellation(booking_ids)
+        if not bookings:
+            return self._get_bulk_result('bulk_cancelled', booking_ids, results)
+
+        for booking in bookings:
+            results[booking.highfive_booking_id] = {
+                'action': 'cancelled',
                 'booking_id': booking.id,
-                'state': 'cancelled'
+                'cancelled_items': []
             }
 
-        result = {
-            'action': 'cancelled',
-            'booking_id': booking.id,
-            'cancelled_items': []
-        }
-
         # ================================================================
-        # 1. Cancel Sales Invoice
+        # 1. Cancel Sales Invoices & Vendor Bills
         # ================================================================
-        if booking.sales_invoice_id:
+        moves = bookings.sales_invoice_id | bookings.vendor_bill_id
+        posted_moves = moves.filtered(lambda m: m.state == 'posted')
+        draft_moves = moves.filtered(lambda m: m.state == 'draft')
+        if posted_moves:
+            # لا يمكن إلغاء posted مباشرة
+            posted_moves.button_draft()
+        if posted_moves or draft_moves:
+            (posted_moves | draft_moves).button_cancel()
+
+        for booking in bookings:
             invoice = booking.sales_invoice_id
-
-            if invoice.state == 'draft':
-                invoice.button_cancel()
-                result['cancelled_items'].append({
+            if invoice in posted_moves:
+                results[booking.highfive_booking_id]['cancelled_items'].append({
                     'type': 'sales_invoice',
                     'ref': invoice.name,
-                    'state': 'cancelled'
+                    'state': 'posted',
+                    'note': 'Cannot cancel posted invoice directly'
                 })
-            elif invoice.state == 'posted':
-                # لا يمكن إلغاء posted مباشرة
-                invoice.button_draft()
-                invoice.button_cancel()
-                result['cancelled_items'].append({
+            elif invoice in draft_moves:
+                results[booking.highfive_booking_id]['cancelled_items'].append({
                     'type': 'sales_invoice',
                     'ref': invoice.name,
-                    'state': 'posted',
-                    'note': 'Cannot cancel posted invoice directly'
+                    'state': 'cancelled'
                 })
 
-            _logger.info(f"Cancelled sales invoice {invoice.name}")
-
-        # ================================================================
-        # 2. Cancel Vendor Bill
-        # ================================================================
-        if booking.vendor_bill_id:
             bill = booking.vendor_bill_id
-
-            if bill.state == 'draft':
-                bill.button_cancel()
-                result['cancelled_items'].append({
-                    'type': 'vendor_bill',
-                    'ref': bill.name,
-                    'state': 'cancelled'
-                })
-            elif bill.state == 'posted':
-                # تحويل إلى draft ثم cancel
-                bill.button_draft()
-                bill.button_cancel()
-                result['cancelled_items'].append({
+            if bill in posted_moves or bill in draft_moves:
+                results[booking.highfive_booking_id]['cancelled_items'].append({
                     'type': 'vendor_bill',
                     'ref': bill.name,
                     'state': 'cancelled'
                 })
 
-            _logger.info(f"Cancelled vendor bill {bill.name}")
+        if posted_moves or draft_moves:
+            _logger.info(f"Cancelled {len(posted_moves | draft_moves)} invoices/bills")
 
         # ================================================================
-        # 3. Cancel Payments (if draft)
+        # 2. Cancel Payments (if draft)
         # ================================================================
-        payment_count = 0
-        if booking.sales_invoice_id:
-            payments = self.env['account.payment'].search([
-                ('ref', 'ilike', booking.sales_invoice_id.name),
-                ('state', '=', 'draft')
-            ])
-            for payment in payments:
-                payment.action_cancel()
-                payment_count += 1
-
-        if payment_count > 0:
-            result['cancelled_items'].append({
-                'type': 'payments',
-                'count': payment_count,
-                'state': 'cancelled'
-            })
+        payments = bookings.payment_ids.filtered(lambda p: p.state == 'draft')
+        if payments:
+            payments.action_cancel()
+
+        for booking in bookings:
+            payment_count = len(booking.payment_ids & payments)
+            if payment_count > 0:
+                results[booking.highfive_booking_id]['cancelled_items'].append({
+                    'type': 'payments',
+                    'count': payment_count,
+                    'state': 'cancelled'
+                })
 
         # ================================================================
-        # 4. Update Booking State
+        # 3. Update Booking State
         # ================================================================
-        booking.write({
+        bookings.write({
             'state': 'cancelled',
             'notes': f"Cancelled: {reason}"
         })
 
-        _logger.info(f"Cancelled booking {booking.id}")
+        _logger.info(f"Cancelled {len(bookings)} bookings")
+
+        for booking in bookings:
+            results[booking.highfive_booking_id]['state'] = 'cancelled'
+        return self._get_bulk_result('bulk_cancelled', booking_ids, results)
 
-        result['state'] = 'cancelled'
+    def _get_bookings_for_cancellation(self, booking_ids):
+        """
+        Resolve the bookings of a cancellation/refund with one search
+
+        Returns:
+            tuple: (bookings still to cancel, {highfive_booking_id: result}
+                   for the bookings not found or already cancelled)
+        """
+        if not booking_ids or not isinstance(booking_ids, list):
+            raise ValidationError("booking_ids must be a non-empty list")
+
+        refs = [str(booking_id) for booking_id in booking_ids]
+        bookings = self.env['highfive.booking'].search([
+            ('highfive_booking_id', 'in', refs)
+        ])
+        found = {booking.highfive_booking_id: booking for booking in bookings}
+
+        results = {}
+        for ref in refs:
+            booking = found.get(ref)
+            if not booking:
+                results[ref] = {
+                    'action': 'not_found',
+                    'error': f"Booking {ref} not found"
+                }
+            elif booking.state == 'cancelled':
+                results[ref] = {
+                    'action': 'already_cancelled',
+                    'booking_id': booking.id,
+                    'state': 'cancelled'
+                }
+        return bookings.filtered(lambda b: b.state != 'cancelled'), results
+
+    def _get_bulk_result(self, action, booking_ids, results):
+        """Result of a bulk cancellation/refund, in the order of the request"""
+        bookings = [
+            dict(results[str(booking_id)], highfive_booking_id=str(booking_id))
+            for booking_id in booking_ids
+        ]
+        return {
+            'action': action,
+            'model': 'highfive.booking',
+            'processed_count': sum(
+                1 for result in bookings if result['action'] in ('cancelled', 'refunded')
+            ),
+            'bookings': bookings,
+        }
+
+    def _get_single_result(self, bulk_result):
+        """Result of a single booking cancellation/refund"""
+        result = dict(bulk_result['bookings'][0])
+        if result['action'] == 'not_found':
+            raise ValidationError(result['error'])
+        result.pop('highfive_booking_id')
         return result
 
     def get_booking_status(self, booking_id):
@@ -479,61 +648,167 @@ class BookingService:
         Returns:
             Booking details dictionary
         """
-        booking = self.env['highfive.booking'].search([
-            ('highfive_booking_id', '=', str(booking_id))
-        ], limit=1)
+        result = self.get_booking_statuses([booking_id])
 
-        if not booking:
+        if not result['bookings']:
             raise ValidationError(f"Booking {booking_id} not found")
 
+        return result['bookings'][0]
+
+    def get_booking_statuses(self, booking_ids):
+        """
+        Get status and details of many bookings at once
+
+        Bookings and their sales invoices are read with one search_read
+        each, limited to the fields of the response.
+
+        Args:
+            booking_ids: List of HighFive booking IDs
+
+        Returns:
+            dict: {
+                'bookings': [booking details, see get_booking_status()],
+                'not_found': [HighFive booking IDs],
+                'last_modified': datetime or None,
+                'etag': str,
+            }
+        """
+        if not booking_ids or not isinstance(booking_ids, list):
+            raise ValidationError("booking_ids must be a non-empty list")
+
+        if len(booking_ids) > MAX_BULK_READ:
+            raise ValidationError(f"Too many bookings: {len(booking_ids)} (max {MAX_BULK_READ})")
+
+        booking_refs = list(dict.fromkeys(str(booking_id) for booking_id in booking_ids))
+
+        bookings_by_ref = {}
+        for booking in self.env['highfive.booking'].search_read([
+            ('highfive_booking_id', 'in', booking_refs)
+        ], BOOKING_STATUS_FIELDS, order='id'):
+            bookings_by_ref.setdefault(booking['highfive_booking_id'], booking)
+
+        invoice_ids = [
+            booking['sales_invoice_id'][0]
+            for booking in bookings_by_ref.values()
+            if booking['sales_invoice_id']
+        ]
+        invoices = {
+            invoice['id']: invoice
+            for invoice in self.env['account.move'].search_read([
+                ('id', 'in', invoice_ids)
+            ], INVOICE_STATUS_FIELDS)
+        } if invoice_ids else {}
+
+        results = []
+        not_found = []
+        versions = []
+        for booking_ref in booking_refs:
+            booking = bookings_by_ref.get(booking_ref)
+            if not booking:
+                not_found.append(booking_ref)
+                continue
+            invoice = invoices.get(booking['sales_invoice_id'] and booking['sales_invoice_id'][0])
+            results.append(self._format_booking_status(booking, invoice))
+            versions.append(('highfive.booking', booking['id'], booking['write_date']))
+            if invoice:
+                versions.append(('account.move', invoice['id'], invoice['write_date']))
+
         return {
-            'booking_id': booking.id,
-            'name': booking.name,
-            'highfive_booking_id': booking.highfive_booking_id,
-            'state': booking.state,
-            'payment_state': booking.payment_state,
-            'booking_date': booking.booking_date.isoformat() if booking.booking_date else None,
+            'bookings': results,
+            'not_found': not_found,
+            'last_modified': max((version[2] for version in versions), default=None),
+            'etag': self._get_etag(versions + [('not_found', ref, None) for ref in not_found]),
+        }
+
+    def _format_booking_status(self, booking, invoice):
+        """
+        Booking details of get_booking_status() from search_read values
+
+        Args:
+            booking: highfive.booking values (BOOKING_STATUS_FIELDS)
+            invoice: account.move values (INVOICE_STATUS_FIELDS) or None
+        """
+        customer_id, customer_name = booking['customer_id'] or (None, None)
+        unit_id, unit_name = booking['unit_id'] or (None, None)
+        commission_id, commission_name = booking['commission_id'] or (None, None)
+
+        invoices = []
+        # Sales invoice (always exists for both online and cash)
+        if invoice:
+            invoices.append({
+                'type': 'sales_invoice',
+                'id': invoice['id'],
+                'ref': invoice['name'],
+                'state': invoice['state'],
+                'payment_state': invoice['payment_state'],
+                'amount_total': invoice['amount_total'],
+                'partner': invoice['partner_id'][1] if invoice['partner_id'] else None,
+                'description': (
+                    'Customer invoice (Unit + Services + Commission)'
+                    if booking['payment_method'] == 'online'
+                    else 'Partner invoice (Commission only)'
+                )
+            })
+
+        return {
+            'booking_id': booking['id'],
+            'name': booking['name'],
+            'highfive_booking_id': booking['highfive_booking_id'],
+            'state': booking['state'],
+            'payment_state': booking['payment_state'],
+            'booking_date': booking['booking_date'].isoformat() if booking['booking_date'] else None,
             'customer': {
-                'id': booking.customer_id.id,
-                'name': booking.customer_id.name,
-                'phone': booking.customer_phone,
-                'email': booking.customer_email
+                'id': customer_id,
+                'name': customer_name,
+                'phone': booking['customer_phone'],
+                'email': booking['customer_email']
             },
             'unit': {
-                'id': booking.unit_id.id if booking.unit_id else None,
-                'name': booking.unit_id.name if booking.unit_id else None
+                'id': unit_id,
+                'name': unit_name
             },
             'amounts': {
-                'session_base_price': booking.session_base_price,
-                'services_total': booking.services_total,
-                'discount': booking.discount,
-                'subtotal': booking.subtotal,
-                'tax_amount': booking.tax_amount,
-                'total': booking.total
+                'session_base_price': booking['session_base_price'],
+                'services_total': booking['services_total'],
+                'discount': booking['discount'],
+                'subtotal': booking['subtotal'],
+                'tax_amount': booking['tax_amount'],
+                'total': booking['total']
             },
             'payment': {
-                'method': booking.payment_method,
-                'card': booking.payment_card,
-                'wallet': booking.payment_wallet,
-                'coupon': booking.payment_coupon,
-                'transaction_ref': booking.payment_transaction_ref
+                'method': booking['payment_method'],
+                'card': booking['payment_card'],
+                'wallet': booking['payment_wallet'],
+                'coupon': booking['payment_coupon'],
+                'transaction_ref': booking['payment_transaction_ref']
             },
             # ================================================================
             # Commission Info (NEW)
             # ================================================================
             'commission': {
-                'id': booking.commission_id.id if booking.commission_id else None,
-                'name': booking.commission_id.name if booking.commission_id else None,
-                'booking_type': booking.booking_type,
-                'percent': booking.commission_percent,
-                'fixed': booking.commission_fixed,
-                'amount_net': booking.commission_amount_net,
-                'amount_tax': booking.commission_amount_tax,
-                'amount_total': booking.commission_amount_total
+                'id': commission_id,
+                'name': commission_name,
+                'booking_type': booking['booking_type'],
+                'percent': booking['commission_percent'],
+                'fixed': booking['commission_fixed'],
+                'amount_net': booking['commission_amount_net'],
+                'amount_tax': booking['commission_amount_tax'],
+                'amount_total': booking['commission_amount_total']
             },
-            'invoices': self._get_invoice_info(booking)
+            'invoices': invoices
         }
 
+    def _get_etag(self, versions):
+        """
+        Entity tag of a read response
+
+        Args:
+            versions: List of (model, id, write_date) tuples of the records
+                      the response was built from
+        """
+        payload = json.dumps(sorted(versions, key=str), default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
     # =========================================================================
     # VALIDATION
     # =========================================================================
@@ -617,10 +892,10 @@ class BookingService:
     # TRANSFORMATION
     # =========================================================================
 
-    def _transform(self, data, is_update=False):
+    def _transform(self, data, is_update=False, unit=None):
         """Transform HighFive data to Odoo format"""
         # Get unit
-        unit = self._get_unit(data['unit_id'])
+        unit = unit or self._get_unit(data['unit_id'])
 
         # Get customer
         customer = self._get_customer(data['booker_id'])
@@ -690,8 +965,18 @@ class BookingService:
     # BOOKING LINES
     # =========================================================================
 
-    def _create_booking_lines(self, booking, data, unit):
-        """Create booking lines (unit + services)"""
+    def _prepare_booking_line_commands(self, data, unit):
+        """
+        Line commands of a new booking (unit + services), created together
+        with the booking so its stored totals are computed once
+
+        Args:
+            data: Booking data from HighFive
+            unit: Unit (product.template) of the booking
+
+        Returns:
+            list: Create commands for booking_line_ids
+        """
         # Unit line (main product)
         # Get product.product variant from product.template
         unit_product = unit.product_variant_id
@@ -702,22 +987,36 @@ class BookingService:
         if not unit_product:
             raise ValidationError(f"Unit {unit.id} has no product variant")
 
-        unit_vals = {
-            'booking_id': booking.id,
+        commands = [Command.create({
             'line_type': 'unit',
             'product_id': unit_product.id,  # Use product.product ID
             'name': unit.name,
             'quantity': 1,
             'price_unit': float(data['session_base_price']),
-        }
-        self.env['highfive.booking.line'].create(unit_vals)
-
-        _logger.info(f"Created unit line for booking {booking.id}")
+        })]
 
         # Service lines
-        services = data.get('services', [])
+        commands += [
+            Command.create(vals)
+            for vals in self._prepare_service_lines_vals(data.get('services', []))
+        ]
+        return commands
+
+    def _prepare_service_lines_vals(self, services):
+        """
+        Values of the service lines, all services resolved with one search
+
+        Args:
+            services: List of service dicts from HighFive
+
+        Returns:
+            list: Booking line values, in the order of the services
+        """
+        templates = self._get_services([service_data['service_id'] for service_data in services])
+
+        vals_list = []
         for service_data in services:
-            service_template = self._get_service(service_data['service_id'])
+            service_template = templates[str(service_data['service_id'])]
 
             # Get product.product variant
             service_product = service_template.product_variant_id
@@ -728,49 +1027,51 @@ class BookingService:
             if not service_product:
                 raise ValidationError(f"Service {service_template.id} has no product variant")
 
-            service_vals = {
-                'booking_id': booking.id,
+            vals_list.append({
                 'line_type': 'service',
                 'product_id': service_product.id,
                 'name': service_data.get('name', service_template.name),
                 'quantity': float(service_data.get('quantity', 1)),
                 'price_unit': float(service_data.get('price_unit', service_template.list_price)),
-            }
-            self.env['highfive.booking.line'].create(service_vals)
-
-        if services:
-            _logger.info(f"Created {len(services)} service lines for booking {booking.id}")
-
-    def _update_booking_lines(self, booking, data):
-        """Update booking lines"""
-        # Remove old service lines
-        booking.booking_line_ids.filtered(lambda l: l.line_type == 'service').unlink()
+            })
+        return vals_list
 
-        # Create new service lines
-        services = data.get('services', [])
-        for service_data in services:
-            service_template = self._get_service(service_data['service_id'])
+    def _prepare_service_line_commands(self, booking, services):
+        """
+        Diff the service lines of a booking against the received services
 
-            # Get product.product variant
-            service_product = service_template.product_variant_id
-            if not service_product:
-                service_product = service_template.product_variant_ids[
-                    0] if service_template.product_variant_ids else None
+        Existing lines are matched by product in order: matched lines are
+        updated only when a value changed, missing ones are created and the
+        remaining ones are deleted.
 
-            if not service_product:
-                raise ValidationError(f"Service {service_template.id} has no product variant")
+        Args:
+            booking: highfive.booking record
+            services: List of service dicts from HighFive
 
-            service_vals = {
-                'booking_id': booking.id,
-                'line_type': 'service',
-                'product_id': service_product.id,  # FIXED: Use product.product ID
-                'name': service_data.get('name', service_template.name),
-                'quantity': float(service_data.get('quantity', 1)),
-                'price_unit': float(service_data.get('price_unit', service_template.list_price)),
+        Returns:
+            list: Commands for booking_line_ids
+        """
+        existing_by_product = defaultdict(list)
+        for line in booking.booking_line_ids.filtered(lambda l: l.line_type == 'service'):
+            existing_by_product[line.product_id.id].append(line)
+
+        commands = []
+        for vals in self._prepare_service_lines_vals(services):
+            lines = existing_by_product.get(vals['product_id'])
+            if not lines:
+                commands.append(Command.create(vals))
+                continue
+            line = lines.pop(0)
+            changed = {
+                field: value for field, value in vals.items()
+                if field != 'product_id' and line[field] != value
             }
-            self.env['highfive.booking.line'].create(service_vals)
+            if changed:
+                commands.append(Command.update(line.id, changed))
 
-        _logger.info(f"Updated service lines for booking {booking.id}")
+        for lines in existing_by_product.values():
+            commands += [Command.unlink(line.id) for line in lines]
+        return commands
 
     # =========================================================================
     # HELPERS
@@ -798,16 +1099,27 @@ class BookingService:
 
         return customer
 
-    def _get_service(self, service_id):
-        """Get service product by ID"""
-        service = self.env['product.template'].search([
-            ('highfive_service_id', '=', str(service_id))
-        ], limit=1)
+    def _get_services(self, service_ids):
+        """
+        Get service products by HighFive ID with one search
+
+        Returns:
+            dict: {highfive_service_id: product.template}
+        """
+        service_ids = {str(service_id) for service_id in service_ids}
+        if not service_ids:
+            return {}
 
-        if not service.exists():
-            raise ValidationError(f"Service {service_id} not found")
+        services = self.env['product.template'].search([
+            ('highfive_service_id', 'in', list(service_ids))
+        ])
+        services_by_id = {service.highfive_service_id: service for service in services}
 
-        return service
+        missing = service_ids - set(services_by_id)
+        if missing:
+            raise ValidationError(f"Service {', '.join(sorted(missing))} not found")
+
+        return services_by_id
 
     def _reverse_and_recreate_invoice(self, booking):
         """Reverse invoice and create new one with updated amounts"""
@@ -930,48 +1242,97 @@ class BookingService:
             _logger.error(f"Error registering payment: {e}")
             # Don't raise - payment registration is not critical
 
-    def _create_refund_payment(self, invoice, credit_note):
-        """Create refund payment for cancelled booking"""
-        try:
-            # Get payment journal
-            journal = self.env['account.journal'].search([
-                ('type', 'in', ['bank', 'cash']),
-                ('company_id', '=', invoice.company_id.id)
-            ], limit=1)
-
-            if not journal:
-                _logger.warning("No payment journal found for refund")
-                return None
+    def _create_refund_payments(self, items):
+        """
+        Create, post and reconcile the refund payments of cancelled bookings
+        together
 
-            # Create refund payment
-            refund_vals = {
-                'payment_type': 'outbound',
-                'partner_type': 'customer',
-                'partner_id': invoice.partner_id.id,
-                'amount': credit_note.amount_total,
-                'journal_id': journal.id,
-                'date': fields.Date.today(),
-                'ref': f'Refund: {invoice.name}',
-            }
+        When the batch fails, the refunds are created again one by one, each
+        in its own savepoint, so one failing refund does not drop the others.
 
-            refund = self.env['account.payment'].create(refund_vals)
-            refund.action_post()
+        Args:
+            items: List of (booking, invoice, credit_note) tuples
 
-            # Reconcile with credit note
-            refund_line = refund.line_ids.filtered(
-                lambda l: l.account_id == invoice.partner_id.property_account_receivable_id
-            )
-            credit_line = credit_note.line_ids.filtered(
-                lambda l: l.account_id == invoice.partner_id.property_account_receivable_id
-            )
+        Returns:
+            tuple: ([(invoice, refund payment)], {invoice: error message})
+        """
+        refunds, failures = [], {}
+        if not items:
+            return refunds, failures
+
+        # Get payment journal (one per company)
+        journals = {}
+        to_refund = []
+        for booking, invoice, credit_note in items:
+            company = invoice.company_id
+            if company not in journals:
+                journals[company] = self.env['account.journal'].search([
+                    ('type', 'in', ['bank', 'cash']),
+                    ('company_id', '=', company.id)
+                ], limit=1)
+            if not journals[company]:
+                _logger.warning("No payment journal found for refund")
+                failures[invoice] = f"No payment journal found for {company.name}"
+                continue
+            to_refund.append((booking, invoice, credit_note, journals[company]))
+        if not to_refund:
+            return refunds, failures
 
-            (refund_line + credit_line).reconcile()
+        try:
+            with self.env.cr.savepoint():
+                refunds = self._post_refund_payments(to_refund)
+        except Exception as e:
+            if len(to_refund) == 1:
+                failures[to_refund[0][1]] = str(e)
+            else:
+                _logger.warning(
+                    f"Batch of {len(to_refund)} refund payments failed ({e}), "
+                    "creating them one by one"
+                )
+                for item in to_refund:
+                    try:
+                        with self.env.cr.savepoint():
+                            refunds += self._post_refund_payments([item])
+                    except Exception as e:
+                        failures[item[1]] = str(e)
+
+        for invoice, error in failures.items():
+            _logger.error(f"Error creating refund payment of {invoice.name}: {error}")
+        _logger.info(f"Created {len(refunds)} refund payments")
+        return refunds, failures
+
+    def _post_refund_payments(self, to_refund):
+        """
+        Create, post and reconcile refund payments with their credit notes
 
-            return refund
+        Args:
+            to_refund: List of (booking, invoice, credit_note, journal) tuples
 
-        except Exception as e:
-            _logger.error(f"Error creating refund payment: {e}")
-            return None
+        Returns:
+            list: (invoice, refund payment) tuples
+        """
+        refunds = self.env['account.payment'].create([{
+            'payment_type': 'outbound',
+            'partner_type': 'customer',
+            'partner_id': invoice.partner_id.id,
+            'amount': credit_note.amount_total,
+            'journal_id': journal.id,
+            'date': fields.Date.today(),
+            'memo': f'Refund: {invoice.name}',
+            'highfive_booking_id': booking.id,
+        } for booking, invoice, credit_note, journal in to_refund])
+        refunds.action_post()
+
+        # Reconcile with credit notes (one batched plan)
+        plan = []
+        for refund, (booking, invoice, credit_note, journal) in zip(refunds, to_refund):
+            account = invoice.partner_id.property_account_receivable_id
+            plan.append(
+                refund.move_id.line_ids.filtered(lambda l: l.account_id == account)
+                + credit_note.line_ids.filtered(lambda l: l.account_id == account)
+            )
+        self.env['account.move.line']._reconcile_plan(plan)
+        return [(item[1], refund) for refund, item in zip(refunds, to_refund)]
 
     def _get_currency(self, currency_code):
         """
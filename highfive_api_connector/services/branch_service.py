@@ -10,9 +10,13 @@ class BranchService:
     
     def __init__(self, env):
         self.env = env
+        self._countries = {}
     
     def process(self, data):
-        """Process branch data"""
+        """Process branch data (a single branch or a list of branches)"""
+        if isinstance(data, list):
+            return self.process_batch(data)
+
         # Validate
         self._validate(data)
         
@@ -48,6 +52,87 @@ class BranchService:
                 'model': 'highfive.partner.branch',
             }
     
+    def process_batch(self, items):
+        """
+        Process a list of branches in bulk
+
+        Partners and existing branches are resolved with one search each,
+        the new branches are created with a single create() (which also
+        creates their analytic accounts in one go).
+
+        Args:
+            items: List of branch data from HighFive
+
+        Returns:
+            Result dictionary with counters and per-branch results
+        """
+        if not items:
+            raise ValidationError("Empty branch list")
+
+        for index, data in enumerate(items):
+            if not isinstance(data, dict):
+                raise ValidationError(f"Item {index}: invalid branch data")
+            try:
+                self._validate(data)
+            except ValidationError as e:
+                raise ValidationError(f"Item {index}: {e}")
+
+        # Resolve partners with one search
+        partner_refs = {str(data['partner_id']) for data in items}
+        partners = {
+            partner.highfive_partner_id: partner
+            for partner in self.env['res.partner'].search([
+                ('highfive_partner_id', 'in', list(partner_refs))
+            ])
+        }
+        missing = partner_refs - set(partners)
+        if missing:
+            raise ValidationError(
+                f"Partners with highfive_partner_id={', '.join(sorted(missing))} not found. "
+                f"Please sync the partners first."
+            )
+
+        # Transform (a later duplicate of the same id wins)
+        vals_by_id = {
+            str(data['id']): self._transform(data, partners[str(data['partner_id'])])
+            for data in items
+        }
+
+        # Resolve existing branches with one search
+        Branch = self.env['highfive.partner.branch']
+        existing = {
+            branch.highfive_branch_id: branch
+            for branch in Branch.search([
+                ('highfive_branch_id', 'in', list(vals_by_id))
+            ])
+        }
+
+        # Update
+        for highfive_id, branch in existing.items():
+            branch.write(vals_by_id[highfive_id])
+
+        # Create (bulk)
+        new_ids = [highfive_id for highfive_id in vals_by_id if highfive_id not in existing]
+        created = Branch.create([vals_by_id[highfive_id] for highfive_id in new_ids])
+        branches = {**existing, **dict(zip(new_ids, created))}
+
+        _logger.info(
+            f"Bulk branches: {len(created)} created, {len(existing)} updated"
+        )
+
+        return {
+            'action': 'bulk_synced',
+            'model': 'highfive.partner.branch',
+            'created': len(created),
+            'updated': len(existing),
+            'results': [{
+                'id': highfive_id,
+                'action': 'updated' if highfive_id in existing else 'created',
+                'branch_id': branches[highfive_id].id,
+                'branch_name': branches[highfive_id].name,
+            } for highfive_id in vals_by_id],
+        }
+
     def _validate(self, data):
         """Validate required fields"""
         required_fields = ['id', 'name', 'partner_id']
@@ -87,9 +172,7 @@ class BranchService:
         
         # Location
         if data.get('country'):
-            country = self.env['res.country'].search([
-                ('code', '=', data['country'])
-            ], limit=1)
+            country = self._get_country(data['country'])
             if country:
                 vals['country_id'] = country.id
         
@@ -115,3 +198,11 @@ class BranchService:
             vals['longitude'] = float(data['longitude'])
         
         return vals
+
+    def _get_country(self, code):
+        """Get country by code (cached for bulk processing)"""
+        if code not in self._countries:
+            self._countries[code] = self.env['res.country'].search([
+                ('code', '=', code)
+            ], limit=1)
+        return self._countries[code]
@@ -1,10 +1,27 @@
 # -*- coding: utf-8 -*-
+from odoo import fields
 from odoo.exceptions import ValidationError
+import hashlib
 import json
 import logging
 
 _logger = logging.getLogger(__name__)
 
+# Maximum number of (unit, date) pairs per bulk lookup
+MAX_BULK_READ = 1000
+
+# Fields read to format a commission (one search_read per lookup)
+COMMISSION_READ_FIELDS = [
+    'highfive_commission_id', 'type', 'name', 'status', 'start_date', 'end_date',
+    'commission_online_percent', 'commission_online_fixed',
+    'commission_cash_percent', 'commission_cash_fixed',
+    'commission_walkin_percent', 'commission_walkin_fixed',
+    'commission_linked_percent', 'commission_linked_fixed',
+    'commission_online_event_percent', 'commission_online_event_fixed',
+    'commission_cash_event_percent', 'commission_cash_event_fixed',
+    'write_date',
+]
+
 
 class CommissionService:
     """Commission Management Service"""
@@ -144,10 +161,10 @@ class CommissionService:
         """
         unit = self._get_unit(unit_id)
 
-        commissions = self.env['highfive.unit.commission'].search([
+        commissions = self.env['highfive.unit.commission'].search_read([
             ('unit_id', '=', unit.id),
             ('active', '=', True)
-        ], order='type, start_date desc')
+        ], COMMISSION_READ_FIELDS, order='type, start_date desc')
 
         result = {
             'unit_id': int(unit.highfive_unit_id) if unit.highfive_unit_id else unit.id,
@@ -157,8 +174,8 @@ class CommissionService:
         }
 
         for comm in commissions:
-            comm_data = self._format_commission(comm)
-            if comm.type == 'default':
+            comm_data = self._format_commission_data(comm)
+            if comm['type'] == 'default':
                 result['default_commission'] = comm_data
             else:
                 result['scheduled_commissions'].append(comm_data)
@@ -206,6 +223,107 @@ class CommissionService:
             'active_commission': self._format_commission(commission)
         }
 
+    def get_active_bulk(self, items):
+        """
+        Get the active commission of many (unit, date) pairs at once
+
+        Units, active commissions (see get_active_commissions()) and
+        commission values are each resolved with one query.
+
+        Args:
+            items: List of {'unit_id': HighFive unit ID, 'date': 'YYYY-MM-DD'}
+
+        Returns:
+            dict: {
+                'results': [{'unit_id', 'unit_name', 'date', 'active_commission'}
+                            or {'unit_id', 'date', 'error'}, ...] (request order,
+                            unit_id as received),
+                'last_modified': datetime or None,
+                'etag': str,
+            }
+        """
+        if not items or not isinstance(items, list):
+            raise ValidationError("items must be a non-empty list")
+
+        if len(items) > MAX_BULK_READ:
+            raise ValidationError(f"Too many items: {len(items)} (max {MAX_BULK_READ})")
+
+        pairs = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict) or not item.get('unit_id') or not item.get('date'):
+                raise ValidationError(f"Item {index}: unit_id and date are required")
+            if not isinstance(item['date'], str):
+                raise ValidationError(f"Item {index}: invalid date format. Use YYYY-MM-DD.")
+            try:
+                pairs.append((str(item['unit_id']), fields.Date.to_date(item['date'])))
+            except ValueError as e:
+                raise ValidationError(
+                    f"Item {index}: invalid date format. Use YYYY-MM-DD. Error: {e}"
+                )
+
+        units = {
+            unit['highfive_unit_id']: unit
+            for unit in self.env['product.template'].search_read([
+                ('highfive_unit_id', 'in', list({unit_ref for unit_ref, date in pairs})),
+                ('is_highfive_unit', '=', True)
+            ], ['highfive_unit_id', 'name', 'write_date'])
+        }
+
+        Commission = self.env['highfive.unit.commission']
+        active = Commission.get_active_commissions([
+            (units[unit_ref]['id'], date) for unit_ref, date in pairs if unit_ref in units
+        ])
+        commission_ids = list({commission.id for commission in active.values()})
+        commissions = {
+            commission['id']: commission
+            for commission in Commission.search_read([
+                ('id', 'in', commission_ids)
+            ], COMMISSION_READ_FIELDS)
+        } if commission_ids else {}
+
+        results = []
+        versions = []
+        for (unit_ref, date), item in zip(pairs, items):
+            unit = units.get(unit_ref)
+            if not unit:
+                results.append({
+                    'unit_id': item['unit_id'],
+                    'date': str(date),
+                    'error': f"Unit {unit_ref} not found. Please create the unit first.",
+                })
+                continue
+            versions.append(('product.template', unit['id'], unit['write_date']))
+
+            commission = commissions.get(active.get((unit['id'], date), Commission).id)
+            if not commission:
+                results.append({
+                    'unit_id': item['unit_id'],
+                    'date': str(date),
+                    'error': (
+                        f"No commission configured for unit {unit_ref}. "
+                        "Please create a default commission first."
+                    ),
+                })
+                continue
+            # status is rolled over by SQL without touching write_date
+            versions.append((
+                'highfive.unit.commission', commission['id'],
+                commission['write_date'], commission['status'],
+            ))
+            results.append({
+                'unit_id': item['unit_id'],
+                'unit_name': unit['name'],
+                'date': str(date),
+                'active_commission': self._format_commission_data(commission),
+            })
+
+        payload = json.dumps(sorted(versions, key=str) + [str(pair) for pair in pairs], default=str)
+        return {
+            'results': results,
+            'last_modified': max((version[2] for version in versions), default=None),
+            'etag': hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32],
+        }
+
     # =========================================================================
     # PRIVATE METHODS
     # =========================================================================
@@ -339,43 +457,55 @@ class CommissionService:
         if not commission:
             return None
 
+        return self._format_commission_data(commission.read(COMMISSION_READ_FIELDS)[0])
+
+    def _format_commission_data(self, commission):
+        """
+        Format commission values (COMMISSION_READ_FIELDS) for API response
+
+        Args:
+            commission: dict from read() / search_read()
+
+        Returns:
+            dict: Formatted commission data
+        """
         result = {
-            'id': commission.id,
-            'highfive_id': commission.highfive_commission_id,
-            'type': commission.type,
-            'name': commission.name,
-            'status': commission.status,
+            'id': commission['id'],
+            'highfive_id': commission['highfive_commission_id'],
+            'type': commission['type'],
+            'name': commission['name'],
+            'status': commission['status'],
 
             # 6 Booking Types
             'online_booking': {
-                'percent': commission.commission_online_percent,
-                'fixed': commission.commission_online_fixed
+                'percent': commission['commission_online_percent'],
+                'fixed': commission['commission_online_fixed']
             },
             'cash_booking': {
-                'percent': commission.commission_cash_percent,
-                'fixed': commission.commission_cash_fixed
+                'percent': commission['commission_cash_percent'],
+                'fixed': commission['commission_cash_fixed']
             },
             'walk_in_booking': {
-                'percent': commission.commission_walkin_percent,
-                'fixed': commission.commission_walkin_fixed
+                'percent': commission['commission_walkin_percent'],
+                'fixed': commission['commission_walkin_fixed']
             },
             'linked_booking': {
-                'percent': commission.commission_linked_percent,
-                'fixed': commission.commission_linked_fixed
+                'percent': commission['commission_linked_percent'],
+                'fixed': commission['commission_linked_fixed']
             },
             'online_public_event': {
-                'percent': commission.commission_online_event_percent,
-                'fixed': commission.commission_online_event_fixed
+                'percent': commission['commission_online_event_percent'],
+                'fixed': commission['commission_online_event_fixed']
             },
             'cash_public_event': {
-                'percent': commission.commission_cash_event_percent,
-                'fixed': commission.commission_cash_event_fixed
+                'percent': commission['commission_cash_event_percent'],
+                'fixed': commission['commission_cash_event_fixed']
             }
         }
 
         # Add dates for scheduled
-        if commission.type == 'scheduled':
-            result['start_date'] = commission.start_date.strftime('%Y-%m-%d') if commission.start_date else None
-            result['end_date'] = commission.end_date.strftime('%Y-%m-%d') if commission.end_date else None
+        if commission['type'] == 'scheduled':
+            result['start_date'] = commission['start_date'].strftime('%Y-%m-%d') if commission['start_date'] else None
+            result['end_date'] = commission['end_date'].strftime('%Y-%m-%d') if commission['end_date'] else None
 
-        return result
\ No newline at end of file
+        return result
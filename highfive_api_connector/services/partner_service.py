@@ -10,17 +10,21 @@ class PartnerService:
 
     def __init__(self, env):
         self.env = env
+        self._countries = {}
 
     def process(self, data):
         """
         Process partner data
 
         Args:
-            data: Partner data from HighFive
+            data: Partner data from HighFive, or a list of them
 
         Returns:
             Result dictionary with action and record info
         """
+        if isinstance(data, list):
+            return self.process_batch(data)
+
         # Validate
         self._validate(data)
 
@@ -53,6 +57,69 @@ class PartnerService:
                 'model': 'res.partner',
             }
 
+    def process_batch(self, items):
+        """
+        Process a list of partners in bulk
+
+        Existing partners are resolved with one search and updated, the new
+        ones are created with a single create() (which also creates their
+        supplier analytic accounts in one go).
+
+        Args:
+            items: List of partner data from HighFive
+
+        Returns:
+            Result dictionary with counters and per-partner results
+        """
+        if not items:
+            raise ValidationError("Empty partner list")
+
+        # Validate & Transform (a later duplicate of the same id wins)
+        vals_by_id = {}
+        for index, data in enumerate(items):
+            if not isinstance(data, dict):
+                raise ValidationError(f"Item {index}: invalid partner data")
+            try:
+                self._validate(data)
+            except ValidationError as e:
+                raise ValidationError(f"Item {index}: {e}")
+            vals_by_id[str(data['id'])] = self._transform(data)
+
+        # Resolve existing partners with one search
+        Partner = self.env['res.partner']
+        existing = {
+            partner.highfive_partner_id: partner
+            for partner in Partner.search([
+                ('highfive_partner_id', 'in', list(vals_by_id))
+            ])
+        }
+
+        # Update
+        for highfive_id, partner in existing.items():
+            partner.write(vals_by_id[highfive_id])
+
+        # Create (bulk)
+        new_ids = [highfive_id for highfive_id in vals_by_id if highfive_id not in existing]
+        created = Partner.create([vals_by_id[highfive_id] for highfive_id in new_ids])
+        partners = {**existing, **dict(zip(new_ids, created))}
+
+        _logger.info(
+            f"Bulk partners: {len(created)} created, {len(existing)} updated"
+        )
+
+        return {
+            'action': 'bulk_synced',
+            'model': 'res.partner',
+            'created': len(created),
+            'updated': len(existing),
+            'results': [{
+                'id': highfive_id,
+                'action': 'updated' if highfive_id in existing else 'created',
+                'partner_id': partners[highfive_id].id,
+                'partner_name': partners[highfive_id].name,
+            } for highfive_id in vals_by_id],
+        }
+
     def _validate(self, data):
         """Validate required fields"""
         required_fields = ['id', 'name']
@@ -93,9 +160,7 @@ class PartnerService:
 
         # Country
         if data.get('country'):
-            country = self.env['res.country'].search([
-                ('code', '=', data['country'])
-            ], limit=1)
+            country = self._get_country(data['country'])
             if country:
                 vals['country_id'] = country.id
 
@@ -125,4 +190,12 @@ class PartnerService:
             vals['commission_rate_cash'] = float(data['commission_rate_cash'])
             _logger.info(f"Partner commission_rate_cash set to: {vals['commission_rate_cash']}%")
 
-        return vals
\ No newline at end of file
+        return vals
+
+    def _get_country(self, code):
+        """Get country by code (cached for bulk processing)"""
+        if code not in self._countries:
+            self._countries[code] = self.env['res.country'].search([
+                ('code', '=', code)
+            ], limit=1)
+        return self._countries[code]
@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+from contextlib import contextmanager
+from datetime import date, timedelta
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.addons.highfive_api_connector.services.branch_service import BranchService
+from odoo.addons.highfive_api_connector.services.commission_service import CommissionService
+from odoo.addons.highfive_api_connector.services.customer_service import CustomerService
+from odoo.addons.highfive_api_connector.services.partner_service import PartnerService
+from odoo.addons.highfive_api_connector.services.service_service import ServiceService
+from odoo.addons.highfive_api_connector.services.unit_service import UnitService
+
+_logger = logging.getLogger(__name__)
+
+# Stored query-count baselines, see README.md (Benchmarks)
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), 'benchmark_baselines.json')
+
+# Set to 1 to record the measured query counts as the new baselines, written
+# to the output file (never into the source tree), to be reviewed and copied
+# over benchmark_baselines.json
+UPDATE_BASELINES_ENV = 'HIGHFIVE_BENCHMARK_UPDATE'
+BASELINES_OUTPUT_ENV = 'HIGHFIVE_BENCHMARK_OUTPUT'
+DEFAULT_BASELINES_OUTPUT_PATH = os.path.join(
+    tempfile.gettempdir(), 'highfive_benchmark_baselines.json')
+
+# Number of bookings generated per scenario
+BOOKING_COUNT_ENV = 'HIGHFIVE_BENCHMARK_BOOKINGS'
+DEFAULT_BOOKING_COUNT = 20
+
+
+class HighFivePlatformStub:
+    """
+    Local stand-in for the HighFive platform
+
+    Generates the webhook payloads the platform sends (partners, customers,
+    branches, units, commissions, services and bookings), with the same
+    shapes as documented in README.md. A fixed seed keeps every run
+    identical so query counts can be compared between runs.
+    """
+
+    BOOKING_TYPES = ['online_booking', 'cash_booking']
+    ACTIVITY_TYPES = ['football', 'padel', 'tennis', 'basketball']
+    CITIES = ['Riyadh', 'Jeddah', 'Dammam', 'Mecca', 'Medina']
+
+    def __init__(self, seed=42, currency='SAR'):
+        self.random = random.Random(seed)
+        self.currency = currency
+        self._sequence = 0
+
+    def _next_id(self):
+        self._sequence += 1
+        return 900000 + self._sequence
+
+    # =========================================================================
+    # MASTER DATA
+    # =========================================================================
+
+    def partner(self):
+        partner_id = self._next_id()
+        return {
+            'id': partner_id,
+            'name': f'Benchmark Partner {partner_id}',
+            'company_name': f'Benchmark Sports {partner_id} LLC',
+            'email': f'partner{partner_id}@example.com',
+            'phone': f'+96650{partner_id:07d}',
+            'city': self.random.choice(self.CITIES),
+            'country': 'SA',
+            'tax': '15',
+            'accept_tax': True,
+            'commission_rate_online': 12,
+            'commission_rate_cash': 10,
+        }
+
+    def customer(self):
+        customer_id = self._next_id()
+        return {
+            'id': customer_id,
+            'name': f'Benchmark Customer {customer_id}',
+            'email': f'customer{customer_id}@example.com',
+            'phone': f'+96655{customer_id:07d}',
+            'city': self.random.choice(self.CITIES),
+            'country': 'SA',
+        }
+
+    def branch(self, partner):
+        branch_id = self._next_id()
+        return {
+            'id': branch_id,
+            'name': f'{partner["name"]} - Branch {branch_id}',
+            'code': f'BR{branch_id}',
+            'partner_id': partner['id'],
+            'city': partner['city'],
+            'country': 'SA',
+            'latitude': round(self.random.uniform(21.0, 26.5), 6),
+            'longitude': round(self.random.uniform(39.0, 50.0), 6),
+        }
+
+    def unit(self, branch):
+        unit_id = self._next_id()
+        return {
+            'id': unit_id,
+            'name': f'Unit {unit_id}',
+            'partner_branch_id': branch['id'],
+            'base_price': self.random.choice([150, 200, 250, 300]),
+            'activity_type': self.random.choice(self.ACTIVITY_TYPES),
+        }
+
+    def commission(self, unit):
+        return {
+            'id': self._next_id(),
+            'unit_id': unit['id'],
+            'type': 'default',
+            'name': f'Default - {unit["name"]}',
+            'online_booking': {'percent': 10, 'fixed': 5},
+            'cash_booking': {'percent': 8, 'fixed': 3},
+            'walk_in_booking': {'percent': 8, 'fixed': 0},
+            'linked_booking': {'percent': 6, 'fixed': 5},
+            'online_public_event': {'percent': 10, 'fixed': 10},
+            'cash_public_event': {'percent': 8, 'fixed': 5},
+        }
+
+    def service(self):
+        service_id = self._next_id()
+        return {
+            'id': service_id,
+            'name': f'Service {service_id}',
+            'price': self.random.choice([10, 20, 35, 50]),
+            'category': 'HighFive Services',
+        }
+
+    # =========================================================================
+    # BOOKINGS
+    # =========================================================================
+
+    def booking(self, unit, commission, customer, services, status='confirmed',
+                booking_type=None):
+        """Booking payload of the bookings webhook, with its services"""
+        booking_id = self._next_id()
+        booking_type = booking_type or self.random.choice(self.BOOKING_TYPES)
+        payment_method = 'online' if booking_type == 'online_booking' else 'cash'
+        start = float(self.random.randint(8, 22))
+        base_price = float(unit['base_price'])
+        booked_services = [{
+            'service_id': service['id'],
+            'name': service['name'],
+            'quantity': self.random.randint(1, 3),
+            'price_unit': float(service['price']),
+        } for service in self.random.sample(services, self.random.randint(0, len(services)))]
+        total = base_price + sum(s['quantity'] * s['price_unit'] for s in booked_services)
+
+        data = {
+            'id': booking_id,
+            'highfive_booking_id': booking_id,
+            'booking_date': str(date.today() + timedelta(days=self.random.randint(0, 30))),
+            'session_start_time': start,
+            'session_end_time': start + 1,
+            'unit_id': unit['id'],
+            'booker_id': customer['id'],
+            'session_base_price': base_price,
+            'discount': 0,
+            'tax_percent': 15,
+            'tax_status': 'included',
+            'total': total,
+            'currency': self.currency,
+            'payment_method': payment_method,
+            'booking_type': booking_type,
+            'commission_id': commission['id'],
+            'status': status,
+            'services': booked_services,
+        }
+        if payment_method == 'online':
+            data.update({
+                'payment_card': total,
+                'payment_wallet': 0,
+                'payment_coupon': 0,
+                'payment_transaction_ref': f'TXN-{booking_id}',
+            })
+        return data
+
+    def payment(self, booking):
+        """Payload of the payment update webhook"""
+        return {
+            'booking_id': booking['id'],
+            'payment_status': 'paid',
+            'payment_date': str(date.today()),
+            'transaction_ref': f'PAY-{booking["id"]}',
+            'payment_method_details': {
+                'card': booking['total'],
+                'wallet': 0,
+                'coupon': 0,
+            },
+        }
+
+
+class HighFiveBenchmarkCase(AccountTestInvoicingCommon):
+    """
+    Base class of the ingestion benchmarks
+
+    Pushes realistic master data through the API services (as the platform
+    would) and offers measure() / assertQueriesWithinBaseline() to track
+    queries, wall time and memory of each scenario.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.booking_count = int(os.environ.get(BOOKING_COUNT_ENV, DEFAULT_BOOKING_COUNT))
+        cls.platform = HighFivePlatformStub(currency=cls.env.company.currency_id.name)
+
+        # Taxes used by the invoices of the bookings (prices include tax)
+        cls.env['account.tax'].create([{
+            'name': f'HighFive 15% {tax_type}',
+            'type_tax_use': tax_type,
+            'amount_type': 'percent',
+            'amount': 15,
+            'price_include_override': 'tax_included',
+            'company_id': cls.env.company.id,
+        } for tax_type in ('sale', 'purchase')])
+
+        # Master data, ingested through the services
+        cls.partners = [cls.platform.partner() for i in range(3)]
+        PartnerService(cls.env).process_batch(cls.partners)
+        cls.branches = [cls.platform.branch(partner) for partner in cls.partners]
+        BranchService(cls.env).process_batch(cls.branches)
+        cls.customers = [cls.platform.customer() for i in range(5)]
+        cls.units = []
+        cls.commissions = []
+        cls.services = []
+        for customer in cls.customers:
+            CustomerService(cls.env).process(customer)
+        for partner, branch in zip(cls.partners, cls.branches):
+            for i in range(2):
+                unit = cls.platform.unit(branch)
+                UnitService(cls.env).process(unit)
+                commission = cls.platform.commission(unit)
+                CommissionService(cls.env).process(commission)
+                cls.units.append(unit)
+                cls.commissions.append(commission)
+            for i in range(2):
+                service = cls.platform.service()
+                ServiceService(cls.env).process(service)
+                cls.services.append(service)
+
+        cls.baselines = cls._load_baselines()
+        cls.measures = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.environ.get(UPDATE_BASELINES_ENV) and cls.measures:
+            output_path = os.environ.get(BASELINES_OUTPUT_ENV) or DEFAULT_BASELINES_OUTPUT_PATH
+            # Keep the scenarios recorded by the other benchmark classes
+            baselines = cls._load_baselines(
+                output_path if os.path.exists(output_path) else BASELINES_PATH)
+            baselines['scenarios'].update({
+                name: measure['queries_per_request']
+                for name, measure in cls.measures.items()
+            })
+            with open(output_path, 'w') as baselines_file:
+                json.dump(baselines, baselines_file, indent=4, sort_keys=True)
+                baselines_file.write('\n')
+            _logger.info(
+                f"Recorded {len(cls.measures)} benchmark baseline(s) in {output_path}, "
+                f"copy it over {BASELINES_PATH} to use them"
+            )
+        super().tearDownClass()
+
+    @classmethod
+    def _load_baselines(cls, path=BASELINES_PATH):
+        with open(path) as baselines_file:
+            baselines = json.load(baselines_file)
+        baselines.setdefault('tolerance', 0.0)
+        baselines.setdefault('scenarios', {})
+        return baselines
+
+    # =========================================================================
+    # HELPERS
+    # =========================================================================
+
+    def generate_bookings(self, count=None, status='confirmed', booking_type=None):
+        """Booking payloads spread over the generated units and customers"""
+        bookings = []
+        for i in range(count or self.booking_count):
+            unit_index = i % len(self.units)
+            bookings.append(self.platform.booking(
+                self.units[unit_index],
+                self.commissions[unit_index],
+                self.customers[i % len(self.customers)],
+                self.services,
+                status=status,
+                booking_type=booking_type,
+            ))
+        return bookings
+
+    @contextmanager
+    def measure(self, name, requests):
+        """
+        Measure the queries, wall time and peak memory of the block
+
+        Caches are flushed and invalidated first so every scenario starts
+        cold, like a webhook request in a fresh worker.
+
+        Args:
+            name: Scenario name (key of the baselines file)
+            requests: Number of requests processed in the block
+        """
+        self.env.flush_all()
+        self.env.invalidate_all()
+        tracemalloc.start()
+        try:
+            queries_before = self.env.cr.sql_log_count
+            start = time.perf_counter()
+
+            yield
+
+            self.env.flush_all()
+            elapsed = time.perf_counter() - start
+            queries = self.env.cr.sql_log_count - queries_before
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        measure = {
+            'requests': requests,
+            'queries': queries,
+            'queries_per_request': round(queries / requests, 2),
+            'wall_time_ms': round(elapsed * 1000, 2),
+            'wall_time_per_request_ms': round(elapsed * 1000 / requests, 2),
+            'peak_memory_kb': round(peak_memory / 1024, 2),
+        }
+        self.measures[name] = measure
+        _logger.info(f"Benchmark {name}: {json.dumps(measure, sort_keys=True)}")
+
+    def assertQueriesWithinBaseline(self, name):
+        """
+        Fail when the queries per request of the scenario exceed its baseline
+
+        A scenario without stored baseline fails, unless the baselines are
+        being recorded.
+        """
+        measure = self.measures[name]
+        if os.environ.get(UPDATE_BASELINES_ENV):
+            return
+        baseline = self.baselines['scenarios'].get(name)
+        if baseline is None:
+            self.fail(
+                f"Benchmark {name}: no baseline stored ({measure['queries_per_request']} "
+                f"queries per request measured), run with {UPDATE_BASELINES_ENV}=1 "
+                "to record one"
+            )
+        limit = baseline * (1 + self.baselines['tolerance'])
+        self.assertLessEqual(
+            measure['queries_per_request'], limit,
+            f"Benchmark {name}: {measure['queries_per_request']} queries per request, "
+            f"baseline is {baseline} (+{self.baselines['tolerance']:.0%})"
+        )
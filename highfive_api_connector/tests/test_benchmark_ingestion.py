@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+from odoo.tests.common import tagged
+
+from odoo.addons.highfive_api_connector.services.booking_service import BookingService
+from .common import HighFiveBenchmarkCase
+
+
+@tagged('post_install', '-at_install', '-standard', 'highfive_benchmark')
+class TestBenchmarkIngestion(HighFiveBenchmarkCase):
+    """
+    Ingestion benchmarks of the bookings webhook
+
+    Each scenario processes booking_count requests and fails when its
+    queries per request exceed the stored baseline (+ tolerance), or when
+    no baseline is stored. Not part of the standard test run, run with:
+    --test-tags highfive_benchmark
+    """
+
+    def _create_bookings(self, status='confirmed', booking_type=None):
+        """Ingest bookings outside of any measure, return their payloads"""
+        payloads = self.generate_bookings(status=status, booking_type=booking_type)
+        service = BookingService(self.env)
+        for data in payloads:
+            service.process(data)
+        return payloads
+
+    def _get_bookings(self, payloads):
+        return self.env['highfive.booking'].search([
+            ('highfive_booking_id', 'in', [str(data['id']) for data in payloads])
+        ])
+
+    def test_booking_process_create(self):
+        payloads = self.generate_bookings()
+        service = BookingService(self.env)
+
+        with self.measure('booking_process_create', len(payloads)):
+            results = [service.process(data) for data in payloads]
+
+        self.assertTrue(all(result['action'] == 'created' for result in results))
+        self.assertTrue(all(result['state'] == 'confirmed' for result in results))
+        self.assertQueriesWithinBaseline('booking_process_create')
+
+    def test_booking_process_update(self):
+        payloads = self._create_bookings(status='pending')
+        for data in payloads:
+            data['notes'] = f'Updated booking {data["id"]}'
+        service = BookingService(self.env)
+
+        with self.measure('booking_process_update', len(payloads)):
+            results = [service.process(data) for data in payloads]
+
+        self.assertTrue(all(result['action'] == 'updated' for result in results))
+        self.assertQueriesWithinBaseline('booking_process_update')
+
+    def test_update_payment(self):
+        payloads = self._create_bookings(booking_type='cash_booking')
+        service = BookingService(self.env)
+
+        with self.measure('update_payment', len(payloads)):
+            results = [
+                service.update_payment(data['id'], self.platform.payment(data))
+                for data in payloads
+            ]
+
+        self.assertTrue(all(result['action'] == 'payment_updated' for result in results))
+        self.assertQueriesWithinBaseline('update_payment')
+
+    def test_refund_booking(self):
+        payloads = self._create_bookings()
+        service = BookingService(self.env)
+
+        with self.measure('refund_booking', len(payloads)):
+            for data in payloads:
+                service.refund_booking(data['id'], reason='Benchmark refund')
+
+        self.assertEqual(set(self._get_bookings(payloads).mapped('state')), {'cancelled'})
+        self.assertQueriesWithinBaseline('refund_booking')
+
+    def test_cancel_booking(self):
+        payloads = self._create_bookings()
+        service = BookingService(self.env)
+
+        with self.measure('cancel_booking', len(payloads)):
+            for data in payloads:
+                service.cancel_booking(data['id'], reason='Benchmark cancel')
+
+        self.assertEqual(set(self._get_bookings(payloads).mapped('state')), {'cancelled'})
+        self.assertQueriesWithinBaseline('cancel_booking')
+
+    def test_action_confirm_bulk(self):
+        payloads = self._create_bookings(status='pending')
+        bookings = self._get_bookings(payloads)
+        self.assertEqual(set(bookings.mapped('state')), {'draft'})
+
+        with self.measure('action_confirm_bulk', len(bookings)):
+            bookings.action_confirm()
+
+        self.assertEqual(set(bookings.mapped('state')), {'confirmed'})
+        self.assertTrue(all(bookings.mapped('sales_invoice_id')))
+        self.assertQueriesWithinBaseline('action_confirm_bulk')
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+import json
+
+from odoo import fields
+from odoo.tests.common import HttpCase, tagged
+
+from .common import HighFivePlatformStub
+
+
+@tagged('post_install', '-at_install')
+class TestWebhookBatch(HttpCase):
+    """Bulk partner and branch webhooks, through the JSON-RPC routes"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.platform = HighFivePlatformStub()
+        cls.api_key = cls.env['res.users.apikeys'].with_user(
+            cls.env.ref('base.user_admin')
+        )._generate('rpc', 'HighFive webhook test', fields.Datetime.now() + timedelta(days=1))
+
+    def _post(self, url, body):
+        response = self.url_open(url, data=json.dumps(body), headers={
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {self.api_key}',
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.json()['result']
+
+    def test_bulk_partners_and_branches(self):
+        partners = [self.platform.partner() for i in range(3)]
+        result = self._post('/api/odoo/partners', {'items': partners})
+        self.assertTrue(result['success'], result.get('error'))
+        self.assertEqual(result['data']['action'], 'bulk_synced')
+        self.assertEqual(result['data']['created'], 3)
+
+        branches = [self.platform.branch(partner) for partner in partners]
+        result = self._post('/api/odoo/branches', {'items': branches})
+        self.assertTrue(result['success'], result.get('error'))
+        self.assertEqual(result['data']['action'], 'bulk_synced')
+        self.assertEqual(len(result['data']['results']), 3)
+
+        # Sending the same partners again updates them
+        result = self._post('/api/odoo/partners', {'items': partners})
+        self.assertEqual(result['data']['updated'], 3)
+
+    def test_empty_bulk(self):
+        result = self._post('/api/odoo/partners', {'items': []})
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error_type'], 'validation_error')
+
+    def test_single_partner(self):
+        partner = self.platform.partner()
+        result = self._post('/api/odoo/partners', partner)
+        self.assertTrue(result['success'], result.get('error'))
+        self.assertEqual(result['data']['partner_id'], self.env['res.partner'].search([
+            ('highfive_partner_id', '=', str(partner['id']))
+        ]).id)
@@ -31,6 +31,7 @@
     'data': [
         'security/ir.model.access.csv',
         'data/booking_sequences.xml',
+        'data/ir_cron_data.xml',
         'views/highfive_booking_views.xml',
         'views/res_partner_views.xml',
         'views/highfive_branch_views.xml',
@@ -38,6 +39,9 @@
         'views/booking_line_views.xml',  # أضف
         'views/unit_commission_views.xml',
         'views/account_move_views.xml',
+        'views/payment_settlement_views.xml',
+        'wizard/commission_recompute_wizard_views.xml',
+        'wizard/settlement_import_wizard_views.xml',
         'views/menus.xml',
     ],
     'installable': True,
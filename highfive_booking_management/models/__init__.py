@@ -6,4 +6,5 @@ from . import highfive_branch
 from . import account_payment
 from . import account_move
 from . import product_template
-from . import booking_line
\ No newline at end of file
+from . import booking_line
+from . import payment_settlement
@@ -33,6 +33,13 @@ class AccountPayment(models.Model):
         currency_field='currency_id'
     )
 
+    highfive_settlement_id = fields.Many2one(
+        'highfive.payment.settlement',
+        'HighFive Settlement',
+        index=True,
+        help='Gateway settlement this payment belongs to'
+    )
+
     # Transaction Reference
     transaction_reference = fields.Char(
         'Transaction Reference'
@@ -1,10 +1,21 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError, UserError
+from odoo.tools import float_compare, split_every
+from collections import defaultdict
 import logging
 from datetime import datetime, timedelta
 _logger = logging.getLogger(__name__)
 
+COMMISSION_AMOUNT_FIELDS = (
+    'commission_percent',
+    'commission_fixed',
+    'commission_amount_net',
+    'commission_amount_tax',
+    'commission_amount_total',
+)
+COMMISSION_UPDATE_BATCH_SIZE = 1000
+
 
 class HighFiveBooking(models.Model):
     _name = 'highfive.booking'
@@ -281,6 +292,13 @@ class HighFiveBooking(models.Model):
         readonly=True
     )
     
+    settlement_line_ids = fields.One2many(
+        'highfive.payment.settlement.line',
+        'booking_id',
+        string='Settlement Lines',
+        readonly=True
+    )
+
     payment_count = fields.Integer(
         'Payments Count',
         compute='_compute_payment_count',
@@ -480,57 +498,134 @@ class HighFiveBooking(models.Model):
         1. Use commission_id (sent from API)
         2. Get percent + fixed for booking_type
         3. Calculate commission amount
+
+        Values are computed per (commission, booking_type, tax_percent)
+        group, see _get_commission_values_by_booking().
+        """
+        values_by_booking = self._get_commission_values_by_booking()
+        for booking in self:
+            booking.update(values_by_booking[booking.id])
+
+    def _get_commission_values_by_booking(self):
+        """
+        Compute commission values for the whole recordset
+
+        Bookings are grouped by (commission, booking_type, tax_percent) so
+        the rule rates and tax rate are resolved once per group.
+
+        Returns:
+            dict: {booking_id: {commission field: value}}
         """
+        groups = defaultdict(list)
         for booking in self:
+            groups[(booking.commission_id, booking.booking_type, booking.tax_percent)].append(booking)
+
+        result = {}
+        for (commission, booking_type, tax_percent), bookings in groups.items():
             # Reset if no commission
-            if not booking.commission_id or not booking.booking_type:
-                booking._reset_commission()
+            if not commission or not booking_type:
+                for booking in bookings:
+                    result[booking.id] = dict.fromkeys(COMMISSION_AMOUNT_FIELDS, 0.0)
                 continue
 
-            # ================================================================
-            # Get Commission Values (percent + fixed)
-            # ================================================================
-            commission = booking.commission_id
-            percent, fixed = commission.get_commission_values(booking.booking_type)
-
-            booking.commission_percent = percent
-            booking.commission_fixed = fixed
+            percent, fixed = commission.get_commission_values(booking_type)
 
-            # ================================================================
-            # Calculate Commission Amount
-            # ================================================================
             # All prices are tax-included
-            tax_rate = booking.tax_percent / 100.0
+            tax_rate = tax_percent / 100.0
+
+            for booking in bookings:
+                # Get net amount (before tax)
+                # Subtotal already includes tax
+                total_net = booking.subtotal / (1 + tax_rate)
+
+                # Commission = (Net × Percent%) + Fixed
+                commission_net = (total_net * (percent / 100.0)) + fixed
+
+                # Tax on commission
+                commission_tax = commission_net * tax_rate
+                commission_total = commission_net + commission_tax
+
+                result[booking.id] = {
+                    'commission_percent': percent,
+                    'commission_fixed': fixed,
+                    'commission_amount_net': round(commission_net, 2),
+                    'commission_amount_tax': round(commission_tax, 2),
+                    'commission_amount_total': round(commission_total, 2),
+                }
 
-            # Get net amount (before tax)
-            # Subtotal already includes tax
-            total_net = booking.subtotal / (1 + tax_rate)
+            _logger.debug(
+                "Commission computed for %s bookings: Rule=%s, Type=%s, Rate=%s%% + %s",
+                len(bookings), commission.name, booking_type, percent, fixed,
+            )
 
-            # Commission = (Net × Percent%) + Fixed
-            commission_net = (total_net * (percent / 100.0)) + fixed
+        return result
 
-            # Tax on commission
-            commission_tax = commission_net * tax_rate
-            commission_total = commission_net + commission_tax
+    def _recompute_commission_bulk(self, dry_run=False):
+        """
+        Recompute stored commission amounts for many bookings at once
 
-            booking.commission_amount_net = round(commission_net, 2)
-            booking.commission_amount_tax = round(commission_tax, 2)
-            booking.commission_amount_total = round(commission_total, 2)
+        Values are computed by group (see _get_commission_values_by_booking)
+        and only changed rows are written back, with batched SQL updates.
 
-            _logger.info(
-                f"Commission for booking {booking.name}: "
-                f"Rule={commission.name}, Type={booking.booking_type}, "
-                f"Formula=({percent}% × {total_net:.2f}) + {fixed} = {commission_net:.2f}, "
-                f"Total={commission_total:.2f}"
-            )
+        Args:
+            dry_run (bool): Only report the deltas, don't write anything
+
+        Returns:
+            dict: {
+                'booking_count': int,
+                'changed_count': int,
+                'total_before': float,
+                'total_after': float,
+                'changes': [(booking_id, total_before, total_after), ...]
+            }
+        """
+        self.flush_recordset()
+        values_by_booking = self._get_commission_values_by_booking()
+
+        changes = []
+        rows = []
+        total_before = total_after = 0.0
+        for booking in self:
+            vals = values_by_booking[booking.id]
+            before = booking.commission_amount_total
+            total_before += before
+            total_after += vals['commission_amount_total']
+            if any(
+                float_compare(booking[field], vals[field], precision_digits=6)
+                for field in COMMISSION_AMOUNT_FIELDS
+            ):
+                changes.append((booking.id, before, vals['commission_amount_total']))
+                rows.append((booking.id, *(vals[field] for field in COMMISSION_AMOUNT_FIELDS)))
+
+        if rows and not dry_run:
+            for batch in split_every(COMMISSION_UPDATE_BATCH_SIZE, rows):
+                self.env.cr.execute(f"""
+                    UPDATE highfive_booking AS b
+                       SET commission_percent = v.percent,
+                           commission_fixed = v.fixed,
+                           commission_amount_net = v.amount_net,
+                           commission_amount_tax = v.amount_tax,
+                           commission_amount_total = v.amount_total
+                      FROM (VALUES {', '.join(['%s'] * len(batch))})
+                           AS v(id, percent, fixed, amount_net, amount_tax, amount_total)
+                     WHERE b.id = v.id
+                """, batch)
+            self.invalidate_recordset(list(COMMISSION_AMOUNT_FIELDS))
+
+        _logger.info(
+            "Commission recompute%s: %s bookings, %s changed, total %.2f → %.2f",
+            " (dry run)" if dry_run else "", len(self), len(changes),
+            total_before, total_after,
+        )
+
+        return {
+            'booking_count': len(self),
+            'changed_count': len(changes),
+            'total_before': round(total_before, 2),
+            'total_after': round(total_after, 2),
+            'changes': changes,
+        }
 
-    def _reset_commission(self):
-        """Reset all commission fields"""
-        self.commission_percent = 0.0
-        self.commission_fixed = 0.0
-        self.commission_amount_net = 0.0
-        self.commission_amount_tax = 0.0
-        self.commission_amount_total = 0.0
     # =========================================================================
     # CONSTRAINTS
     # =========================================================================
@@ -707,13 +802,18 @@ class HighFiveBooking(models.Model):
             if len(unit_lines) > 1:
                 raise ValidationError("Booking can have only one Unit!")
 
-    @api.depends('payment_ids.amount', 'payment_ids.state', 'total','state')
+    @api.depends('payment_ids.amount', 'payment_ids.state', 'total','state',
+                 'settlement_line_ids.amount', 'settlement_line_ids.state')
     def _compute_payment_status(self):
         """Calculate payment status"""
         for record in self:
             # paid_payments = record.payment_ids.filtered(lambda p: p.state == 'posted')
             paid_payments = record.payment_ids
-            record.paid_amount = sum(paid_payments.mapped('amount'))
+            # Amounts paid through grouped gateway settlements
+            settled_lines = record.settlement_line_ids.filtered(
+                lambda l: l.state in ('reconciled', 'partial')
+            )
+            record.paid_amount = sum(paid_payments.mapped('amount')) + sum(settled_lines.mapped('amount'))
 
             if record.paid_amount == 0:
                 record.payment_state = 'not_paid'
@@ -791,18 +891,17 @@ class HighFiveBooking(models.Model):
     # =========================================================================
     
     def action_confirm(self):
-        """Confirm booking and create invoices"""
-        for record in self:
-            if record.state != 'draft':
-                raise UserError("Only draft bookings can be confirmed!")
-            
-            # Create invoices
-            record._create_invoices()
-            
-            # Update state
-            record.state = 'confirmed'
-            
-            _logger.info(f"Booking {record.name} confirmed and invoices created")
+        """Confirm bookings and create their invoices (batched)"""
+        if any(record.state != 'draft' for record in self):
+            raise UserError("Only draft bookings can be confirmed!")
+
+        # Create invoices
+        self._create_invoices()
+
+        # Update state
+        self.write({'state': 'confirmed'})
+
+        _logger.info(f"{len(self)} booking(s) confirmed and invoices created")
     
     def action_set_in_progress(self):
         """Mark booking as in progress"""
@@ -855,101 +954,169 @@ class HighFiveBooking(models.Model):
 
     def _create_invoices(self):
         """
-        Create invoices based on payment method
+        Create invoices based on payment method, for all bookings at once
 
         Logic:
         - payment_method = 'online': Sales Invoice (3 lines) + Vendor Bill (2 lines)
         - payment_method = 'cash': Sales Invoice (1 line: commission)
 
         All prices include tax (price_include_override = 'tax_included')
+
+        Taxes, the commission product and the bank journals are resolved
+        once for the recordset, all moves are created with one create()
+        and posted together, then online payments are registered in batch.
         """
-        self.ensure_one()
+        for record in self:
+            if not record.analytic_account_id:
+                raise UserError("No analytic account found for this branch!")
 
-        if not self.analytic_account_id:
-            raise UserError("No analytic account found for this branch!")
+            if record.commission_amount_total <= 0:
+                raise UserError("Commission calculation failed!")
 
-        # Get commission
-        commission_net = self.commission_amount_net
-        commission_total = self.commission_amount_total
+            if record.payment_method not in ('online', 'cash'):
+                raise ValidationError(f"Unknown payment method: {record.payment_method}")
 
-        if commission_total <= 0:
-            raise UserError("Commission calculation failed!")
+        if not self:
+            return
+
+        invoice_data = self._prepare_invoice_data()
+        online_bookings = self.filtered(lambda b: b.payment_method == 'online')
 
         # Route based on payment_method
-        if self.payment_method == 'online':
-            self._create_online_invoices(commission_net, commission_total)
-        elif self.payment_method == 'cash':
-            self._create_cash_invoice(commission_total)
-        else:
-            raise ValidationError(f"Unknown payment method: {self.payment_method}")
+        invoice_vals_list = []
+        for record in self:
+            if record.payment_method == 'online':
+                invoice_vals_list.append(record._prepare_online_invoice_vals(invoice_data))
+            else:
+                invoice_vals_list.append(record._prepare_cash_invoice_vals(invoice_data))
+        bill_vals_list = [
+            record._prepare_online_bill_vals(invoice_data)
+            for record in online_bookings
+        ]
+
+        moves = self.env['account.move'].create(invoice_vals_list + bill_vals_list)
+        moves.action_post()
+
+        invoices = moves[:len(invoice_vals_list)]
+        bills = moves[len(invoice_vals_list):]
+        for record, invoice in zip(self, invoices):
+            record.sales_invoice_id = invoice.id
+        for record, bill in zip(online_bookings, bills):
+            record.vendor_bill_id = bill.id
 
-    # ============================================================================
-    # METHOD: _create_online_invoices() - UPDATED
-    # ============================================================================
+        _logger.info(
+            f"Created {len(invoices)} sales invoice(s) and {len(bills)} vendor bill(s) "
+            f"for {len(self)} booking(s)"
+        )
 
-    def _create_online_invoices(self, commission_net, commission_total):
-        """
-        Create invoices for ONLINE payment
+        if online_bookings:
+            online_bookings._register_payments(
+                {record.id: record.sales_invoice_id for record in online_bookings},
+                journals=invoice_data['journals'],
+            )
 
-        Creates:
-        1. Sales Invoice → Partner (Unit + Services + Commission) = 200 SAR
-        2. Vendor Bill → Partner (Unit + Services) = 174.25 SAR
+    def _prepare_invoice_data(self):
+        """
+        Resolve once what the invoices of all bookings in self need
 
-        All prices include tax (tax_included)
+        Returns:
+            dict: {
+                'taxes': {(tax_type, tax_percent, company_id): account.tax},
+                'commission_product': product.product,
+                'journals': {company_id: account.journal (bank)},
+            }
         """
-        self.ensure_one()
+        companies = self.company_id
+        taxes = {}
+        for tax in self.env['account.tax'].search([
+            ('type_tax_use', 'in', ['sale', 'purchase']),
+            ('amount', 'in', list(set(self.mapped('tax_percent')))),
+            ('price_include_override', '=', 'tax_included'),
+            ('company_id', 'in', companies.ids)
+        ]):
+            taxes.setdefault((tax.type_tax_use, tax.amount, tax.company_id.id), tax)
 
-        # Get tax (tax_included for both sale and purchase)
-        tax_sale = self._get_tax('sale')
-        tax_purchase = self._get_tax('purchase')
+        for record in self:
+            tax_types = ('sale', 'purchase') if record.payment_method == 'online' else ('sale',)
+            for tax_type in tax_types:
+                if (tax_type, record.tax_percent, record.company_id.id) not in taxes:
+                    raise UserError(
+                        f"Tax {record.tax_percent}% (tax_included) not found for {tax_type}!\n"
+                        "Please create it in: Accounting → Configuration → Taxes\n"
+                        "Domain: price_include_override = 'tax_included'"
+                    )
 
-        # Get lines
+        return {
+            'taxes': taxes,
+            'commission_product': self._get_commission_product(),
+            'journals': self._get_bank_journals(companies),
+        }
+
+    def _get_unit_price_after_commission(self):
+        """Unit price (tax included) after commission deduction"""
+        self.ensure_one()
         unit_line = self.booking_line_ids.filtered(lambda l: l.line_type == 'unit')
         if not unit_line:
             raise ValidationError("Unit line not found!")
 
-        service_lines = self.booking_line_ids.filtered(lambda l: l.line_type == 'service')
-
-        # Calculate unit price after commission deduction
         tax_rate = self.tax_percent / 100.0
         unit_price_incl = unit_line.price_unit  # 150 SAR (includes tax)
         unit_price_net = unit_price_incl / (1 + tax_rate)  # 130.43 SAR
-        unit_net_after_commission = unit_price_net - commission_net  # 130.43 - 22.39 = 108.04
+        unit_net_after_commission = unit_price_net - self.commission_amount_net  # 130.43 - 22.39 = 108.04
         unit_incl_after_commission = unit_net_after_commission * (1 + tax_rate)  # 124.25 SAR
-        unit_incl_after_commission = round(unit_incl_after_commission, 2)
+        return unit_line, round(unit_incl_after_commission, 2)
 
-        # ================================================================
-        # 1. SALES INVOICE (Partner → HighFive)
-        # ================================================================
-        # Partner owes HighFive for booking (Unit + Services + Commission)
-
-        invoice_lines = []
+    def _prepare_booking_move_lines(self, unit_line, tax, unit_price):
+        """Unit line (after commission deduction) + service lines (as-is)"""
+        self.ensure_one()
+        analytic_distribution = {str(self.analytic_account_id.id): 100}
 
         # Line 1: Unit (after commission deduction)
-        invoice_lines.append((0, 0, {
+        lines = [(0, 0, {
             'product_id': unit_line.product_id.id,
             'name': unit_line.name,
             'quantity': unit_line.quantity,
-            'price_unit': unit_incl_after_commission,  # 124.25 SAR (tax included)
-            'tax_ids': [(6, 0, [tax_sale.id])],
-            'analytic_distribution': {str(self.analytic_account_id.id): 100},
-        }))
+            'price_unit': unit_price,  # 124.25 SAR (tax included)
+            'tax_ids': [(6, 0, [tax.id])],
+            'analytic_distribution': analytic_distribution,
+        })]
 
         # Line 2: Services (as-is)
-        for service_line in service_lines:
-            invoice_lines.append((0, 0, {
+        for service_line in self.booking_line_ids.filtered(lambda l: l.line_type == 'service'):
+            lines.append((0, 0, {
                 'product_id': service_line.product_id.id,
                 'name': service_line.name,
                 'quantity': service_line.quantity,
                 'price_unit': service_line.price_unit,  # Tax included
-                'tax_ids': [(6, 0, [tax_sale.id])],
-                'analytic_distribution': {str(self.analytic_account_id.id): 100},
+                'tax_ids': [(6, 0, [tax.id])],
+                'analytic_distribution': analytic_distribution,
             }))
+        return lines
+
+    # ============================================================================
+    # METHOD: _prepare_online_invoice_vals() - ONLINE PAYMENT
+    # ============================================================================
+
+    def _prepare_online_invoice_vals(self, invoice_data):
+        """
+        Sales Invoice → Partner (Unit + Services + Commission) = 200 SAR
+
+        All prices include tax (tax_included)
+        """
+        self.ensure_one()
+        tax_sale = invoice_data['taxes'][('sale', self.tax_percent, self.company_id.id)]
+        commission_total = self.commission_amount_total
+        unit_line, unit_incl_after_commission = self._get_unit_price_after_commission()
+
+        # ================================================================
+        # 1. SALES INVOICE (Partner → HighFive)
+        # ================================================================
+        # Partner owes HighFive for booking (Unit + Services + Commission)
+        invoice_lines = self._prepare_booking_move_lines(unit_line, tax_sale, unit_incl_after_commission)
 
         # Line 3: Commission
-        commission_product = self._get_commission_product()
         invoice_lines.append((0, 0, {
-            'product_id': commission_product.id,
+            'product_id': invoice_data['commission_product'].id,
             'name': f'HighFive Commission {self.commission_percent}% + {self.commission_fixed}',
             'quantity': 1,
             'price_unit': commission_total,  # 25.75 SAR (tax included)
@@ -957,8 +1124,7 @@ class HighFiveBooking(models.Model):
             'analytic_distribution': {str(self.analytic_account_id.id): 100},
         }))
 
-        # Create sales invoice
-        invoice_vals = {
+        return {
             'move_type': 'out_invoice',
             'partner_id': self.customer_id.id,  # المورد
             'currency_id': self.currency_id.id,
@@ -979,48 +1145,22 @@ class HighFiveBooking(models.Model):
             ),
         }
 
-        invoice = self.env['account.move'].create(invoice_vals)
-        invoice.action_post()
-
-        self.sales_invoice_id = invoice.id
-        self._register_payment(invoice)
+    def _prepare_online_bill_vals(self, invoice_data):
+        """
+        Vendor Bill → Partner (Unit + Services) = 174.25 SAR
 
-        _logger.info(
-            f"Sales invoice created: {invoice.name} - "
-            f"Total={invoice.amount_total:.2f} "
-            f"(Unit={unit_incl_after_commission:.2f} + Services + Commission={commission_total:.2f})"
-        )
+        All prices include tax (tax_included)
+        """
+        self.ensure_one()
+        tax_purchase = invoice_data['taxes'][('purchase', self.tax_percent, self.company_id.id)]
+        unit_line, unit_incl_after_commission = self._get_unit_price_after_commission()
+        bill_lines = self._prepare_booking_move_lines(unit_line, tax_purchase, unit_incl_after_commission)
 
         # ================================================================
         # 2. VENDOR BILL (HighFive → Partner)
         # ================================================================
         # HighFive owes Partner for services (Unit + Services, no commission)
-
-        bill_lines = []
-
-        # Line 1: Unit (after commission deduction, same price)
-        bill_lines.append((0, 0, {
-            'product_id': unit_line.product_id.id,
-            'name': unit_line.name,
-            'quantity': unit_line.quantity,
-            'price_unit': unit_incl_after_commission,  # 124.25 SAR (tax included)
-            'tax_ids': [(6, 0, [tax_purchase.id])],
-            'analytic_distribution': {str(self.analytic_account_id.id): 100},
-        }))
-
-        # Line 2: Services (as-is)
-        for service_line in service_lines:
-            bill_lines.append((0, 0, {
-                'product_id': service_line.product_id.id,
-                'name': service_line.name,
-                'quantity': service_line.quantity,
-                'price_unit': service_line.price_unit,  # Tax included
-                'tax_ids': [(6, 0, [tax_purchase.id])],
-                'analytic_distribution': {str(self.analytic_account_id.id): 100},
-            }))
-
-        # Create vendor bill
-        bill_vals = {
+        return {
             'move_type': 'in_invoice',
             'partner_id': self.partner_id.id,  # المورد
             'currency_id': self.currency_id.id,
@@ -1034,49 +1174,32 @@ class HighFiveBooking(models.Model):
                 f'HighFive Booking ID: {self.highfive_booking_id}\n'
                 f'Payment to partner for services\n'
                 f'Unit price (after commission): {unit_incl_after_commission:.2f}\n'
-                f'Commission: {commission_total:.2f} deducted'
+                f'Commission: {self.commission_amount_total:.2f} deducted'
             ),
         }
 
-        bill = self.env['account.move'].create(bill_vals)
-        bill.action_post()
-        self.vendor_bill_id = bill.id
-
-        _logger.info(
-            f"Vendor bill created: {bill.name} - "
-            f"Total={bill.amount_total:.2f} "
-            f"(Unit + Services, commission deducted)"
-        )
-
     # ============================================================================
-    # METHOD: _create_cash_invoice() - CASH PAYMENT
+    # METHOD: _prepare_cash_invoice_vals() - CASH PAYMENT
     # ============================================================================
 
-    def _create_cash_invoice(self, commission_total):
+    def _prepare_cash_invoice_vals(self, invoice_data):
         """
-        Create commission invoice for CASH payment
+        Commission invoice for CASH payment
 
-        Creates:
-        - Sales Invoice → Partner (Commission only) = 25.75 SAR
+        Sales Invoice → Partner (Commission only) = 25.75 SAR
 
         Price includes tax (tax_included)
         """
         self.ensure_one()
-
-        # Get tax
-        tax_sale = self._get_tax('sale')
-
-        # Get commission product
-        commission_product = self._get_commission_product()
+        tax_sale = invoice_data['taxes'][('sale', self.tax_percent, self.company_id.id)]
+        commission_total = self.commission_amount_total
 
         # Get customer name for narration
         customer_name = self.customer_id.name if self.customer_id else 'غير محدد'
 
-        invoice_lines = []
-
         # Line 1: Commission only
-        invoice_lines.append((0, 0, {
-            'product_id': commission_product.id,
+        invoice_lines = [(0, 0, {
+            'product_id': invoice_data['commission_product'].id,
             'name': (
                 f'HighFive Commission - Cash Booking\n'
                 f'{self.commission_percent}% + {self.commission_fixed}\n'
@@ -1086,10 +1209,9 @@ class HighFiveBooking(models.Model):
             'price_unit': commission_total,  # 25.75 SAR (tax included)
             'tax_ids': [(6, 0, [tax_sale.id])],
             'analytic_distribution': {str(self.analytic_account_id.id): 100},
-        }))
+        })]
 
-        # Create sales invoice
-        invoice_vals = {
+        return {
             'move_type': 'out_invoice',
             'partner_id': self.partner_id.id,  # المورد
             'currency_id': self.currency_id.id,
@@ -1111,15 +1233,6 @@ class HighFiveBooking(models.Model):
             ),
         }
 
-        invoice = self.env['account.move'].create(invoice_vals)
-        invoice.action_post()
-        self.sales_invoice_id = invoice.id
-
-        _logger.info(
-            f"Cash commission invoice created: {invoice.name} - "
-            f"Total={commission_total:.2f}"
-        )
-
     def _get_commission_product(self):
         """Get or create commission product"""
         commission_product = self.env['product.product'].search([
@@ -1140,65 +1253,35 @@ class HighFiveBooking(models.Model):
 
         return commission_product
 
-
-
-    def _get_tax(self, tax_type='sale'):
-        """
-        Get tax with price_include_override = tax_included
-
-        Args:
-            tax_type: 'sale' or 'purchase'
-        """
-        tax = self.env['account.tax'].search([
-            ('type_tax_use', '=', tax_type),
-            ('amount', '=', self.tax_percent),
-            ('price_include_override', '=', 'tax_included'),
-            ('company_id', '=', self.company_id.id)
-        ], limit=1)
-
-        if not tax:
-            raise UserError(
-                f"Tax {self.tax_percent}% (tax_included) not found for {tax_type}!\n"
-                "Please create it in: Accounting → Configuration → Taxes\n"
-                "Domain: price_include_override = 'tax_included'"
-            )
-
-        return tax
-
     # =========================================================================
     # INVOICE PAYMENT
     # =========================================================================
 
-
-    def _register_payment(self, invoice, payment_details=None):
-        """Register payment for invoice and reconcile"""
-
-        # تأكد من أن الفاتورة مرحّلة
-        if invoice.state != 'posted':
-            _logger.warning(f"Invoice {invoice.name} is not posted")
-            return None
-
-        # Get journal
-        journal = self.env['account.journal'].search([
+    @api.model
+    def _get_bank_journals(self, companies):
+        """First bank journal of each company: {company_id: account.journal}"""
+        journals = {}
+        for journal in self.env['account.journal'].search([
             ('type', '=', 'bank'),
-            ('company_id', '=', invoice.company_id.id)
-        ], limit=1)
-
-        if not journal:
-            _logger.warning("No bank journal found")
-            return None
+            ('company_id', 'in', companies.ids)
+        ]):
+            journals.setdefault(journal.company_id.id, journal)
+        return journals
 
+    def _prepare_payment_vals(self, invoice, journal, payment_details=None):
+        """Values of the customer payment of a booking invoice"""
+        self.ensure_one()
         payment_details = payment_details or {}
+        transaction_ref = payment_details.get('transaction_ref') or self.payment_transaction_ref
 
-
-        payment_vals = {
+        return {
             'payment_type': 'inbound',
             'partner_type': 'customer',
             'partner_id': invoice.partner_id.id,
             'amount': invoice.amount_total,
             'journal_id': journal.id,
             'date': fields.Date.today(),
-            'memo': f"Payment for Booking# {self.name} {payment_details.get('transaction_ref') or self.payment_transaction_ref}",  # ✅ memo بدلاً من ref
+            'memo': f"Payment for Booking# {self.name} {transaction_ref}",  # ✅ memo بدلاً من ref
 
             # HighFive Fields
             'highfive_booking_id': self.id,
@@ -1206,54 +1289,141 @@ class HighFiveBooking(models.Model):
             'payment_card': payment_details.get('card', 0) or self.payment_card,
             'payment_wallet': payment_details.get('wallet', 0) or self.payment_wallet,
             'payment_coupon': payment_details.get('coupon', 0) or self.payment_coupon,
-            'transaction_reference': payment_details.get('transaction_ref') or self.payment_transaction_ref,
+            'transaction_reference': transaction_ref,
         }
 
-        try:
-            # إنشاء الدفعة
-            payment = self.env['account.payment'].create(payment_vals)
-            _logger.info(f"Payment created: {payment.name}")
+    def _register_payment(self, invoice, payment_details=None):
+        """Register payment for invoice and reconcile"""
+        self.ensure_one()
+        payments = self._register_payments(
+            {self.id: invoice},
+            payment_details={self.id: payment_details or {}},
+        )
+        return payments[:1] or None
+
+    def _register_payments(self, invoices_by_booking, payment_details=None, journals=None):
+        """
+        Register and reconcile the payments of many booking invoices at once
+
+        All payments are created with one create(), posted together and
+        reconciled with their invoice through one reconciliation plan. When
+        the batch fails, the payments are registered again one by one, each
+        in its own savepoint, so one bad payment does not drop the others.
+        The bookings whose payment failed are reported (error log and
+        message on the booking).
+
+        Args:
+            invoices_by_booking (dict): {booking_id: account.move}
+            payment_details (dict): {booking_id: {payment_id, card, wallet,
+                                    coupon, transaction_ref}} (optional)
+            journals (dict): {company_id: account.journal} (optional)
+
+        Returns:
+            recordset: Created account.payment records
+        """
+        payment_details = payment_details or {}
+        Payment = self.env['account.payment']
+
+        # تأكد من أن الفاتورة مرحّلة
+        pairs = []
+        for booking in self:
+            invoice = invoices_by_booking.get(booking.id)
+            if not invoice:
+                continue
+            if invoice.state != 'posted':
+                _logger.warning(f"Invoice {invoice.name} is not posted")
+                continue
+            pairs.append((booking, invoice))
+        if not pairs:
+            return Payment
+
+        # Get journals
+        if journals is None:
+            journals = self._get_bank_journals(self.env['account.move'].browse(
+                [invoice.id for dummy, invoice in pairs]
+            ).company_id)
+
+        failures = {}
+        to_pay = []
+        for booking, invoice in pairs:
+            journal = journals.get(invoice.company_id.id)
+            if not journal:
+                failures[booking] = f"No bank journal found for {invoice.company_id.name}"
+                continue
+            to_pay.append((booking, invoice, booking._prepare_payment_vals(
+                invoice, journal, payment_details.get(booking.id)
+            )))
+
+        payments = Payment
+        if to_pay:
+            try:
+                with self.env.cr.savepoint():
+                    payments = self._create_reconciled_payments(to_pay)
+            except Exception as e:
+                if len(to_pay) > 1:
+                    _logger.warning(
+                        f"Batch of {len(to_pay)} payment(s) failed ({e}), "
+                        "registering them one by one"
+                    )
+                    for item in to_pay:
+                        try:
+                            with self.env.cr.savepoint():
+                                payments |= self._create_reconciled_payments([item])
+                        except Exception as e:
+                            failures[item[0]] = str(e)
+                else:
+                    failures[to_pay[0][0]] = str(e)
+
+        for booking, error in failures.items():
+            _logger.error(f"❌ Payment of booking {booking.name} failed: {error}")
+            booking.message_post(body=f"Payment registration failed: {error}")
+        return payments
 
-            # ترحيل الدفعة
-            payment.action_post()
-            print("payment_ids ==> ",self.payment_ids)
-            _logger.info(f"Payment posted: {payment.name}")
+    def _create_reconciled_payments(self, to_pay):
+        """
+        Create, post and reconcile payments with their invoices
 
-            # ✅ في Odoo 18: استخدم move_id.line_ids بدلاً من line_ids
+        Args:
+            to_pay (list): [(booking, invoice, payment vals)]
+
+        Returns:
+            recordset: Created account.payment records
+        """
+        # إنشاء الدفعات وترحيلها
+        payments = self.env['account.payment'].create([vals for dummy, dummy, vals in to_pay])
+        payments.action_post()
+        _logger.info(f"{len(payments)} payment(s) created and posted")
+
+        # ✅ في Odoo 18: استخدم move_id.line_ids بدلاً من line_ids
+        # ابحث عن سطور الذمم
+        plan = []
+        for payment, (dummy, invoice, dummy) in zip(payments, to_pay):
             if not payment.move_id:
-                _logger.error("Payment has no move_id")
-                return payment
+                _logger.error(f"Payment {payment.name} has no move_id")
+                continue
 
-            # ابحث عن سطور الذمم
             invoice_receivable_line = invoice.line_ids.filtered(
                 lambda l: l.account_id.account_type == 'asset_receivable' and not l.reconciled
             )
-
             payment_receivable_line = payment.move_id.line_ids.filtered(
                 lambda l: l.account_id.account_type == 'asset_receivable' and not l.reconciled
             )
+            if not invoice_receivable_line or not payment_receivable_line:
+                _logger.warning(f"No lines to reconcile for invoice {invoice.name}")
+                continue
 
-            _logger.info(
-                f"Invoice lines: {len(invoice_receivable_line)}, Payment lines: {len(payment_receivable_line)}")
-
-            if invoice_receivable_line and payment_receivable_line:
-                # تحقق من تطابق الحسابات
-                if invoice_receivable_line[0].account_id == payment_receivable_line[0].account_id:
-                    # Reconcile
-                    lines_to_reconcile = invoice_receivable_line + payment_receivable_line
-                    lines_to_reconcile.reconcile()
-                    _logger.info(f"✅ Payment reconciled for invoice {invoice.name}")
-                else:
-                    _logger.error(f"Account mismatch")
-            else:
-                _logger.warning(f"No lines to reconcile")
-
-            return payment
+            # تحقق من تطابق الحسابات
+            if invoice_receivable_line[0].account_id != payment_receivable_line[0].account_id:
+                _logger.error(f"Account mismatch for invoice {invoice.name}")
+                continue
 
-        except Exception as e:
-            _logger.error(f"❌ Error: {str(e)}", exc_info=True)
-            return None
+            plan.append(invoice_receivable_line + payment_receivable_line)
 
+        # Reconcile
+        if plan:
+            self.env['account.move.line']._reconcile_plan(plan)
+            _logger.info(f"✅ {len(plan)} payment(s) reconciled")
+        return payments
 
     # =========================================================================
     # HELPER METHODS
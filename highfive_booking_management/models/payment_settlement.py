@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+from collections import defaultdict
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class HighFivePaymentSettlement(models.Model):
+    _name = 'highfive.payment.settlement'
+    _description = 'HighFive Payment Settlement'
+    _order = 'date desc, id desc'
+
+    # =========================================================================
+    # FIELDS
+    # =========================================================================
+
+    name = fields.Char(
+        'Settlement Reference',
+        required=True,
+        copy=False,
+        readonly=True,
+        default='New'
+    )
+
+    reference = fields.Char(
+        'Gateway Reference',
+        index=True,
+        help='Settlement reference from the payment gateway'
+    )
+
+    date = fields.Date(
+        'Payment Date',
+        required=True,
+        default=fields.Date.context_today
+    )
+
+    journal_id = fields.Many2one(
+        'account.journal',
+        'Journal',
+        required=True,
+        domain=[('type', 'in', ['bank', 'cash'])],
+        help='Default journal of the payments'
+    )
+
+    company_id = fields.Many2one(
+        'res.company',
+        'Company',
+        default=lambda self: self.env.company,
+        required=True
+    )
+
+    currency_id = fields.Many2one(
+        related='company_id.currency_id',
+        string='Currency'
+    )
+
+    line_ids = fields.One2many(
+        'highfive.payment.settlement.line',
+        'settlement_id',
+        string='Lines',
+        copy=True
+    )
+
+    payment_ids = fields.One2many(
+        'account.payment',
+        'highfive_settlement_id',
+        string='Payments',
+        readonly=True
+    )
+
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('done', 'Processed'),
+    ], string='Status', default='draft', required=True)
+
+    amount_total = fields.Monetary(
+        'Total',
+        currency_field='currency_id',
+        compute='_compute_totals',
+        store=True
+    )
+
+    reconciled_count = fields.Integer(
+        'Reconciled',
+        compute='_compute_totals',
+        store=True
+    )
+
+    failed_count = fields.Integer(
+        'Failed / Skipped',
+        compute='_compute_totals',
+        store=True
+    )
+
+    # =========================================================================
+    # COMPUTE METHODS
+    # =========================================================================
+
+    @api.depends('line_ids.amount', 'line_ids.state')
+    def _compute_totals(self):
+        for settlement in self:
+            lines = settlement.line_ids
+            settlement.amount_total = sum(lines.mapped('amount'))
+            settlement.reconciled_count = len(lines.filtered(
+                lambda l: l.state in ('reconciled', 'partial')
+            ))
+            settlement.failed_count = len(lines.filtered(
+                lambda l: l.state in ('skipped', 'failed')
+            ))
+
+    # =========================================================================
+    # CRUD METHODS
+    # =========================================================================
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        seq = self.env['ir.sequence']
+        for vals in vals_list:
+            if vals.get('name', 'New') == 'New':
+                vals['name'] = seq.next_by_code('highfive.payment.settlement') or 'New'
+        return super().create(vals_list)
+
+    # =========================================================================
+    # ACTION METHODS
+    # =========================================================================
+
+    def action_process(self):
+        """Register and reconcile the payments of all pending lines"""
+        for settlement in self:
+            settlement._process_lines()
+            settlement.state = 'done'
+
+    def action_view_payments(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Payments',
+            'res_model': 'account.payment',
+            'view_mode': 'list,form',
+            'domain': [('highfive_settlement_id', '=', self.id)],
+            'context': {'create': False}
+        }
+
+    # =========================================================================
+    # PROCESSING
+    # =========================================================================
+
+    def _process_lines(self):
+        """
+        Process the pending lines of the settlement
+
+        1. Resolve all bookings with one search
+        2. Check each line (booking confirmed, online, invoice posted/unpaid)
+        3. Pay each (journal, date) group in its own savepoint, see
+           _process_group(), so one failing group does not fail the others
+
+        Returns:
+            list: Per-line outcomes, see _get_outcomes()
+        """
+        self.ensure_one()
+        lines = self.line_ids.filtered(lambda l: l.state in ('pending', 'failed'))
+        if not lines:
+            return self._get_outcomes()
+
+        # ================================================================
+        # 1. Resolve bookings
+        # ================================================================
+        bookings = self.env['highfive.booking'].search([
+            ('highfive_booking_id', 'in', list(set(lines.mapped('highfive_booking_id'))))
+        ])
+        bookings_by_ref = {booking.highfive_booking_id: booking for booking in bookings}
+
+        # ================================================================
+        # 2. Check lines and group them
+        # ================================================================
+        groups = defaultdict(list)
+        for line in lines:
+            booking = bookings_by_ref.get(line.highfive_booking_id)
+            invoice = booking.sales_invoice_id if booking else self.env['account.move']
+            vals = {'booking_id': booking.id if booking else False, 'invoice_id': invoice.id}
+
+            if not booking:
+                vals.update(state='failed', message=f"Booking {line.highfive_booking_id} not found")
+            elif line.amount <= 0:
+                vals.update(state='failed', message="Amount must be positive")
+            elif booking.state != 'confirmed':
+                vals.update(state='skipped', message=f"Booking is {booking.state}")
+            elif booking.payment_method != 'online':
+                vals.update(state='skipped', message="Not an online booking")
+            elif not invoice or invoice.state != 'posted':
+                vals.update(state='skipped', message="Sales invoice is not posted")
+            elif invoice.payment_state in ('paid', 'in_payment', 'reversed'):
+                vals.update(state='skipped', message="Invoice already paid")
+            else:
+                journal = line.journal_id or self.journal_id
+                date = line.date or self.date
+                groups[(journal, date)].append((line, invoice))
+                vals.update(state='pending', message=False)
+            line.write(vals)
+
+        if not groups:
+            return self._get_outcomes()
+
+        # ================================================================
+        # 3. Payments per (journal, date) group, each in its own savepoint
+        # ================================================================
+        payments = self.env['account.payment']
+        for (journal, date), items in groups.items():
+            try:
+                with self.env.cr.savepoint():
+                    payments |= self._process_group(journal, date, items)
+            except Exception as e:
+                _logger.error(
+                    f"❌ Settlement {self.name}: group {journal.name} {date} failed: {str(e)}",
+                    exc_info=True
+                )
+                for line, invoice in items:
+                    line.write({'state': 'failed', 'message': str(e), 'payment_id': False})
+
+        # ================================================================
+        # 4. Outcomes
+        # ================================================================
+        for items in groups.values():
+            for line, invoice in items:
+                if line.state != 'pending':
+                    continue
+                if invoice.payment_state in ('paid', 'in_payment'):
+                    line.state = 'reconciled'
+                else:
+                    line.write({
+                        'state': 'partial',
+                        'message': f"Residual {invoice.amount_residual:.2f}",
+                    })
+
+        _logger.info(
+            f"Settlement {self.name}: {len(payments)} payment(s) for "
+            f"{sum(len(items) for items in groups.values())} booking(s)"
+        )
+
+        return self._get_outcomes()
+
+    def _process_group(self, journal, date, items):
+        """
+        Pay the lines of one (journal, date) group
+
+        account.payment holds a single receivable line, so the group gets
+        one payment per line (partner of the invoice, amount of the line),
+        created with one create(), posted together and reconciled each with
+        its own invoice through one batched reconciliation plan. Every
+        invoice thus receives exactly the amount of its line, and the
+        customer ledgers stay balanced per partner.
+
+        Args:
+            journal: account.journal of the group
+            date: Payment date of the group
+            items: List of (settlement line, invoice)
+
+        Returns:
+            recordset: Created account.payment records
+        """
+        payments = self.env['account.payment'].create([{
+            'payment_type': 'inbound',
+            'partner_type': 'customer',
+            'partner_id': invoice.partner_id.id,
+            'amount': line.amount,
+            'journal_id': journal.id,
+            'date': date,
+            'memo': f"HighFive Settlement {self.name} {self.reference or ''} - {line.booking_id.name}",
+            'highfive_settlement_id': self.id,
+            'highfive_booking_id': line.booking_id.id,
+            'payment_card': line.payment_card,
+            'payment_wallet': line.payment_wallet,
+            'payment_coupon': line.payment_coupon,
+            'transaction_reference': line.transaction_ref,
+        } for line, invoice in items])
+        payments.action_post()
+
+        # ============================================================
+        # Reconcile (one batched plan)
+        # ============================================================
+        # (several lines paying the same invoice share one plan entry)
+        plan = {}
+        for payment, (line, invoice) in zip(payments, items):
+            line.payment_id = payment.id
+            payment_lines = payment.move_id.line_ids.filtered(
+                lambda l: l.account_id.account_type == 'asset_receivable' and not l.reconciled
+            )
+            if not payment_lines:
+                line.write({'state': 'failed', 'message': "Payment has no receivable line"})
+                continue
+            if invoice not in plan:
+                plan[invoice] = invoice.line_ids.filtered(
+                    lambda l: l.account_id.account_type == 'asset_receivable' and not l.reconciled
+                )
+            plan[invoice] |= payment_lines
+
+        if plan:
+            self.env['account.move.line']._reconcile_plan(list(plan.values()))
+        return payments
+
+    def _get_outcomes(self):
+        """Per-booking outcome of the settlement lines"""
+        self.ensure_one()
+        return [{
+            'booking_id': line.highfive_booking_id,
+            'odoo_booking_id': line.booking_id.id or None,
+            'amount': line.amount,
+            'state': line.state,
+            'message': line.message or None,
+            'invoice_ref': line.invoice_id.name or None,
+            'payment_ref': line.payment_id.name or None,
+        } for line in self.line_ids]
+
+    def unlink(self):
+        if any(settlement.state == 'done' for settlement in self):
+            raise UserError("Cannot delete a processed settlement!")
+        return super().unlink()
+
+
+class HighFivePaymentSettlementLine(models.Model):
+    _name = 'highfive.payment.settlement.line'
+    _description = 'HighFive Payment Settlement Line'
+    _order = 'settlement_id, id'
+
+    settlement_id = fields.Many2one(
+        'highfive.payment.settlement',
+        'Settlement',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+
+    highfive_booking_id = fields.Char(
+        'HighFive Booking ID',
+        required=True,
+        index=True
+    )
+
+    booking_id = fields.Many2one(
+        'highfive.booking',
+        'Booking',
+        index=True,
+        readonly=True
+    )
+
+    currency_id = fields.Many2one(
+        related='settlement_id.currency_id',
+        string='Currency'
+    )
+
+    amount = fields.Monetary('Amount', currency_field='currency_id', required=True)
+
+    # Payment Breakdown
+    payment_card = fields.Monetary('Card Payment', currency_field='currency_id')
+    payment_wallet = fields.Monetary('Wallet Payment', currency_field='currency_id')
+    payment_coupon = fields.Monetary('Coupon Discount', currency_field='currency_id')
+    transaction_ref = fields.Char('Transaction Reference')
+
+    # Overrides of the settlement defaults
+    journal_id = fields.Many2one(
+        'account.journal',
+        'Journal',
+        domain=[('type', 'in', ['bank', 'cash'])]
+    )
+    date = fields.Date('Payment Date')
+
+    # Outcome
+    invoice_id = fields.Many2one('account.move', 'Invoice', readonly=True)
+    payment_id = fields.Many2one('account.payment', 'Payment', readonly=True)
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('reconciled', 'Reconciled'),
+        ('partial', 'Partially Reconciled'),
+        ('skipped', 'Skipped'),
+        ('failed', 'Failed'),
+    ], string='Status', default='pending', required=True, readonly=True)
+    message = fields.Char('Message', readonly=True)
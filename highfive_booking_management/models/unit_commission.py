@@ -1,10 +1,21 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import create_index, index_exists
 import logging
 
 _logger = logging.getLogger(__name__)
 
+# Booking type → (percent field, fixed field) on highfive.unit.commission
+COMMISSION_RATE_FIELDS = {
+    'online_booking': ('commission_online_percent', 'commission_online_fixed'),
+    'cash_booking': ('commission_cash_percent', 'commission_cash_fixed'),
+    'walk_in_booking': ('commission_walkin_percent', 'commission_walkin_fixed'),
+    'linked_booking': ('commission_linked_percent', 'commission_linked_fixed'),
+    'online_public_event': ('commission_online_event_percent', 'commission_online_event_fixed'),
+    'cash_public_event': ('commission_cash_event_percent', 'commission_cash_event_fixed'),
+}
+
 
 class UnitCommission(models.Model):
     _name = 'highfive.unit.commission'
@@ -183,6 +194,18 @@ class UnitCommission(models.Model):
          'Each unit can have only one default commission!'),
     ]
 
+    def init(self):
+        """Interval index used to resolve the effective commission per date"""
+        index_name = 'highfive_unit_commission_interval_idx'
+        if not index_exists(self.env.cr, index_name):
+            create_index(
+                self.env.cr,
+                index_name,
+                self._table,
+                ['unit_id', 'type', 'start_date', 'end_date'],
+                where='active',
+            )
+
     # =========================================================================
     # COMPUTE METHODS
     # =========================================================================
@@ -322,34 +345,12 @@ class UnitCommission(models.Model):
         """
         self.ensure_one()
 
-        commission_map = {
-            'online_booking': (
-                self.commission_online_percent,
-                self.commission_online_fixed
-            ),
-            'cash_booking': (
-                self.commission_cash_percent,
-                self.commission_cash_fixed
-            ),
-            'walk_in_booking': (
-                self.commission_walkin_percent,
-                self.commission_walkin_fixed
-            ),
-            'linked_booking': (
-                self.commission_linked_percent,
-                self.commission_linked_fixed
-            ),
-            'online_public_event': (
-                self.commission_online_event_percent,
-                self.commission_online_event_fixed
-            ),
-            'cash_public_event': (
-                self.commission_cash_event_percent,
-                self.commission_cash_event_fixed
-            ),
-        }
+        rate_fields = COMMISSION_RATE_FIELDS.get(booking_type)
+        if not rate_fields:
+            return (0.0, 0.0)
 
-        return commission_map.get(booking_type, (0.0, 0.0))
+        percent_field, fixed_field = rate_fields
+        return (self[percent_field], self[fixed_field])
 
     def calculate_commission(self, base_amount, booking_type, tax_rate=0.15):
         """
@@ -423,42 +424,116 @@ class UnitCommission(models.Model):
         Returns:
             recordset: Active commission record (or empty)
         """
-        # Try to find scheduled commission first
-        scheduled = self.search([
-            ('unit_id', '=', unit_id),
-            ('type', '=', 'scheduled'),
-            ('start_date', '<=', booking_date),
-            ('end_date', '>=', booking_date),
-            ('active', '=', True)
-        ], order='start_date desc', limit=1)
-
-        if scheduled:
-            _logger.info(
-                f"Using scheduled commission '{scheduled.name}' "
-                f"for unit {unit_id} on {booking_date}"
-            )
-            return scheduled
-
-        # Fallback to default commission
-        default = self.search([
-            ('unit_id', '=', unit_id),
-            ('type', '=', 'default'),
-            ('active', '=', True)
-        ], limit=1)
+        booking_date = fields.Date.to_date(booking_date)
+        commission = self.get_active_commissions(
+            [(unit_id, booking_date)]
+        ).get((unit_id, booking_date), self.browse())
 
-        if default:
+        if commission:
             _logger.info(
-                f"Using default commission '{default.name}' "
-                f"for unit {unit_id}"
+                f"Using {commission.type} commission '{commission.name}' "
+                f"for unit {unit_id} on {booking_date}"
             )
-            return default
+            return commission
 
         # No commission found
         _logger.warning(
             f"No commission found for unit {unit_id}! "
             "Please configure default commission."
         )
-        return self.browse()
+        return commission
+
+    @api.model
+    def get_active_commissions(self, unit_dates):
+        """
+        Resolve the active commission for many (unit, date) pairs at once
+
+        Same priority as get_active_commission() (scheduled commission
+        covering the date, then default commission), resolved for all
+        pairs with one query on the interval index.
+
+        Args:
+            unit_dates (list): [(unit_id, booking_date), ...]
+
+        Returns:
+            dict: {(unit_id, booking_date): commission record}, pairs
+                  without any commission are left out
+        """
+        pairs = list({
+            (unit_id, fields.Date.to_date(booking_date))
+            for unit_id, booking_date in unit_dates
+        })
+        if not pairs:
+            return {}
+
+        self.flush_model(['unit_id', 'type', 'start_date', 'end_date', 'active'])
+        self.env.cr.execute("""
+            SELECT DISTINCT ON (p.unit_id, p.booking_date)
+                p.unit_id, p.booking_date, c.id
+            FROM unnest(%s::int[], %s::date[]) AS p(unit_id, booking_date)
+            JOIN highfive_unit_commission c
+                ON c.unit_id = p.unit_id
+                AND c.active
+                AND (
+                    c.type = 'default'
+                    OR (
+                        c.type = 'scheduled'
+                        AND c.start_date <= p.booking_date
+                        AND c.end_date >= p.booking_date
+                    )
+                )
+            ORDER BY p.unit_id, p.booking_date,
+                     c.type = 'scheduled' DESC,
+                     c.start_date DESC NULLS LAST,
+                     c.id DESC
+        """, (
+            [unit_id for unit_id, booking_date in pairs],
+            [booking_date for unit_id, booking_date in pairs],
+        ))
+        return {
+            (unit_id, booking_date): self.browse(commission_id)
+            for unit_id, booking_date, commission_id in self.env.cr.fetchall()
+        }
+
+    # =========================================================================
+    # SCHEDULED ACTIONS
+    # =========================================================================
+
+    @api.model
+    def _cron_update_status(self):
+        """
+        Daily rollover of the stored status (upcoming → active → expired)
+
+        The status only depends on today's date for scheduled commissions,
+        so it is refreshed for all commissions with one UPDATE instead of
+        recomputing the records one by one.
+        """
+        self.flush_model(['type', 'start_date', 'end_date', 'status'])
+        self.env.cr.execute("""
+            WITH new_status AS (
+                SELECT id,
+                       CASE
+                           WHEN type != 'scheduled'
+                                OR start_date IS NULL
+                                OR end_date IS NULL THEN 'active'
+                           WHEN %(today)s < start_date THEN 'upcoming'
+                           WHEN %(today)s > end_date THEN 'expired'
+                           ELSE 'active'
+                       END AS status
+                FROM highfive_unit_commission
+            )
+            UPDATE highfive_unit_commission c
+               SET status = n.status
+              FROM new_status n
+             WHERE c.id = n.id
+               AND c.status IS DISTINCT FROM n.status
+         RETURNING c.id
+        """, {'today': fields.Date.today()})
+        updated_ids = [row[0] for row in self.env.cr.fetchall()]
+        self.invalidate_model(['status'])
+
+        _logger.info(f"Commission status rollover: {len(updated_ids)} commissions updated")
+        return updated_ids
 
     @api.model
     def get_commission_for_booking(self, unit_id, booking_date, booking_type, base_amount, tax_rate=0.15):
@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+from . import commission_recompute_wizard
+from . import settlement_import_wizard
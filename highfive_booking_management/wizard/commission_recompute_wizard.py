@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+
+
+class CommissionRecomputeWizard(models.TransientModel):
+    _name = 'highfive.commission.recompute.wizard'
+    _description = 'Recompute Booking Commissions'
+
+    date_from = fields.Date(
+        'From',
+        required=True,
+        default=lambda self: fields.Date.context_today(self).replace(day=1)
+    )
+
+    date_to = fields.Date(
+        'To',
+        required=True,
+        default=fields.Date.context_today
+    )
+
+    commission_ids = fields.Many2many(
+        'highfive.unit.commission',
+        string='Commission Rules',
+        help='Leave empty to recompute bookings of all commission rules'
+    )
+
+    partner_ids = fields.Many2many(
+        'res.partner',
+        string='Partners',
+        domain=[('is_highfive_partner', '=', True)],
+        help='Leave empty to recompute bookings of all partners'
+    )
+
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('preview', 'Preview'),
+        ('done', 'Done')
+    ], default='draft')
+
+    currency_id = fields.Many2one(
+        'res.currency',
+        default=lambda self: self.env.company.currency_id
+    )
+
+    # Results
+    booking_count = fields.Integer('Bookings Checked', readonly=True)
+    changed_count = fields.Integer('Bookings Changed', readonly=True)
+    total_before = fields.Monetary('Commission Before', currency_field='currency_id', readonly=True)
+    total_after = fields.Monetary('Commission After', currency_field='currency_id', readonly=True)
+    total_delta = fields.Monetary(
+        'Delta',
+        currency_field='currency_id',
+        compute='_compute_total_delta'
+    )
+    changed_booking_ids = fields.Many2many(
+        'highfive.booking',
+        string='Changed Bookings',
+        readonly=True
+    )
+
+    @api.depends('total_before', 'total_after')
+    def _compute_total_delta(self):
+        for wizard in self:
+            wizard.total_delta = wizard.total_after - wizard.total_before
+
+    @api.constrains('date_from', 'date_to')
+    def _check_dates(self):
+        for wizard in self:
+            if wizard.date_from > wizard.date_to:
+                raise ValidationError("End date must be after start date!")
+
+    def _get_booking_domain(self):
+        """Bookings of the period that are not invoiced yet"""
+        self.ensure_one()
+        domain = [
+            ('booking_date', '>=', self.date_from),
+            ('booking_date', '<=', self.date_to),
+            ('state', '!=', 'cancelled'),
+            ('sales_invoice_id', '=', False),
+            ('vendor_bill_id', '=', False),
+            ('commission_invoice_id', '=', False),
+        ]
+        if self.commission_ids:
+            domain.append(('commission_id', 'in', self.commission_ids.ids))
+        if self.partner_ids:
+            domain.append(('partner_id', 'in', self.partner_ids.ids))
+        return domain
+
+    def _run(self, dry_run):
+        self.ensure_one()
+        bookings = self.env['highfive.booking'].search(self._get_booking_domain())
+        result = bookings._recompute_commission_bulk(dry_run=dry_run)
+        self.write({
+            'state': 'preview' if dry_run else 'done',
+            'booking_count': result['booking_count'],
+            'changed_count': result['changed_count'],
+            'total_before': result['total_before'],
+            'total_after': result['total_after'],
+            'changed_booking_ids': [(6, 0, [change[0] for change in result['changes']])],
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def action_preview(self):
+        """Report before/after commission totals without writing"""
+        return self._run(dry_run=True)
+
+    def action_apply(self):
+        """Recompute and store the commission amounts"""
+        return self._run(dry_run=False)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields
+from odoo.exceptions import UserError
+import base64
+import csv
+import io
+
+
+class SettlementImportWizard(models.TransientModel):
+    _name = 'highfive.settlement.import.wizard'
+    _description = 'Import Payment Gateway Settlement'
+
+    file = fields.Binary('Settlement File (CSV)', required=True)
+    filename = fields.Char('File Name')
+
+    reference = fields.Char('Gateway Reference')
+
+    date = fields.Date(
+        'Payment Date',
+        required=True,
+        default=fields.Date.context_today
+    )
+
+    journal_id = fields.Many2one(
+        'account.journal',
+        'Journal',
+        required=True,
+        domain=[('type', 'in', ['bank', 'cash'])]
+    )
+
+    process = fields.Boolean(
+        'Process Immediately',
+        default=True,
+        help='Register and reconcile the payments right after the import'
+    )
+
+    def _parse_file(self):
+        """
+        Parse the CSV settlement file
+
+        Expected columns (header row): booking_id, amount, and optionally
+        card, wallet, coupon, transaction_ref
+        """
+        self.ensure_one()
+        try:
+            content = base64.b64decode(self.file).decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise UserError("The settlement file must be UTF-8 encoded CSV!")
+
+        reader = csv.DictReader(io.StringIO(content))
+        missing = {'booking_id', 'amount'} - set(reader.fieldnames or [])
+        if missing:
+            raise UserError(f"Missing columns in settlement file: {', '.join(sorted(missing))}")
+
+        lines = []
+        for row_number, row in enumerate(reader, start=2):
+            try:
+                lines.append({
+                    'highfive_booking_id': row['booking_id'].strip(),
+                    'amount': float(row['amount']),
+                    'payment_card': float(row.get('card') or 0),
+                    'payment_wallet': float(row.get('wallet') or 0),
+                    'payment_coupon': float(row.get('coupon') or 0),
+                    'transaction_ref': (row.get('transaction_ref') or '').strip() or False,
+                })
+            except ValueError as e:
+                raise UserError(f"Invalid value on line {row_number}: {e}")
+
+        if not lines:
+            raise UserError("The settlement file is empty!")
+        return lines
+
+    def action_import(self):
+        self.ensure_one()
+        settlement = self.env['highfive.payment.settlement'].create({
+            'reference': self.reference or self.filename,
+            'date': self.date,
+            'journal_id': self.journal_id.id,
+            'line_ids': [(0, 0, vals) for vals in self._parse_file()],
+        })
+        if self.process:
+            settlement.action_process()
+
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Payment Settlement',
+            'res_model': 'highfive.payment.settlement',
+            'res_id': settlement.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
@@ -21,7 +21,7 @@
     'category': 'Technical',
     'author': 'Manus AI',
     'website': 'https://www.highfive.sa',
-    'depends': ['base', 'product', 'analytic', 'account'],
+    'depends': ['base', 'product', 'analytic', 'account', 'base_batch_count'],
     'data': [
         'security/ir.model.access.csv',
         'data/highfive_analytic_plan.xml',
@@ -28,6 +28,42 @@ class AccountAnalyticAccount(models.Model):
             else:
                 record.highfive_account_type = False
 
+    # -------------------------------------------------------------------------
+    # Bulk Creation
+    # -------------------------------------------------------------------------
+    @api.model
+    def _create_and_link(self, records, field_name, vals_list):
+        """
+        Create one analytic account per record and link it back.
+
+        All accounts are created with a single create() and assigned to
+        ``records[field_name]`` with a single UPDATE, so onboarding thousands
+        of partners or branches does not create/write one row at a time.
+
+        Args:
+            records: Recordset to link the accounts to (same order as vals_list)
+            field_name: Many2one field of ``records`` pointing to the account
+            vals_list: Values of the analytic accounts to create
+
+        Returns:
+            account.analytic.account: The created accounts
+        """
+        if not records:
+            return self.browse()
+
+        analytics = self.create(vals_list)
+        rows = list(zip(records.ids, analytics.ids))
+        records.flush_recordset([field_name])
+        self.env.cr.execute(f"""
+            UPDATE "{records._table}" AS r
+               SET "{field_name}" = v.analytic_id
+              FROM (VALUES {', '.join(['%s'] * len(rows))}) AS v(id, analytic_id)
+             WHERE r.id = v.id
+        """, rows)
+        records.invalidate_recordset([field_name])
+        records.modified([field_name])
+        return analytics
+
     # -------------------------------------------------------------------------
     # Enhanced Display
     # -------------------------------------------------------------------------
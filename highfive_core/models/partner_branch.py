@@ -131,11 +131,10 @@ class HighFivePartnerBranch(models.Model):
     # -------------------------------------------------------------------------
     @api.depends('partner_id')
     def _compute_unit_count(self):
-        """Count units/products linked to this branch"""
+        """Count units/products linked to these branches (one grouped query)"""
+        counts = self._batch_count('product.template', 'branch_id')
         for branch in self:
-            branch.unit_count = self.env['product.template'].search_count([
-                ('branch_id', '=', branch.id)
-            ])
+            branch.unit_count = counts[branch]
 
 
 
@@ -144,13 +143,13 @@ class HighFivePartnerBranch(models.Model):
     # -------------------------------------------------------------------------
     @api.model_create_multi
     def create(self, vals_list):
-        """Override create to auto-create analytic account"""
+        """Override create to auto-create analytic accounts"""
         records = super().create(vals_list)
 
-        for rec, vals in zip(records, vals_list):
-            # Ensure analytic child only if partner is provided
-            if vals.get("partner_id"):
-                rec._ensure_branch_analytic_child()
+        # Ensure analytic children (in batch) only if partner is provided
+        records.browse([
+            rec.id for rec, vals in zip(records, vals_list) if vals.get("partner_id")
+        ])._ensure_branch_analytic_child()
 
         return records
 
@@ -160,8 +159,7 @@ class HighFivePartnerBranch(models.Model):
 
         # Only ensure analytic when partner changes
         if "partner_id" in vals:
-            for rec in self:
-                rec._ensure_branch_analytic_child()
+            self._ensure_branch_analytic_child()
 
         return res
 
@@ -170,77 +168,74 @@ class HighFivePartnerBranch(models.Model):
     # -------------------------------------------------------------------------
     def _ensure_branch_analytic_child(self):
         """
-        Ensure that this branch has an analytic account.
+        Ensure that these branches have an analytic account.
 
         This method is idempotent and safe to call multiple times.
         It will:
-        1. Validate that the branch is linked to a HighFive partner
-        2. Ensure the supplier parent analytic account exists
-        3. Create an analytic account if it doesn't exist
+        1. Validate that the branches are linked to a HighFive partner
+        2. Ensure the supplier parent analytic accounts exist (in batch)
+        3. Create the missing analytic accounts with a single create()
 
         Note: In Odoo 18, analytic accounts are flat (no parent_id).
         The relationship is tracked via plan_id only.
 
         Raises:
-            ValidationError: If branch is not linked to a HighFive partner
+            ValidationError: If a branch is not linked to a HighFive partner
                            or if supplier analytic parent is missing
         """
-        self.ensure_one()
+        if not self:
+            return
 
-        # Validate partner
-        if not self.partner_id or not self.partner_id.is_highfive_partner:
-            raise ValidationError(
-                _("Branch '%s' must be linked to a HighFive Partner.") % self.name
-            )
+        # Validate partners
+        for branch in self:
+            if not branch.partner_id or not branch.partner_id.is_highfive_partner:
+                raise ValidationError(
+                    _("Branch '%s' must be linked to a HighFive Partner.") % branch.name
+                )
 
-        # Ensure supplier parent analytic exists
+        # Ensure supplier parent analytics exist
         self.partner_id._ensure_supplier_analytic_parent()
 
         # If analytic already exists, skip
-        if self.analytic_account_id:
-            _logger.debug(f"Analytic account already exists for branch {self.id}")
+        branches = self.filtered(lambda b: not b.analytic_account_id)
+        if not branches:
             return
 
-        # Get supplier parent analytic (for reference in naming)
-        supplier_parent = self.partner_id.analytic_parent_id
-        if not supplier_parent:
-            raise ValidationError(
-                _("Supplier analytic parent account is missing for partner '%s'.")
-                % self.partner_id.name
-            )
+        for branch in branches:
+            if not branch.partner_id.analytic_parent_id:
+                raise ValidationError(
+                    _("Supplier analytic parent account is missing for partner '%s'.")
+                    % branch.partner_id.name
+                )
 
-        _logger.info(
-            f"Creating branch analytic account for branch {self.id} "
-            f"({self.name}) under plan {supplier_parent.plan_id.name if supplier_parent.plan_id else 'None'}"
-        )
+        _logger.info(f"Creating branch analytic accounts for {len(branches)} branch(es)")
 
         # Get analytic plan
-        plan = self.env.ref(
-            "highfive_core.analytic_plan_highfive",
-            raise_if_not_found=False
-        )
+        plan_id = self.env["res.partner"]._get_default_analytic_plan_id()
 
         # Prepare values (no parent_id in Odoo 18)
-        vals = {
-            "name": f"Branch - {self.partner_id.name} / {self.name}",
-            "partner_id": self.partner_id.id,  # ✅ المورد
-            "highfive_branch_id": self.id,      # ✅ الفرع
-            "plan_id": plan.id if plan else False,
-            "code": f"BRN-{self.id:06d}",  # e.g., BRN-000001
-        }
+        vals_list = [{
+            "name": f"Branch - {branch.partner_id.name} / {branch.name}",
+            "partner_id": branch.partner_id.id,  # ✅ المورد
+            "highfive_branch_id": branch.id,      # ✅ الفرع
+            "plan_id": plan_id,
+            "code": f"BRN-{branch.id:06d}",  # e.g., BRN-000001
+        } for branch in branches]
 
         try:
-            analytic = self.env["account.analytic.account"].create(vals)
-            self.analytic_account_id = analytic.id
+            analytics = self.env["account.analytic.account"]._create_and_link(
+                branches, "analytic_account_id", vals_list
+            )
             _logger.info(
-                f"Successfully created branch analytic account {analytic.id} "
-                f"for branch {self.id} ({self.name})"
+                f"Successfully created {len(analytics)} branch analytic account(s) "
+                f"for branches {branches.ids}"
             )
         except Exception as e:
             _logger.error(
-                f"Failed to create branch analytic account for branch {self.id}: {str(e)}"
+                f"Failed to create branch analytic accounts for branches {branches.ids}: {str(e)}"
             )
             raise
+
     # -------------------------------------------------------------------------
     # Deletion Safety
     # -------------------------------------------------------------------------
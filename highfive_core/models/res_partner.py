@@ -127,21 +127,20 @@ class ResPartner(models.Model):
 
     @api.depends('analytic_parent_id', 'branch_ids.analytic_account_id')
     def _compute_analytic_account_count(self):
-        """Count analytic accounts for this supplier"""
-        for partner in self:
-            if not partner.is_highfive_partner:
-                partner.analytic_account_count = 0
-                continue
-
+        """Count analytic accounts for these suppliers (one grouped query)"""
+        suppliers = self.filtered('is_highfive_partner')
+        counts = {}
+        if suppliers:
             # Get plan
-            plan = self.env.ref('highfive_core.analytic_plan_highfive', raise_if_not_found=False)
+            plan_id = self._get_default_analytic_plan_id()
+            domain = [('plan_id', '=', plan_id)] if plan_id else []
+
+            # Count all analytic accounts per partner
+            counts = suppliers._batch_count('account.analytic.account', 'partner_id', domain)
 
-            # Count all analytic accounts for this partner
-            domain = [('partner_id', '=', partner.id)]
-            if plan:
-                domain.append(('plan_id', '=', plan.id))
+        for partner in self:
+            partner.analytic_account_count = counts.get(partner, 0)
 
-            partner.analytic_account_count = self.env['account.analytic.account'].search_count(domain)
     # -------------------------------------------------------------------------
     # Business Constraints
     # -------------------------------------------------------------------------
@@ -175,11 +174,19 @@ class ResPartner(models.Model):
         """Override create to handle HighFive-specific logic"""
         partners = super().create(vals_list)
 
-        # Post-create actions (safe because records now exist)
-        for partner, vals in zip(partners, vals_list):
-            partner._apply_highfive_ranks(vals)
-            if vals.get("is_highfive_partner"):
-                partner._ensure_supplier_analytic_parent()
+        # Post-create actions (safe because records now exist), done for the
+        # whole batch so bulk onboarding creates the analytics in one go
+        suppliers = partners.browse([
+            partner.id for partner, vals in zip(partners, vals_list)
+            if vals.get("is_highfive_partner")
+        ])
+        customers = partners.browse([
+            partner.id for partner, vals in zip(partners, vals_list)
+            if vals.get("is_highfive_customer")
+        ])
+        suppliers._apply_highfive_ranks({"is_highfive_partner": True})
+        customers._apply_highfive_ranks({"is_highfive_customer": True})
+        suppliers._ensure_supplier_analytic_parent()
 
         return partners
 
@@ -189,14 +196,11 @@ class ResPartner(models.Model):
 
         # Apply ranks if flags changed
         if "is_highfive_partner" in vals or "is_highfive_customer" in vals:
-            for partner in self:
-                partner._apply_highfive_ranks(vals)
+            self._apply_highfive_ranks(vals)
 
         # Create analytic account ONLY when supplier flag is explicitly turned on
         if "is_highfive_partner" in vals:
-            for partner in self:
-                if partner.is_highfive_partner:
-                    partner._ensure_supplier_analytic_parent()
+            self._ensure_supplier_analytic_parent()
 
         return res
 
@@ -211,25 +215,25 @@ class ResPartner(models.Model):
         
         We don't force reset to 0 to avoid side effects if partner is also 
         used elsewhere in the system.
-        """
-        self.ensure_one()
 
-        # If flags are in vals, use post-write/current record values
-        if "is_highfive_partner" in vals and self.is_highfive_partner:
-            if self.supplier_rank < 1:
-                self.supplier_rank = 1
-                _logger.debug(f"Set supplier_rank=1 for partner {self.id} ({self.name})")
-
-        if "is_highfive_customer" in vals and self.is_highfive_customer:
-            if self.customer_rank < 1:
-                self.customer_rank = 1
-                _logger.debug(f"Set customer_rank=1 for partner {self.id} ({self.name})")
+        Works on the whole recordset: the partners missing a rank are
+        updated with one write per rank.
+        """
+        if "is_highfive_partner" in vals:
+            to_supplier = self.filtered(
+                lambda p: p.is_highfive_partner and p.supplier_rank < 1
+            )
+            if to_supplier:
+                to_supplier.supplier_rank = 1
+                _logger.debug(f"Set supplier_rank=1 for partners {to_supplier.ids}")
 
-        # Also handle create case where vals may not include both keys
-        if vals.get("is_highfive_partner") and self.supplier_rank < 1:
-            self.supplier_rank = 1
-        if vals.get("is_highfive_customer") and self.customer_rank < 1:
-            self.customer_rank = 1
+        if "is_highfive_customer" in vals:
+            to_customer = self.filtered(
+                lambda p: p.is_highfive_customer and p.customer_rank < 1
+            )
+            if to_customer:
+                to_customer.customer_rank = 1
+                _logger.debug(f"Set customer_rank=1 for partners {to_customer.ids}")
 
     def _get_default_analytic_plan_id(self):
         """Get the default HighFive analytic plan"""
@@ -241,15 +245,16 @@ class ResPartner(models.Model):
 
     def _ensure_supplier_analytic_parent(self):
         """
-        Ensure that this partner has a parent analytic account.
+        Ensure that these partners have a parent analytic account.
         
         This method is idempotent and safe to call multiple times.
-        It will only create the analytic account if:
+        It will only create the analytic account of a partner if:
         1. The partner is marked as HighFive partner (is_highfive_partner=True)
         2. No analytic parent exists yet (analytic_parent_id is False)
         
-        The created analytic account will be linked to the HighFive Operations
+        The created analytic accounts will be linked to the HighFive Operations
         analytic plan and will serve as the parent for all branch-level analytics.
+        They are created with a single create() and linked back at once.
         
         Returns:
             None
@@ -257,43 +262,34 @@ class ResPartner(models.Model):
         Raises:
             None (method is designed to be safe)
         """
-        self.ensure_one()
-
-        if not self.is_highfive_partner:
-            # Not a supplier/partner → no analytic should be created
-            _logger.debug(f"Skipping analytic creation for partner {self.id} - not a HighFive partner")
-            return
-
-        if self.analytic_parent_id:
-            # Already exists → do nothing
-            _logger.debug(f"Analytic parent already exists for partner {self.id}")
+        partners = self.filtered(
+            lambda p: p.is_highfive_partner and not p.analytic_parent_id
+        )
+        if not partners:
+            # Not suppliers, or analytic parents already exist → do nothing
             return
 
-        _logger.info(f"Creating supplier analytic parent for partner {self.id} ({self.name})")
-
-        Analytic = self.env["account.analytic.account"].sudo()
-        plan = self.env.ref(
-            "highfive_core.analytic_plan_highfive",
-            raise_if_not_found=False
-        )
+        _logger.info(f"Creating supplier analytic parents for {len(partners)} partner(s)")
 
-        vals = {
-            "name": f"Supplier - {self.name}",
-            "partner_id": self.id,
-            "plan_id": plan.id if plan else False,
-            "code": f"SUP-{self.id:06d}",  # e.g., SUP-000001
-        }
+        plan_id = self._get_default_analytic_plan_id()
+        vals_list = [{
+            "name": f"Supplier - {partner.name}",
+            "partner_id": partner.id,
+            "plan_id": plan_id,
+            "code": f"SUP-{partner.id:06d}",  # e.g., SUP-000001
+        } for partner in partners]
 
         try:
-            analytic = Analytic.create(vals)
-            self.analytic_parent_id = analytic.id
+            analytics = self.env["account.analytic.account"].sudo()._create_and_link(
+                partners, "analytic_parent_id", vals_list
+            )
             _logger.info(
-                f"Successfully created analytic parent {analytic.id} "
-                f"for partner {self.id} ({self.name})"
+                f"Successfully created {len(analytics)} analytic parent(s) "
+                f"for partners {partners.ids}"
             )
         except Exception as e:
             _logger.error(
-                f"Failed to create analytic parent for partner {self.id}: {str(e)}"
+                f"Failed to create analytic parents for partners {partners.ids}: {str(e)}"
             )
             raise
 
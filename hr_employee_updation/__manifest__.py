@@ -37,6 +37,7 @@
         'security/ir.model.access.csv',
         'data/hr_employee_relation_data.xml',
         'data/ir_cron_data.xml',
+        'data/mail_template_data.xml',
         'views/hr_contract_views.xml',
         'views/res_config_settings_views.xml',
         'views/hr_employee_views.xml',
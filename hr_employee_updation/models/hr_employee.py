@@ -21,12 +21,21 @@
 #
 #############################################################################
 from datetime import timedelta
-from odoo import api, fields, models, _
+from odoo import api, fields, models
 
 GENDER_SELECTION = [('male', 'Male'),
                     ('female', 'Female'),
                     ('other', 'Other')]
 
+# Documents reminded by expiry_mail_reminder: (expiry date field,
+# last notified field, notice period in days, mail template)
+EXPIRY_REMINDERS = [
+    ('id_expiry_date', 'id_expiry_notified_date', 14,
+     'hr_employee_updation.mail_template_id_expiry_reminder'),
+    ('passport_expiry_date', 'passport_expiry_notified_date', 180,
+     'hr_employee_updation.mail_template_passport_expiry_reminder'),
+]
+
 
 class HrEmployee(models.Model):
     """Extended model for HR employees with additional features."""
@@ -43,6 +52,18 @@ class HrEmployee(models.Model):
                                  string='Expiry Date',)
     passport_expiry_date = fields.Date(help='Expiry date of Passport ID',
                                        string='Expiry Date')
+    id_expiry_notified_date = fields.Date(
+        string='ID Expiry Notified On',
+        compute='_compute_id_expiry_notified_date', store=True,
+        readonly=False, copy=False,
+        help='Date of the last ID expiry reminder, reset when the expiry '
+             'date changes')
+    passport_expiry_notified_date = fields.Date(
+        string='Passport Expiry Notified On',
+        compute='_compute_passport_expiry_notified_date', store=True,
+        readonly=False, copy=False,
+        help='Date of the last Passport expiry reminder, reset when the '
+             'expiry date changes')
     identification_attachment_ids = fields.Many2many(
         'ir.attachment', 'id_attachment_rel',
         'id_ref', 'attach_ref', string="Attachment",
@@ -65,6 +86,16 @@ class HrEmployee(models.Model):
                 employee.contract_id.mapped('date_start')) \
                 if employee.contract_id else False
 
+    @api.depends('id_expiry_date')
+    def _compute_id_expiry_notified_date(self):
+        """A new ID expiry date has not been notified yet."""
+        self.id_expiry_notified_date = False
+
+    @api.depends('passport_expiry_date')
+    def _compute_passport_expiry_notified_date(self):
+        """A new Passport expiry date has not been notified yet."""
+        self.passport_expiry_notified_date = False
+
     @api.onchange('spouse_complete_name', 'spouse_birthdate')
     def _onchange_spouse_complete_name(self):
         """Populates the family_info_ids field with the spouse's information,
@@ -79,44 +110,27 @@ class HrEmployee(models.Model):
             })]
 
     def expiry_mail_reminder(self):
-        """Sending  ID and Passport expiry notification."""
+        """Sending  ID and Passport expiry notification.
+
+        For each document, one query fetches the employees whose expiry date
+        falls within its notice period and who were not notified yet. Their
+        mails are created in one batch from the document template and left
+        to the mail queue, and the employees are marked as notified so a
+        later run does not remind them again for the same expiry date."""
         current_date = fields.Date.context_today(self) + timedelta(days=1)
-        employee_ids = self.search(['|', ('id_expiry_date', '!=', False),
-                                    ('passport_expiry_date', '!=', False)])
-        for employee in employee_ids:
-            if employee.id_expiry_date:
-                exp_date = fields.Date.from_string(
-                    employee.id_expiry_date) - timedelta(days=14)
-                if current_date >= exp_date:
-                    mail_content = ("Hello  " + employee.name + ",<br>Your ID "
-                                    + employee.identification_id +
-                                    " is going to expire on " +
-                                    str(employee.id_expiry_date)
-                                    + ". Please renew it before expiry date")
-                    main_content = {
-                        'subject': _('ID-%s Expired On %s') % (
-                            employee.identification_id,
-                            employee.id_expiry_date),
-                        'author_id': self.env.user.partner_id.id,
-                        'body_html': mail_content,
-                        'email_to': employee.work_email,
-                    }
-                    self.env['mail.mail'].sudo().create(main_content).send()
-            if employee.passport_expiry_date:
-                exp_date = fields.Date.from_string(
-                    employee.passport_expiry_date) - timedelta(days=180)
-                if current_date >= exp_date:
-                    mail_content = ("  Hello  " + employee.name +
-                                    ",<br>Your Passport " + employee.passport_id
-                                    +" is going to expire on " +
-                                    str(employee.passport_expiry_date) +
-                                    ". Please renew it before expire")
-                    main_content = {
-                        'subject': _('Passport-%s Expired On %s') % (
-                            employee.passport_id,
-                            employee.passport_expiry_date),
-                        'author_id': self.env.user.partner_id.id,
-                        'body_html': mail_content,
-                        'email_to': employee.work_email,
-                    }
-                    self.env['mail.mail'].sudo().create(main_content).send()
+        author = self.env.user.partner_id
+        for date_field, notified_field, notice_days, template_xmlid in (
+                EXPIRY_REMINDERS):
+            employees = self.search([
+                (date_field, '!=', False),
+                (date_field, '<=', current_date + timedelta(days=notice_days)),
+                (notified_field, '=', False),
+            ])
+            if not employees:
+                continue
+            template = self.env.ref(template_xmlid, raise_if_not_found=False)
+            if not template:
+                continue
+            template.sudo().send_mail_batch(
+                employees.ids, email_values={'author_id': author.id})
+            employees.write({notified_field: fields.Date.context_today(self)})
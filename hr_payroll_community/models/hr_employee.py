@@ -38,11 +38,6 @@ class HrEmployee(models.Model):
 
     def _compute_payslip_count(self):
         """Function for count Payslips"""
-        payslip_data = self.env['hr.payslip'].sudo().read_group(
-            [('employee_id', 'in', self.ids)],
-            ['employee_id'], ['employee_id'])
-        result = dict(
-            (data['employee_id'][0], data['employee_id_count']) for data in
-            payslip_data)
+        counts = self.sudo()._batch_count('hr.payslip', 'employee_id')
         for employee in self:
-            employee.payslip_count = result.get(employee.id, 0)
+            employee.payslip_count = counts[employee]
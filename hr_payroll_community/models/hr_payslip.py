@@ -188,8 +188,9 @@ class HrPayslip(models.Model):
 
     def _compute_payslip_count(self):
         """Compute function for getting Total count of Payslips"""
+        counts = self._batch_count('hr.payslip.line', 'slip_id')
         for payslip in self:
-            payslip.payslip_count = len(payslip.line_ids)
+            payslip.payslip_count = counts[payslip]
 
     @api.constrains('date_from', 'date_to')
     def _check_dates(self):
@@ -16,6 +16,7 @@ PASSWORD = "Admin2025"  # Odoo password
 MODULES_TO_HANDLE = [
     "base_account_budget",
     "base_accounting_kit",
+    "base_batch_count",
     "custom_partner",
     "easy_expense",
     "highfive_api_connector",
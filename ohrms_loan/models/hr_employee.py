@@ -33,7 +33,7 @@ class HrEmployee(models.Model):
         compute='_compute_loan_count')
 
     def _compute_loan_count(self):
-        """Compute the number of loans associated with the employee."""
+        """Compute the number of loans associated with the employees."""
+        counts = self._batch_count('hr.loan', 'employee_id')
         for rec in self:
-            rec.loan_count = rec.env['hr.loan'].search_count(
-                [('employee_id', '=', rec.id)])
+            rec.loan_count = counts[rec]
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from itertools import zip_longest
 from odoo import models, api
 
 
@@ -11,63 +12,39 @@ class PartnerLedgerAbstract(models.AbstractModel):
 
     @api.model
     def _get_report_values(self, docids, data=None):
-        active_id = self.env.context.get('active_id')
-        start_date = data.get('form_data').get('start_date')
-        end_date = data.get('form_data').get('end_date')
-        partner = self.env['res.partner'].browse(active_id)
+        form_data = data.get('form_data')
+        start_date = form_data.get('start_date')
+        end_date = form_data.get('end_date')
+        partner_ids = form_data.get('partner_ids') or [self.env.context.get('active_id')]
+        partners = self.env['res.partner'].browse(partner_ids)
         company_currency_symbol = self.env.user.company_id.currency_id.symbol
 
-        payments = self.env['account.payment'].search([
-            ('partner_id', '=', active_id),
-            ('date', '>=', start_date),
-            ('date', '<=', end_date),
-            ('state', 'in', ['paid', 'in_process']),
-        ])
-        invoices = self.env['account.move'].search([
-            ('partner_id', '=', active_id),
-            ('invoice_date', '>=', start_date),
-            ('invoice_date', '<=', end_date),
-            ('state', '=', 'posted'),
-            ('move_type', 'in', ['out_invoice', 'out_refund']),
-        ])
-        combined_data = []
-        for invoice, payment in zip(invoices, payments):
-            combined_data.append({
-                'invoice_name': invoice.name,
-                'invoice_date': invoice.invoice_date,
-                'invoice_amount': invoice.amount_total,
-                'payment_name': payment.name,
-                'payment_date': payment.date,
-                'payment_amount': payment.amount,
-            })
-        if len(invoices) > len(payments):
-            for invoice in invoices[len(payments):]:
-                combined_data.append({
-                    'invoice_name': invoice.name,
-                    'invoice_date': invoice.invoice_date,
-                    'invoice_amount': invoice.amount_total,
-                    'payment_name': '',
-                    'payment_date': '',
-                    'payment_amount': 0.0,
-                })
-        if len(payments) > len(invoices):
-            for payment in payments[len(invoices):]:
+        ledger_data = self.env['partner.ledger.report']._get_ledger_data(
+            partners.ids, start_date, end_date)
+        partner_lines = []
+        for partner in partners:
+            ledger = ledger_data[partner.id]
+            combined_data = []
+            for invoice, payment in zip_longest(ledger['invoices'], ledger['payments']):
                 combined_data.append({
-                    'invoice_name': '',
-                    'invoice_date': '',
-                    'invoice_amount': 0.0,
-                    'payment_name': payment.name,
-                    'payment_date': payment.date,
-                    'payment_amount': payment.amount,
+                    'invoice_name': invoice['name'] if invoice else '',
+                    'invoice_date': invoice['date'] if invoice else '',
+                    'invoice_amount': invoice['amount'] if invoice else 0.0,
+                    'payment_name': payment['name'] if payment else '',
+                    'payment_date': payment['date'] if payment else '',
+                    'payment_amount': payment['amount'] if payment else 0.0,
                 })
+            partner_lines.append({
+                'partner': partner,
+                'combined_data': combined_data,
+                'total_invoice': ledger['total_invoice'],
+                'total_payment': ledger['total_payment'],
+            })
         return {
             'doc_ids': docids,
-            'combined_data': combined_data,
+            'partner_lines': partner_lines,
             'doc_model': 'partner.ledger.report',
             'docs': self.env['partner.ledger.report'].browse(docids),
-            'partner': partner,
-            'payments': payments,
-            'invoices': invoices,
             'currency': company_currency_symbol,
             'from_date': start_date,
             'to_date': end_date,
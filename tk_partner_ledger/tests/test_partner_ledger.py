@@ -22,6 +22,10 @@ class TestPartnerLedger(TransactionCase):
             'name': 'Test Partner',
             'email': 'test.partner@example.com',
         })
+        cls.partner_2 = cls.env['res.partner'].create({
+            'name': 'Test Partner 2',
+            'email': 'test.partner2@example.com',
+        })
         cls.invoice = cls.env['account.move'].create({
             'partner_id': cls.partner.id,
             'move_type': 'out_invoice',
@@ -64,6 +68,47 @@ class TestPartnerLedger(TransactionCase):
         else:
             self.fail("Attachment ID not found in the URL")
 
+    def test_ledger_data_multi_partner(self):
+        """
+        Test if the shared data provider returns an entry for every partner.
+        """
+        ledger_data = self.env['partner.ledger.report']._get_ledger_data(
+            [self.partner.id, self.partner_2.id], date(2025, 1, 1), date(2025, 1, 31))
+        self.assertEqual(set(ledger_data), {self.partner.id, self.partner_2.id})
+        self.assertFalse(ledger_data[self.partner_2.id]['invoices'])
+        self.assertFalse(ledger_data[self.partner_2.id]['payments'])
+        self.assertEqual(ledger_data[self.partner_2.id]['total_invoice'], 0.0)
+
+    def test_generate_excel_report_multi_partner(self):
+        """
+        Test if the Excel report is generated for many partners in both layouts.
+        """
+        wizard = self.env['partner.ledger.report'].create({
+            'partner_ids': [(6, 0, [self.partner.id, self.partner_2.id])],
+            'start_date': date(2025, 1, 1),
+            'end_date': date(2025, 1, 31),
+        })
+        for layout in ('per_partner', 'combined'):
+            wizard.excel_layout = layout
+            excel_action = wizard.btn_excel_action()
+            self.assertEqual(excel_action.get('type'), 'ir.actions.act_url')
+            attachment_id = int(re.search(r'/web/content/(\d+)', excel_action['url']).group(1))
+            attachment = self.env['ir.attachment'].sudo().browse(attachment_id)
+            self.assertTrue(attachment.name.endswith('.xlsx'))
+
+    def test_pdf_report_values_multi_partner(self):
+        """
+        Test if the PDF report values contain one block per partner.
+        """
+        values = self.env['report.tk_partner_ledger.report_partner_ledger_pdf']._get_report_values(
+            [], data={'form_data': {
+                'partner_ids': [self.partner.id, self.partner_2.id],
+                'start_date': date(2025, 1, 1),
+                'end_date': date(2025, 1, 31),
+            }})
+        self.assertEqual([line['partner'] for line in values['partner_lines']],
+                         [self.partner, self.partner_2])
+
     def test_action_open_wizard_ledger(self):
         """
         Test if the partner's ledger wizard can be opened correctly.
@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
+from collections import defaultdict
+from itertools import zip_longest
 from io import BytesIO
 import base64
-import xlwt
-from odoo import fields, models, api
+import re
+from odoo import Command, fields, models, api
 from odoo.exceptions import UserError
+try:
+    from odoo.tools.misc import xlsxwriter
+except ImportError:
+    import xlsxwriter
 
 
 class PartnerLedgerGenerateReport(models.TransientModel):
@@ -17,27 +23,103 @@ class PartnerLedgerGenerateReport(models.TransientModel):
     start_date = fields.Date(string="From Date", required=True)
     end_date = fields.Date(string="To Date", required=True)
     partner_id = fields.Many2one('res.partner', string="Partner")
+    partner_ids = fields.Many2many('res.partner', string="Partners")
+    excel_layout = fields.Selection([
+        ('per_partner', 'One Sheet per Partner'),
+        ('combined', 'Combined Sheet'),
+    ], string="Excel Layout", default='per_partner', required=True)
 
     @api.model
     def default_get(self, fields):
         """
-              Get Current Record Active id.
+              Get Current Record Active id(s).
         """
         result = super(PartnerLedgerGenerateReport, self).default_get(fields)
-        result['partner_id'] = self._context.get('active_id')
+        active_id = self._context.get('active_id')
+        active_ids = self._context.get('active_ids') or ([active_id] if active_id else [])
+        result['partner_id'] = active_id
+        result['partner_ids'] = [Command.set(active_ids)]
         return result
 
-    def btn_pdf_action(self):
+    def _get_partners(self):
         """
-              Generates a PDF report of the partner's ledger for the selected date range.
+            Partners of the report, falling back on the single partner of
+            the wizard.
         """
+        self.ensure_one()
+        partners = self.partner_ids or self.partner_id
+        if not partners:
+            raise UserError(self.env._("Please select at least one partner."))
+        return partners
+
+    def _check_dates(self):
         self.ensure_one()
         if self.start_date > self.end_date:
             raise UserError(self.env._("The start date must be earlier than the end date."))
+
+    @api.model
+    def _get_ledger_data(self, partner_ids, start_date, end_date):
+        """
+            Fetch the invoices and payments of many partners, one query for
+            each, and group them per partner.
+            Shared by the PDF report and the Excel export.
+
+            :return: dict {partner_id: {'invoices', 'payments',
+                     'total_invoice', 'total_payment'}} with an entry for
+                     every requested partner
+        """
+        invoices = self.env['account.move'].search_fetch([
+            ('partner_id', 'in', partner_ids),
+            ('invoice_date', '>=', start_date),
+            ('invoice_date', '<=', end_date),
+            ('state', '=', 'posted'),
+            ('move_type', 'in', ['out_invoice', 'out_refund']),
+        ], ['partner_id', 'name', 'invoice_date', 'amount_total'],
+            order='partner_id, invoice_date, id')
+        payments = self.env['account.payment'].search_fetch([
+            ('partner_id', 'in', partner_ids),
+            ('date', '>=', start_date),
+            ('date', '<=', end_date),
+            ('state', 'in', ['paid', 'in_process']),
+        ], ['partner_id', 'name', 'date', 'amount'], order='partner_id, date, id')
+
+        invoices_by_partner = defaultdict(list)
+        for invoice in invoices:
+            invoices_by_partner[invoice.partner_id.id].append({
+                'name': invoice.name,
+                'date': invoice.invoice_date,
+                'amount': invoice.amount_total,
+            })
+        payments_by_partner = defaultdict(list)
+        for payment in payments:
+            payments_by_partner[payment.partner_id.id].append({
+                'name': payment.name,
+                'date': payment.date,
+                'amount': payment.amount,
+            })
+
+        ledger_data = {}
+        for partner_id in partner_ids:
+            partner_invoices = invoices_by_partner[partner_id]
+            partner_payments = payments_by_partner[partner_id]
+            ledger_data[partner_id] = {
+                'invoices': partner_invoices,
+                'payments': partner_payments,
+                'total_invoice': sum(line['amount'] for line in partner_invoices),
+                'total_payment': sum(line['amount'] for line in partner_payments),
+            }
+        return ledger_data
+
+    def btn_pdf_action(self):
+        """
+              Generates a PDF report of the partner's ledger for the selected date range.
+        """
+        self.ensure_one()
+        self._check_dates()
         data = {
             'model': 'partner.ledger.report',
             'form_data': {
-                'partner_id': self.partner_id.id,
+                'partner_ids': self._get_partners().ids,
                 'start_date': self.start_date,
                 'end_date': self.end_date,
             }
@@ -45,114 +127,124 @@ class PartnerLedgerGenerateReport(models.TransientModel):
         return (self.env.ref('tk_partner_ledger.action_report_partner_ledger').report_action
                 (self, data=data))
 
-    def btn_excel_action(self):
+    @api.model
+    def _get_sheet_name(self, partner, used_names):
         """
-        Generates the Partner Ledger Report in Excel format based on the provided
-        date range.
+            Unique worksheet name for a partner, within the 31 characters
+            allowed by Excel.
         """
-        start_date = self.start_date
-        end_date = self.end_date
+        base_name = re.sub(r'[\[\]:*?/\\]', ' ', partner.name or str(partner.id))[:31]
+        name = base_name
+        index = 1
+        while name.lower() in used_names:
+            suffix = f" ({index})"
+            name = base_name[:31 - len(suffix)] + suffix
+            index += 1
+        used_names.add(name.lower())
+        return name
 
-        active_id = self.env.context.get('active_id')
-        partners = self.env['res.partner'].browse(active_id)
-        company_currency_symbol = self.env.user.company_id.currency_id.symbol
+    @api.model
+    def _write_partner_ledger(self, sheet, row, partner, ledger, styles):
+        """
+            Write the ledger of one partner from the given row, strictly row
+            after row as required by the streaming writer.
 
-        invoices = self.env['account.move'].search([
-            ('partner_id', '=', active_id),
-            ('invoice_date', '>=', start_date),
-            ('invoice_date', '<=', end_date),
-            ('state', '=', 'posted'),
-            ('move_type', 'in', ['out_invoice', 'out_refund']),
-        ])
-        payments = self.env['account.payment'].search([
-            ('partner_id', '=', active_id),
-            ('date', '>=', start_date),
-            ('date', '<=', end_date),
-            ('state', 'in', ['paid', 'in_process']),
-        ])
-        workbook = xlwt.Workbook(encoding="UTF-8")
-        sheet1 = workbook.add_sheet('Partner Ledger', cell_overwrite_ok=True)
-
-        main_head = xlwt.easyxf('align: horiz center; borders: left thin, right thin, bottom thin;')
-        font = xlwt.Font()
-        font.bold = True
-        font.height = 310
-        main_head.font = font
-
-        header_style = xlwt.easyxf('font: bold True; pattern: pattern solid, fore_colour gray25;'
-                                   'align: horiz center; borders: left thin, right thin,'
-                                   ' bottom thin, top thin;')
-        header_style_amount = xlwt.easyxf('font: bold True; pattern: pattern solid,'
-                                          ' fore_colour gray25;align: horiz right; '
-                                          'borders: left thin,right thin, bottom thin, top thin;')
-        data_style = xlwt.easyxf('align: horiz center; borders: left thin,'
-                                 ' right thin, bottom thin, top thin;')
-        data_style_amount = xlwt.easyxf('align: horiz right;'
-                                        'borders: left thin, right thin, bottom thin, top thin;')
-
-        for i in range(11):
-            sheet1.col(i).width = 5000
-
-        sheet1.write_merge(0, 1, 1, 4, 'PARTNER LEDGER', main_head)
-
-        sheet1.write(3, 0, 'Name', header_style)
-        sheet1.write(4, 0, 'Email', header_style)
-        sheet1.write(5, 0, 'Date', header_style)
-        sheet1.write(6, 0, 'Currency In', header_style)
-
-        sheet1.write_merge(3, 3, 1, 2, partners.name, data_style)
-        sheet1.write_merge(4, 4, 1, 2, partners.email, data_style)
-        sheet1.write_merge(5, 5, 1, 2, f"{self.start_date} To {self.end_date}", data_style)
-        sheet1.write_merge(6, 6, 1, 2, company_currency_symbol, data_style)
-
-        sheet1.write_merge(8, 8, 0, 2, 'Invoices', header_style)
-        sheet1.write(9, 0, 'Name', header_style)
-        sheet1.write(9, 1, 'Date', header_style)
-        sheet1.write(9, 2, 'Amount', header_style_amount)
-
-        sheet1.write_merge(8, 8, 3, 5, 'Payments', header_style)
-        sheet1.write(9, 3, 'Name', header_style)
-        sheet1.write(9, 4, 'Date', header_style)
-        sheet1.write(9, 5, 'Amount', header_style_amount)
-
-        row = 10
-
-        total_invoice = 0.0
-        total_payment = 0.0
+            :return: the first free row after the partner block
+        """
+        sheet.write(row, 0, 'Name', styles['header'])
+        sheet.merge_range(row, 1, row, 2, partner.name, styles['data'])
+        row += 1
+        sheet.write(row, 0, 'Email', styles['header'])
+        sheet.merge_range(row, 1, row, 2, partner.email or '', styles['data'])
+        row += 2
 
-        for invoice in invoices:
-            if invoices.partner_id:
-                sheet1.write(row, 0, invoice.name, data_style)
-                sheet1.write(row, 1, invoice.invoice_date.strftime('%d-%m-%Y'), data_style)
-                sheet1.write(row, 2, f"{invoice.amount_total:.2f}", data_style_amount)
-                total_invoice += invoice.amount_total
-                row += 1
-
-        payment_row = 10
-        for payment in payments:
-            if payment.partner_id:
-                sheet1.write(payment_row, 3, payment.name, data_style)
-                sheet1.write(payment_row, 4, payment.date.strftime('%d-%m-%Y'), data_style)
-                sheet1.write(payment_row, 5, f"{payment.amount:.2f}", data_style_amount)
-                total_payment += payment.amount
-                payment_row += 1
+        sheet.merge_range(row, 0, row, 2, 'Invoices', styles['header'])
+        sheet.merge_range(row, 3, row, 5, 'Payments', styles['header'])
+        row += 1
+        sheet.write_row(row, 0, ['Name', 'Date'], styles['header'])
+        sheet.write(row, 2, 'Amount', styles['header_amount'])
+        sheet.write_row(row, 3, ['Name', 'Date'], styles['header'])
+        sheet.write(row, 5, 'Amount', styles['header_amount'])
+        row += 1
 
-        sheet1.write_merge(row, row, 0, 1, 'Total Invoice Amount',
-                           header_style_amount)
-        sheet1.write(row, 2, f"{total_invoice:.2f}", data_style_amount)
+        for invoice, payment in zip_longest(ledger['invoices'], ledger['payments']):
+            if invoice:
+                sheet.write(row, 0, invoice['name'], styles['data'])
+                sheet.write(row, 1, invoice['date'].strftime('%d-%m-%Y'), styles['data'])
+                sheet.write_number(row, 2, invoice['amount'], styles['data_amount'])
+            if payment:
+                sheet.write(row, 3, payment['name'], styles['data'])
+                sheet.write(row, 4, payment['date'].strftime('%d-%m-%Y'), styles['data'])
+                sheet.write_number(row, 5, payment['amount'], styles['data_amount'])
+            row += 1
 
-        sheet1.write_merge(payment_row, payment_row, 3, 4, 'Total Payment Amount',
-                           header_style_amount)
-        sheet1.write(payment_row, 5, f"{total_payment:.2f}", data_style_amount)
+        sheet.merge_range(row, 0, row, 1, 'Total Invoice Amount', styles['header_amount'])
+        sheet.write_number(row, 2, ledger['total_invoice'], styles['data_amount'])
+        sheet.merge_range(row, 3, row, 4, 'Total Payment Amount', styles['header_amount'])
+        sheet.write_number(row, 5, ledger['total_payment'], styles['data_amount'])
+        row += 1
+        sheet.merge_range(row, 3, row, 4, 'Amount Due', styles['header_amount'])
+        sheet.write_number(row, 5, ledger['total_invoice'] - ledger['total_payment'],
+                           styles['data_amount'])
+        return row + 1
 
-        sheet1.write_merge(payment_row + 1, payment_row + 1, 3, 4, 'Amount Due',
-                           header_style_amount)
-        sheet1.write(payment_row + 1, 5, f"{total_invoice - total_payment:.2f}", data_style_amount)
+    def _write_sheet_header(self, sheet, styles):
+        """
+            Title, period and currency rows at the top of a sheet.
+
+            :return: the first free row after the header
+        """
+        sheet.set_column(0, 10, 22)
+        sheet.merge_range(0, 1, 1, 4, 'PARTNER LEDGER', styles['main_head'])
+        sheet.write(3, 0, 'Date', styles['header'])
+        sheet.merge_range(3, 1, 3, 2, f"{self.start_date} To {self.end_date}", styles['data'])
+        sheet.write(4, 0, 'Currency In', styles['header'])
+        sheet.merge_range(4, 1, 4, 2, self.env.user.company_id.currency_id.symbol, styles['data'])
+        return 6
+
+    def btn_excel_action(self):
+        """
+        Generates the Partner Ledger Report in Excel format based on the provided
+        date range, with one sheet per partner or one combined sheet.
+        """
+        self.ensure_one()
+        self._check_dates()
+        partners = self._get_partners()
+        ledger_data = self._get_ledger_data(partners.ids, self.start_date, self.end_date)
 
         stream = BytesIO()
-        workbook.save(stream)
+        workbook = xlsxwriter.Workbook(stream, {'constant_memory': True})
+        border = {'border': 1, 'valign': 'vcenter'}
+        styles = {
+            'main_head': workbook.add_format({**border, 'bold': True, 'font_size': 15,
+                                              'align': 'center'}),
+            'header': workbook.add_format({**border, 'bold': True, 'bg_color': '#C0C0C0',
+                                           'align': 'center'}),
+            'header_amount': workbook.add_format({**border, 'bold': True, 'bg_color': '#C0C0C0',
+                                                  'align': 'right'}),
+            'data': workbook.add_format({**border, 'align': 'center'}),
+            'data_amount': workbook.add_format({**border, 'align': 'right',
+                                                'num_format': '0.00'}),
+        }
+
+        if self.excel_layout == 'combined':
+            sheet = workbook.add_worksheet('Partner Ledger')
+            row = self._write_sheet_header(sheet, styles)
+            for partner in partners:
+                row = self._write_partner_ledger(sheet, row, partner,
+                                                 ledger_data[partner.id], styles) + 1
+        else:
+            used_names = set()
+            for partner in partners:
+                sheet = workbook.add_worksheet(self._get_sheet_name(partner, used_names))
+                row = self._write_sheet_header(sheet, styles)
+                self._write_partner_ledger(sheet, row, partner, ledger_data[partner.id], styles)
+        workbook.close()
 
-        filename = f"Partner_Ledger_{partners.name}.xls"
+        if len(partners) == 1:
+            filename = f"Partner_Ledger_{partners.name}.xlsx"
+        else:
+            filename = f"Partner_Ledger_{self.start_date}_{self.end_date}.xlsx"
         output = base64.encodebytes(stream.getvalue())
         attachment = self.env['ir.attachment'].sudo()
         attachment_id = attachment.create({